@@ -20,6 +20,8 @@ import colorsys
 import math
 from typing import Optional, Tuple
 
+import numpy as np
+
 from ..pmath import lerp
 from ..pmath import constrain
 
@@ -215,6 +217,74 @@ def parse_color(
     return red, green, blue, alpha
 
 
+def _hsv_to_rgb(hsv):
+    """Vectorized :func:`colorsys.hsv_to_rgb` for an (N, 3) array"""
+    h, s, v = hsv.T
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p, q, t = v * (1.0 - s), v * (1.0 - s * f), v * (1.0 - s * (1.0 - f))
+    i = i.astype(int) % 6
+    choices = [
+        (v, t, p),
+        (q, v, p),
+        (p, v, t),
+        (p, q, v),
+        (t, p, v),
+        (v, p, q),
+    ]
+    return np.column_stack([np.choose(i, [c[k] for c in choices]) for k in range(3)])
+
+
+def parse_colors(colors) -> np.ndarray:
+    """Parses an array of colors, like :func:`parse_color` does for a
+    single color.
+
+    Every row of `colors` is one color, given as gray, (gray, alpha),
+    three channels or four channels. The channels are interpreted in
+    the current color mode and range. A sequence of :class:`Color`
+    objects is accepted as well.
+
+    :param colors: array of shape (N,), (N, 2), (N, 3) or (N, 4)
+    :type colors: np.ndarray | list
+
+    :returns: (N, 4) array of normalized red, green, blue, alpha values.
+    :rtype: np.ndarray
+
+    :raises ValueError: when the colors don't have one of the shapes
+        above.
+    """
+    if len(colors) > 0 and isinstance(colors[0], Color):
+        return np.array([c.normalized for c in colors], dtype=np.float64)
+
+    colors = np.asarray(colors, dtype=np.float64)
+    if colors.ndim == 1:
+        colors = colors[:, np.newaxis]
+    if colors.ndim != 2 or colors.shape[1] not in (1, 2, 3, 4):
+        raise ValueError("Failed to parse colors of shape {}".format(colors.shape))
+
+    if p5.renderer:
+        color_range = np.array(p5.renderer.style.color_range, dtype=np.float64)
+        mode = p5.renderer.style.color_parse_mode
+    else:
+        color_range = np.full(4, 255.0)
+        mode = "RGB"
+
+    parsed = np.empty((len(colors), 4))
+    if colors.shape[1] in (1, 2):
+        parsed[:, :3] = colors[:, :1] / color_range[0]
+    else:
+        parsed[:, :3] = colors[:, :3] / color_range[:3]
+    if colors.shape[1] in (2, 4):
+        parsed[:, 3] = colors[:, -1] / color_range[3]
+    else:
+        parsed[:, 3] = 1
+    np.clip(parsed, 0, 1, out=parsed)
+
+    if colors.shape[1] >= 3 and mode.startswith("HSB"):
+        parsed[:, :3] = _hsv_to_rgb(parsed[:, :3])
+    return parsed
+
+
 # NOTE: By default constructor expects color value to be in [0,255] range
 # which is then normalized to [0,1] range and then used by the renderer instance
 class Color:
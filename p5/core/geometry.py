@@ -21,136 +21,239 @@
 """
 
 
-import itertools
-from typing import List
 from . import p5
 import numpy as np
 import math
 
 
+# Width and type of the rows of the arrays of a Geometry
+ATTRIBUTES = {
+    "vertices": (3, np.float32),
+    "line_vertices": (3, np.float32),
+    "line_normals": (4, np.float32),
+    "vertex_normals": (3, np.float32),
+    "faces": (3, np.uint32),
+    "uvs": (2, np.float32),
+    # edge connectivity pattern for create line vertices based on faces
+    # for most objects
+    "edges": (2, np.uint32),
+    "stroke_indices": (2, np.uint32),
+}
+
+
+class GeometryBuffer:
+    """
+        Growable array of rows of a fixed width
+
+    Rows are appended into spare capacity, which doubles when it runs
+    out. Assigned arrays of the right type are kept without a copy, and
+    copied into a new buffer when rows are appended to them, so the
+    read-only arrays of cached meshes are never written to.
+
+    :param width: number of values in a row
+
+    :param dtype: type of the values
+
+    """
+
+    __slots__ = ("width", "dtype", "_data", "_size")
+
+    def __init__(self, width: int, dtype):
+        self.width = width
+        self.dtype = np.dtype(dtype)
+        self._data = np.empty((0, width), dtype=self.dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The rows, as a view of the buffer
+        """
+        return self._data[: self._size]
+
+    def assign(self, values):
+        """
+        Replace the rows by the given rows
+        """
+        self._data = np.asarray(values, dtype=self.dtype).reshape(-1, self.width)
+        self._size = len(self._data)
+
+    def extend(self, values):
+        """
+        Append one row or an array of rows
+        """
+        rows = np.asarray(values, dtype=self.dtype).reshape(-1, self.width)
+        size = self._size + len(rows)
+        if size > len(self._data):
+            capacity = max(size, 2 * len(self._data), 16)
+            data = np.empty((capacity, self.width), dtype=self.dtype)
+            data[: self._size] = self.array
+            self._data = data
+        self._data[self._size : size] = rows
+        self._size = size
+
+    def clear(self):
+        """
+        Remove all rows
+        """
+        self.assign(())
+
+
+def _attribute(name):
+    """Property reading and assigning the buffer of an attribute"""
+    width, dtype = ATTRIBUTES[name]
+
+    def fget(self):
+        return getattr(self, "_" + name).array
+
+    def fset(self, values):
+        getattr(self, "_" + name).assign(values)
+
+    doc = "(N, {}) array of {}".format(width, np.dtype(dtype).name)
+    return property(fget, fset, doc=doc)
+
+
 class Geometry:
     """
         Geometry class for all 3D shapes
 
+    The vertices, faces, edges and the other arrays of the geometry are
+    (N, width) arrays of float32 or uint32 values. They can be assigned
+    any array-like of the right shape, and are grown row by row with
+    :meth:`append`.
+
     :param detail_x: number of triangle subdivisions in x-dimension
 
     :param detail_y: number of triangle subdivisions in y-dimension
 
     """
 
-    def __init__(self, detail_x: int = 1, detail_y: int = 1):
-        self.vertices: List[int] = []
-
-        self.line_vertices: List = []
-
-        self.line_normals: List = []
+    __slots__ = tuple("_" + name for name in ATTRIBUTES) + (
+        "detail_x",
+        "detail_y",
+        "matrix",
+        "material",
+    )
 
-        self.vertex_normals: List = []
+    vertices = _attribute("vertices")
+    line_vertices = _attribute("line_vertices")
+    line_normals = _attribute("line_normals")
+    vertex_normals = _attribute("vertex_normals")
+    faces = _attribute("faces")
+    uvs = _attribute("uvs")
+    edges = _attribute("edges")
+    stroke_indices = _attribute("stroke_indices")
 
-        self.faces: List[List[int]] = []
-
-        self.uvs: List = []
-        # a 2D array containing edge connectivity pattern for create line vertices
-        # based on faces for most objects
-        self.edges: List[List[int]] = []
+    def __init__(self, detail_x: int = 1, detail_y: int = 1):
+        for name, (width, dtype) in ATTRIBUTES.items():
+            setattr(self, "_" + name, GeometryBuffer(width, dtype))
         self.detail_x = detail_x
         self.detail_y = detail_y
 
-        self.stroke_indices: List = []
-
         self.matrix = np.identity(4)
         self.material = p5.renderer.style.material
 
+    def append(self, **rows):
+        """
+        Append rows to arrays of the geometry, for instance
+        ``geom.append(vertices=[0, 0, 0], uvs=[0, 0])``
+
+        :param rows: one row or an array of rows for every array
+        """
+        for name, values in rows.items():
+            if name not in ATTRIBUTES:
+                raise TypeError("Geometry has no array {}".format(name))
+            getattr(self, "_" + name).extend(values)
+
     def reset(self):
         """
         Reset geometry parameters
         """
-        self.vertices = []
-        self.line_vertices = []
-        self.line_normals = []
-        self.vertex_normals = []
-        self.faces = []
-        self.uvs = []
-        self.edges = []
+        for name in ATTRIBUTES:
+            if name != "stroke_indices":
+                getattr(self, "_" + name).clear()
 
     def compute_faces(self):
         """
         Adds the faces for the geometry for predefined order of vertices
         """
-        self.faces = []
         sliceCount = self.detail_x + 1
-        for i, j in itertools.product(range(self.detail_y), range(self.detail_x)):
-            a = i * sliceCount + j
-            b = i * sliceCount + j + 1
-            c = (i + 1) * sliceCount + j + 1
-            d = (i + 1) * sliceCount + j
-            self.faces.append([a, b, d])
-            self.faces.append([d, b, c])
+        i, j = np.meshgrid(
+            np.arange(self.detail_y), np.arange(self.detail_x), indexing="ij"
+        )
+        a = (i * sliceCount + j).ravel()
+        b = a + 1
+        c = ((i + 1) * sliceCount + j + 1).ravel()
+        d = ((i + 1) * sliceCount + j).ravel()
+        self.faces = np.column_stack((a, b, d, d, b, c)).reshape(-1, 3)
 
     def make_triangle_edges(self):
         """
         Adds the edges to the geometry based on the faces
         """
-        self.edges = []
-        for j in range(len(self.faces)):
-            self.edges.append([self.faces[j][0], self.faces[j][1]])
-            self.edges.append([self.faces[j][1], self.faces[j][2]])
-            self.edges.append([self.faces[j][2], self.faces[j][0]])
+        self.edges = self.faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
 
     def get_face_normal(self, faceId):
         """
         Returns the normal for a given face
         """
-        face = self.faces[faceId]
-        vA = np.array(self.vertices[face[0]])
-        vB = np.array(self.vertices[face[1]])
-        vC = np.array(self.vertices[face[2]])
-        ab = vB - vA
-        ac = vC - vA
-        n = np.cross(ab, ac)
-        ln = np.linalg.norm(n)
-
-        sinAlpha = ln / (np.linalg.norm(ab) * np.linalg.norm(ac))
-        sinAlpha = min(sinAlpha, 1)
-        return n * math.sin(sinAlpha) / ln
+        return _face_normals(
+            self.vertices.astype(np.float64), self.faces[[faceId]]
+        )[0]
 
     def compute_normals(self):
         """
         Compute normals for every vertex
         """
-        self.vertex_normals = [[0, 0, 0] for _ in self.vertices]
-        for f, face in enumerate(self.faces):
-            face_normal = self.get_face_normal(f)
+        vertices = self.vertices.astype(np.float64)
+        faces = self.faces
+        normals = np.zeros((len(vertices), 3))
+        # Sum the normals of the faces around every vertex
+        np.add.at(
+            normals, faces.ravel(), np.repeat(_face_normals(vertices, faces), 3, axis=0)
+        )
+        normals = normals / np.linalg.norm(normals, axis=1)[:, np.newaxis]
+        self.vertex_normals = normals
+
+    def edges_to_vertices(self):
+        vertices = self.vertices.astype(np.float64)
+        edges = self.edges
+        begin = vertices[edges[:, 0]]
+        end = vertices[edges[:, 1]]
 
-            for fv in range(3):
-                vertex_index = face[fv]
-                self.vertex_normals[vertex_index] += face_normal
+        direction = end - begin
+        direction = direction / np.linalg.norm(direction, axis=1)[:, np.newaxis]
+        ones = np.ones((len(edges), 1))
+        dirAdd = np.hstack((direction, ones))
+        dirSub = np.hstack((direction, -ones))
 
-        for iv in range(len(self.vertices)):
-            self.vertex_normals[iv] = self.vertex_normals[iv] / np.linalg.norm(
-                self.vertex_normals[iv]
-            )
+        self.line_normals = np.stack(
+            (dirAdd, dirSub, dirAdd, dirAdd, dirSub, dirSub), axis=1
+        ).reshape(-1, 4)
+        self.line_vertices = np.stack(
+            (begin, begin, end, end, begin, end), axis=1
+        ).reshape(-1, 3)
 
-    def edges_to_vertices(self):
-        self.line_vertices = []
-        self.line_normals = []
-
-        for i in range(len(self.edges)):
-            begin = self.vertices[self.edges[i][0]]
-            end = self.vertices[self.edges[i][1]]
-
-            direction = np.array(end) - np.array(begin)
-            direction = direction / np.linalg.norm(direction)
-            direction = direction.tolist()
-
-            a = begin
-            b = begin
-            c = end
-            d = end
-            dirAdd = direction
-            dirSub = direction
-            dirAdd.append(1)
-            dirSub.append(-1)
-
-            self.line_normals.extend([dirAdd, dirSub, dirAdd, dirAdd, dirSub, dirSub])
-            self.line_vertices.extend([a, b, c, c, b, d])
+
+def _face_normals(vertices, faces):
+    """
+    Returns the normals of the faces, weighted by the angle at their
+    first vertex
+    """
+    vA = vertices[faces[:, 0]]
+    vB = vertices[faces[:, 1]]
+    vC = vertices[faces[:, 2]]
+    ab = vB - vA
+    ac = vC - vA
+    n = np.cross(ab, ac)
+    ln = np.linalg.norm(n, axis=1)[:, np.newaxis]
+
+    sinAlpha = ln / (
+        np.linalg.norm(ab, axis=1)[:, np.newaxis]
+        * np.linalg.norm(ac, axis=1)[:, np.newaxis]
+    )
+    sinAlpha = np.minimum(sinAlpha, 1)
+    return n * np.sin(sinAlpha) / ln
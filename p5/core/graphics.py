@@ -29,7 +29,7 @@ def create_graphics(
 
     :param height: height of the offscreen graphics buffer in pixels
 
-    :param renderer: Default P2D, and only available in skia renderer
+    :param renderer: Default P2D, the only renderer available for offscreen buffers
 
     :returns: Off screen graphics buffer
 
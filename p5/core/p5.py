@@ -23,4 +23,6 @@ from .tess import Tessellator
 sketch = None
 renderer = None
 mode = None
+# Recorder of the running sketch, see p5.record()
+recorder = None
 tess = Tessellator()
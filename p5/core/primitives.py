@@ -20,6 +20,7 @@ import math
 import builtins
 from typing import Optional, Tuple, overload
 
+import numpy as np
 
 from ..pmath import Point
 from ..pmath import curves
@@ -28,6 +29,7 @@ from ..sketch.Vispy2DRenderer.shape import PShape
 from .constants import ROUND, SQUARE, PROJECT
 
 from . import p5
+from .color import parse_colors
 
 from ..sketch.Skia2DRenderer.util import should_draw, mode_adjust
 
@@ -47,6 +49,11 @@ __all__ = [
     "bezier",
     "curve",
     "create_shape",
+    "points",
+    "lines",
+    "rects",
+    "circles",
+    "triangles",
 ]
 
 
@@ -972,3 +979,138 @@ def create_shape(kind=None, *args, **kwargs):
 
     # kwargs['visible'] = False
     return shape_map[kind](*args, **kwargs)
+
+
+def _bulk_vertices(data, n_vertices, name):
+    """Reshape the coordinates passed to a bulk drawing function to an
+    (N, n_vertices, 3) array, adding z = 0 to 2D coordinates."""
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 2 and data.shape[1] in (2 * n_vertices, 3 * n_vertices):
+        data = data.reshape(len(data), n_vertices, -1)
+    if data.ndim != 3 or data.shape[1] != n_vertices or data.shape[2] not in (2, 3):
+        raise ValueError(
+            "Unexpected shape {} of the array passed to {}()".format(data.shape, name)
+        )
+    if data.shape[2] == 2:
+        data = np.concatenate([data, np.zeros((len(data), n_vertices, 1))], axis=2)
+    return data
+
+
+def _bulk_colors(colors, n, name):
+    """Parse the colors passed to a bulk drawing function"""
+    if colors is None:
+        return None
+    colors = parse_colors(colors)
+    if len(colors) != n:
+        raise ValueError(
+            "{}() got {} colors for {} shapes".format(name, len(colors), n)
+        )
+    return colors
+
+
+def _bulk_array(data, columns, name):
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim != 2 or data.shape[1] != columns:
+        raise ValueError(
+            "Unexpected shape {} of the array passed to {}()".format(data.shape, name)
+        )
+    return data
+
+
+def points(xy, colors=None):
+    """Draw many points with one call.
+
+    Every point is a dot of the stroke color, as wide as the stroke
+    weight. It is round or square depending on the stroke cap.
+
+    :param xy: (N, 2) or (N, 3) array of the coordinates of the points
+    :type xy: np.ndarray | list
+
+    :param colors: colors of the points, replacing the stroke color.
+        Either a sequence of :class:`Color` objects or an array with
+        one row per point, in the current color mode: gray, (gray,
+        alpha), three channels or four channels.
+    :type colors: np.ndarray | list | None
+
+    """
+    vertices = _bulk_vertices(xy, 1, "points")[:, 0]
+    p5.renderer.points(vertices, _bulk_colors(colors, len(vertices), "points"))
+
+
+def lines(segments, colors=None):
+    """Draw many line segments with one call.
+
+    :param segments: (N, 4) array of ``x1, y1, x2, y2`` or (N, 6)
+        array of ``x1, y1, z1, x2, y2, z2`` rows
+    :type segments: np.ndarray | list
+
+    :param colors: colors of the lines, replacing the stroke color.
+        See :func:`points` for the accepted formats.
+    :type colors: np.ndarray | list | None
+
+    """
+    vertices = _bulk_vertices(segments, 2, "lines")
+    p5.renderer.lines(vertices, _bulk_colors(colors, len(vertices), "lines"))
+
+
+def rects(xywh, colors=None, mode: Optional[str] = None):
+    """Draw many rectangles with one call.
+
+    :param xywh: (N, 4) array with one row per rectangle. The columns
+        are interpreted like the arguments of :func:`rect` in the
+        given mode.
+    :type xywh: np.ndarray | list
+
+    :param colors: colors of the rectangles, replacing the fill color.
+        See :func:`points` for the accepted formats.
+    :type colors: np.ndarray | list | None
+
+    :param mode: The drawing mode for the rectangles. Should be one of
+        {'CORNER', 'CORNERS', 'CENTER', 'RADIUS'} (defaults to the
+        mode being used by the p5.renderer.)
+    :type mode: str
+
+    """
+    xywh = _bulk_array(xywh, 4, "rects")
+    if mode is None:
+        mode = p5.renderer.style.rect_mode
+    vals = mode_adjust(*xywh.T, mode)
+    xywh = np.column_stack((vals["x"], vals["y"], vals["w"], vals["h"]))
+    p5.renderer.rects(xywh, _bulk_colors(colors, len(xywh), "rects"))
+
+
+def circles(xyr, colors=None):
+    """Draw many circles with one call.
+
+    :param xyr: (N, 3) array of the center and radius of the circles.
+        Unlike :func:`circle`, the circles are always centered on
+        their coordinates.
+    :type xyr: np.ndarray | list
+
+    :param colors: colors of the circles, replacing the fill color.
+        See :func:`points` for the accepted formats.
+    :type colors: np.ndarray | list | None
+
+    """
+    xyr = _bulk_array(xyr, 3, "circles")
+    p5.renderer.circles(xyr, _bulk_colors(colors, len(xyr), "circles"))
+
+
+def triangles(xyz, colors=None):
+    """Draw many triangles with one call.
+
+    With the OpenGL renderers, the outlines of all the triangles are
+    drawn after their fills.
+
+    :param xyz: (N, 6) array of ``x1, y1, x2, y2, x3, y3`` rows, (N, 9)
+        array of ``x1, y1, z1, ..., z3`` rows, or (N, 3, 2) or (N, 3,
+        3) array of the corners
+    :type xyz: np.ndarray | list
+
+    :param colors: colors of the triangles, replacing the fill color.
+        See :func:`points` for the accepted formats.
+    :type colors: np.ndarray | list | None
+
+    """
+    vertices = _bulk_vertices(xyz, 3, "triangles")
+    p5.renderer.triangles(vertices, _bulk_colors(colors, len(vertices), "triangles"))
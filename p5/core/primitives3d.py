@@ -18,7 +18,11 @@
 
 import math
 import functools
+from collections import OrderedDict
 from typing import Callable
+
+import numpy as np
+
 from .geometry import Geometry
 from . import p5
 from ..pmath import matrix
@@ -45,6 +49,107 @@ MIN_POINT_ACCURACY = 20
 MAX_POINT_ACCURACY = 200
 POINT_ACCURACY_FACTOR = 10
 
+# Maximum number of base meshes kept in the mesh cache
+MESH_CACHE_SIZE = 128
+
+# Attributes of a Geometry shared by all the shapes drawn from the same
+# base mesh
+MESH_ATTRIBUTES = (
+    "vertices",
+    "line_vertices",
+    "line_normals",
+    "vertex_normals",
+    "faces",
+    "uvs",
+    "edges",
+    "stroke_indices",
+)
+
+
+class MeshCache:
+    """A least recently used cache of the meshes of the 3D primitives.
+
+    The meshes are built with unit dimensions and scaled by the model
+    matrix of every shape, so a box or a sphere drawn every frame only
+    builds its mesh once, whatever its size. The arrays of the cached
+    meshes are read-only, they are shared by all the shapes drawn from
+    them.
+
+    :param max_size: maximum number of meshes kept in the cache
+    :type max_size: int
+    """
+
+    def __init__(self, max_size=MESH_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._meshes = OrderedDict()
+
+    def __len__(self):
+        return len(self._meshes)
+
+    def get(self, key, build):
+        """The base mesh of a primitive.
+
+        :param key: primitive and parameters the mesh depends on
+        :type key: tuple
+
+        :param build: function returning the mesh, called when it is
+            not in the cache
+        :type build: Callable
+
+        :returns: base mesh, with read-only arrays
+        :rtype: Geometry
+        """
+        mesh = self._meshes.get(key)
+        if mesh is not None:
+            self.hits += 1
+            self._meshes.move_to_end(key)
+            return mesh
+
+        self.misses += 1
+        mesh = build()
+        for name in MESH_ATTRIBUTES:
+            values = np.array(getattr(mesh, name))
+            values.flags.writeable = False
+            setattr(mesh, name, values)
+        if self.max_size > 0:
+            self._meshes[key] = mesh
+        while len(self._meshes) > self.max_size:
+            self._meshes.popitem(last=False)
+        return mesh
+
+    def clear(self):
+        """Remove all meshes and reset the counters."""
+        self._meshes.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+mesh_cache = MeshCache()
+
+
+def _cached_geometry(key, build, transform):
+    """A new geometry sharing the arrays of a cached base mesh.
+
+    :param key: primitive and parameters the mesh depends on
+    :type key: tuple
+
+    :param build: function building the mesh
+    :type build: Callable
+
+    :param transform: model matrix of the new geometry
+    :type transform: np.ndarray
+
+    :rtype: Geometry
+    """
+    mesh = mesh_cache.get(key, build)
+    geom = Geometry(mesh.detail_x, mesh.detail_y)
+    for name in MESH_ATTRIBUTES:
+        setattr(geom, name, getattr(mesh, name))
+    geom.matrix = transform
+    return geom
+
 
 def _draw_on_return(func: Callable):
     """Set shape parameters to default renderer parameters"""
@@ -94,7 +199,15 @@ def box(
 
     :param detail_y: Optional number of triangle subdivisions in y-dimension. Default is 1
     """
+    return _cached_geometry(
+        ("box", detail_x, detail_y),
+        lambda: _box_mesh(detail_x, detail_y),
+        matrix.scale_transform(width, height, depth),
+    )
+
 
+def _box_mesh(detail_x, detail_y):
+    """Mesh of a unit box"""
     geom = Geometry(detail_x, detail_y)
 
     cube_indices = [
@@ -106,20 +219,22 @@ def box(
         [4, 5, 6, 7],  # 0, 0, +1] // +z
     ]
 
-    geom.stroke_indices = [
-        [0, 1],
-        [1, 3],
-        [3, 2],
-        [6, 7],
-        [8, 9],
-        [9, 11],
-        [14, 15],
-        [16, 17],
-        [17, 19],
-        [18, 19],
-        [20, 21],
-        [22, 23],
-    ]
+    geom.append(
+        stroke_indices=[
+            [0, 1],
+            [1, 3],
+            [3, 2],
+            [6, 7],
+            [8, 9],
+            [9, 11],
+            [14, 15],
+            [16, 17],
+            [17, 19],
+            [18, 19],
+            [20, 21],
+            [22, 23],
+        ]
+    )
 
     for i in range(len(cube_indices)):
         cube_index = cube_indices[i]
@@ -129,15 +244,12 @@ def box(
 
             octant = [((d & 1) * 2 - 1) / 2, ((d & 2) - 1) / 2, ((d & 4) / 2 - 1) / 2]
 
-            geom.vertices.append(octant)
-            geom.uvs.extend([j & 1, (j & 2) / 2])
+            geom.append(vertices=octant, uvs=[j & 1, (j & 2) / 2])
 
-        geom.faces.append([v, v + 1, v + 2])
-        geom.faces.append([v + 2, v + 1, v + 3])
+        geom.append(faces=[[v, v + 1, v + 2], [v + 2, v + 1, v + 3]])
 
     geom.compute_normals()
     geom.make_triangle_edges()
-    geom.matrix = matrix.scale_transform(width, height, depth)
 
     return geom
 
@@ -155,21 +267,31 @@ def plane(width: float, height: float, detail_x: int = 1, detail_y: int = 1):
 
     :param detail_y: Optional number of triangle subdivisions in y-dimension. Default is 1
     """
+    return _cached_geometry(
+        ("plane", detail_x, detail_y),
+        lambda: _plane_mesh(detail_x, detail_y),
+        matrix.scale_transform(width, height, 1),
+    )
+
+
+def _plane_mesh(detail_x, detail_y):
+    """Mesh of a unit plane"""
     geom = Geometry(detail_x, detail_y)
 
-    for i in range(detail_y + 1):
-        v = i / detail_y
-        for j in range(detail_x + 1):
-            u = j / detail_x
-            p = [u - 0.5, v - 0.5, 0]
-            geom.vertices.append(p)
-            geom.uvs.extend([u, v])
+    v, u = np.meshgrid(
+        np.arange(detail_y + 1) / detail_y,
+        np.arange(detail_x + 1) / detail_x,
+        indexing="ij",
+    )
+    geom.append(
+        vertices=np.stack((u - 0.5, v - 0.5, np.zeros_like(u)), axis=-1),
+        uvs=np.stack((u, v), axis=-1),
+    )
 
     geom.compute_faces()
     geom.compute_normals()
     geom.make_triangle_edges()
     geom.edges_to_vertices()
-    geom.matrix = matrix.scale_transform(width, height, 1)
 
     return geom
 
@@ -209,29 +331,33 @@ def ellipsoid(
 
     :param detail_y: Optional number of triangle subdivisions in y-dimension. Default is 16
     """
-    geom = Geometry(detail_x, detail_y)
+    return _cached_geometry(
+        ("ellipsoid", detail_x, detail_y),
+        lambda: _ellipsoid_mesh(detail_x, detail_y),
+        matrix.scale_transform(radius_x, radius_y, radius_z),
+    )
 
-    for i in range(detail_y + 1):
-        v = i / detail_y
-        phi = math.pi * v - math.pi / 2
-        cosPhi = math.cos(phi)
-        sinPhi = math.sin(phi)
 
-        for j in range(detail_x + 1):
-            u = j / detail_x
-            theta = 2 * math.pi * u
-            cosTheta = math.cos(theta)
-            sinTheta = math.sin(theta)
-            p = [cosPhi * sinTheta, sinPhi, cosPhi * cosTheta]
+def _ellipsoid_mesh(detail_x, detail_y):
+    """Mesh of a unit sphere"""
+    geom = Geometry(detail_x, detail_y)
 
-            geom.vertices.append(p)
-            geom.vertex_normals.append(p)
-            geom.uvs.extend([u, v])
+    v, u = np.meshgrid(
+        np.arange(detail_y + 1) / detail_y,
+        np.arange(detail_x + 1) / detail_x,
+        indexing="ij",
+    )
+    phi = math.pi * v - math.pi / 2
+    theta = 2 * math.pi * u
+    p = np.stack(
+        (np.cos(phi) * np.sin(theta), np.sin(phi), np.cos(phi) * np.cos(theta)),
+        axis=-1,
+    )
+    geom.append(vertices=p, vertex_normals=p, uvs=np.stack((u, v), axis=-1))
 
     geom.compute_faces()
     geom.make_triangle_edges()
     geom.edges_to_vertices()
-    geom.matrix = matrix.scale_transform(radius_x, radius_y, radius_z)
 
     return geom
 
@@ -260,6 +386,12 @@ def truncated_cone(
     sin_slant = math.sin(slant)
     cos_slant = math.cos(slant)
 
+    u = np.arange(detail_x) / detail_x
+    ur = 2 * math.pi * u
+    sur = np.sin(ur)
+    cur = np.cos(ur)
+    ring = np.ones(detail_x)
+
     for yy in range(start, end + 1):
         # for the middle
         v = yy / detail_y
@@ -282,68 +414,67 @@ def truncated_cone(
             ring_radius = 0
 
         y -= height / 2  # shift coordinate origin to the center of object
-        for ii in range(detail_x):
-            u = ii / detail_x
-            ur = 2 * math.pi * u
-            sur = math.sin(ur)
-            cur = math.cos(ur)
 
-            geom.vertices.append([sur * ring_radius, y, cur * ring_radius])
+        if yy < 0:
+            vertex_normals = np.outer(ring, [0, -1, 0])
+        elif yy > detail_y and top_radius:
+            vertex_normals = np.outer(ring, [0, 1, 0])
+        else:
+            vertex_normals = np.column_stack(
+                (sur * cos_slant, sin_slant * ring, cur * cos_slant)
+            )
 
-            if yy < 0:
-                vertex_normals = [0, -1, 0]
-            elif yy > detail_y and top_radius:
-                vertex_normals = [0, 1, 0]
-            else:
-                vertex_normals = [sur * cos_slant, sin_slant, cur * cos_slant]
+        geom.append(
+            vertices=np.column_stack((sur * ring_radius, y * ring, cur * ring_radius)),
+            vertex_normals=vertex_normals,
+            uvs=np.column_stack((u, v * ring)),
+        )
 
-            geom.vertex_normals.append(vertex_normals)
-            geom.uvs.extend([u, v])
+    ii = np.arange(detail_x)
+    nextii = (ii + 1) % detail_x
 
     start_index = 0
     if bottom_cap:
-        for jj in range(detail_x):
-            nextjj = (jj + 1) % detail_x
-            geom.faces.append(
-                [
-                    start_index + jj,
-                    start_index + detail_x + nextjj,
-                    start_index + detail_x + jj,
-                ]
+        geom.append(
+            faces=np.column_stack(
+                (
+                    start_index + ii,
+                    start_index + detail_x + nextii,
+                    start_index + detail_x + ii,
+                )
             )
+        )
 
         start_index += detail_x * 2
 
     for _ in range(detail_y):
-        for ii in range(detail_x):
-            nextii = (ii + 1) % detail_x
-            geom.faces.append(
-                [
+        # Two triangles for every segment of the ring
+        geom.append(
+            faces=np.column_stack(
+                (
                     start_index + ii,
                     start_index + nextii,
                     start_index + detail_x + nextii,
-                ]
-            )
-            geom.faces.append(
-                [
                     start_index + ii,
                     start_index + detail_x + nextii,
                     start_index + detail_x + ii,
-                ]
+                )
             )
+        )
 
         start_index += detail_x
 
     if top_cap:
         start_index += detail_x
-        for ii in range(detail_x):
-            geom.faces.append(
-                [
+        geom.append(
+            faces=np.column_stack(
+                (
                     start_index + ii,
-                    start_index + (ii + 1) % detail_x,
-                    start_index + detail_x,
-                ]
+                    start_index + nextii,
+                    (start_index + detail_x) * ring,
+                )
             )
+        )
 
     return geom
 
@@ -373,13 +504,11 @@ def cylinder(
     :param top_cap: whether to draw the top of the cylinder
     """
 
-    geom = truncated_cone(1, 1, 1, detail_x, detail_y, bottom_cap, top_cap)
-    geom.matrix = matrix.scale_transform(radius, height, radius)
-
-    geom.make_triangle_edges()
-    geom.edges_to_vertices()
-
-    return geom
+    return _cached_geometry(
+        ("cylinder", detail_x, detail_y, bool(top_cap), bool(bottom_cap)),
+        lambda: _truncated_cone_mesh(1, detail_x, detail_y, bottom_cap, top_cap),
+        matrix.scale_transform(radius, height, radius),
+    )
 
 
 @_draw_on_return
@@ -401,12 +530,18 @@ def cone(
 
     :param detail_y: Optional number of triangle subdivisions in y-dimension. Default is 1
     """
-    geom = truncated_cone(1, 0, 1, detail_x, detail_y, cap, False)
+    return _cached_geometry(
+        ("cone", detail_x, detail_y, bool(cap)),
+        lambda: _truncated_cone_mesh(0, detail_x, detail_y, cap, False),
+        matrix.scale_transform(radius, height, radius),
+    )
+
 
+def _truncated_cone_mesh(top_radius, detail_x, detail_y, bottom_cap, top_cap):
+    """Mesh of a cylinder or a cone of unit radius and height"""
+    geom = truncated_cone(1, top_radius, 1, detail_x, detail_y, bottom_cap, top_cap)
     geom.make_triangle_edges()
     geom.edges_to_vertices()
-
-    geom.matrix = matrix.scale_transform(radius, height, radius)
     return geom
 
 
@@ -426,8 +561,22 @@ def torus(
     :param detail_y: Optional number of triangle subdivisions in y-dimension. Default is 16
     """
     tube_ratio = tube_radius / radius
+    return _cached_geometry(
+        ("torus", tube_ratio, detail_x, detail_y),
+        lambda: _torus_mesh(tube_ratio, detail_x, detail_y),
+        matrix.scale_transform(radius, radius, radius),
+    )
+
+
+def _torus_mesh(tube_ratio, detail_x, detail_y):
+    """Mesh of a torus of unit radius"""
     geom = Geometry(detail_x, detail_y)
 
+    theta = 2 * math.pi * np.arange(detail_x + 1) / detail_x
+    cosTheta = np.cos(theta)
+    sinTheta = np.sin(theta)
+    ring = np.ones(detail_x + 1)
+
     for i in range(detail_y + 1):
         v = i / detail_y
         phi = 2 * math.pi * v
@@ -435,21 +584,18 @@ def torus(
         sinPhi = math.sin(phi)
         r = 1 + tube_ratio * cosPhi
 
-        for j in range(detail_x + 1):
-            u = j / detail_x
-            theta = 2 * math.pi * u
-            cosTheta = math.cos(theta)
-            sinTheta = math.sin(theta)
-
-            geom.vertices.append([r * cosTheta, r * sinTheta, tube_ratio * sinPhi])
+        geom.append(
+            vertices=np.column_stack(
+                (r * cosTheta, r * sinTheta, tube_ratio * sinPhi * ring)
+            )
+        )
 
-        n = [cosPhi * cosTheta, cosPhi * sinTheta, sinPhi]
-        geom.vertex_normals.append(n)
-        geom.uvs.extend([u, v])
+        # The normal and the uvs of the last vertex of the ring
+        n = [cosPhi * cosTheta[-1], cosPhi * sinTheta[-1], sinPhi]
+        geom.append(vertex_normals=n, uvs=[1, v])
 
     geom.compute_faces()
     geom.make_triangle_edges()
     geom.edges_to_vertices()
-    geom.matrix = matrix.scale_transform(radius, radius, radius)
 
     return geom
@@ -1,5 +1,8 @@
 import unittest
-from p5.core.color import Color
+
+import numpy as np
+
+from p5.core.color import Color, parse_colors
 
 
 class TestColor(unittest.TestCase):
@@ -24,6 +27,19 @@ class TestColor(unittest.TestCase):
         # Name
         self.assertEqual(Color("crimson"), Color(220, 20, 60))
 
+    def test_parse_colors(self):
+        np.testing.assert_allclose(parse_colors([51, 51]), [(0.2, 0.2, 0.2, 1)] * 2)
+        np.testing.assert_allclose(parse_colors([[0, 255, 0]]), [(0, 1, 0, 1)])
+        np.testing.assert_allclose(parse_colors([[255, 0, 0, 51]]), [(1, 0, 0, 0.2)])
+        np.testing.assert_allclose(
+            parse_colors([[255, 51], [300, -5]]), [(1, 1, 1, 0.2), (1, 1, 1, 0)]
+        )
+        np.testing.assert_allclose(
+            parse_colors([Color(0, 255, 0)]), [Color(0, 255, 0).normalized]
+        )
+        with self.assertRaises(ValueError):
+            parse_colors(np.zeros((2, 5)))
+
 
 if __name__ == "__main__":
     unittest.main()
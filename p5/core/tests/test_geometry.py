@@ -1,7 +1,7 @@
 import unittest
 
 import numpy as np
-from p5.core.geometry import Geometry
+from p5.core.geometry import Geometry, GeometryBuffer
 from p5.core import p5
 import builtins
 
@@ -21,20 +21,22 @@ cube_indices = [
     [4, 5, 6, 7],  # 0, 0, +1] // +z
 ]
 
-box.stroke_indices = [
-    [0, 1],
-    [1, 3],
-    [3, 2],
-    [6, 7],
-    [8, 9],
-    [9, 11],
-    [14, 15],
-    [16, 17],
-    [17, 19],
-    [18, 19],
-    [20, 21],
-    [22, 23],
-]
+box.append(
+    stroke_indices=[
+        [0, 1],
+        [1, 3],
+        [3, 2],
+        [6, 7],
+        [8, 9],
+        [9, 11],
+        [14, 15],
+        [16, 17],
+        [17, 19],
+        [18, 19],
+        [20, 21],
+        [22, 23],
+    ]
+)
 
 for i in range(len(cube_indices)):
     cube_index = cube_indices[i]
@@ -44,11 +46,9 @@ for i in range(len(cube_indices)):
 
         octant = [((d & 1) * 2 - 1) / 2, ((d & 2) - 1) / 2, ((d & 4) / 2 - 1) / 2]
 
-        box.vertices.append(octant)
-        box.uvs.extend([j & 1, (j & 2) / 2])
+        box.append(vertices=octant, uvs=[j & 1, (j & 2) / 2])
 
-    box.faces.append([v, v + 1, v + 2])
-    box.faces.append([v + 2, v + 1, v + 3])
+    box.append(faces=[[v, v + 1, v + 2], [v + 2, v + 1, v + 3]])
 
 
 class TestBoxGeometry(unittest.TestCase):
@@ -155,7 +155,65 @@ class TestBoxGeometry(unittest.TestCase):
             [23, 22],
         ]
 
-        self.assertEqual(edges, box.edges)
+        np.testing.assert_array_equal(box.edges, edges)
+
+
+class TestGridGeometry(unittest.TestCase):
+    def test_faces(self):
+        grid = Geometry(2, 1)
+        grid.compute_faces()
+        np.testing.assert_array_equal(
+            grid.faces, [[0, 1, 3], [3, 1, 4], [1, 2, 4], [4, 2, 5]]
+        )
+
+    def test_edges_to_vertices(self):
+        line = Geometry(1, 1)
+        line.vertices = [[0, 0, 0], [2, 0, 0]]
+        line.edges = [[0, 1]]
+        line.edges_to_vertices()
+        np.testing.assert_array_equal(
+            line.line_vertices, np.array(line.vertices)[[0, 0, 1, 1, 0, 1]]
+        )
+        np.testing.assert_array_equal(
+            line.line_normals, [[1, 0, 0, side] for side in [1, -1, 1, 1, -1, -1]]
+        )
+
+
+class TestGeometryStorage(unittest.TestCase):
+    def test_arrays(self):
+        self.assertEqual(box.vertices.dtype, np.float32)
+        self.assertEqual(box.vertices.shape, (24, 3))
+        self.assertEqual(box.faces.dtype, np.uint32)
+        self.assertEqual(box.uvs.shape, (24, 2))
+        self.assertEqual(box.stroke_indices.shape, (12, 2))
+        self.assertFalse(hasattr(box, "__dict__"))
+        with self.assertRaises(TypeError):
+            box.append(colors=[0, 0, 0])
+
+    def test_buffer(self):
+        buffer = GeometryBuffer(3, np.float32)
+        buffer.extend([0, 1, 2])
+        data = buffer.array
+        buffer.extend(np.ones((5, 3)))
+        self.assertEqual(len(buffer), 6)
+        np.testing.assert_array_equal(buffer.array[:2], [[0, 1, 2], [1, 1, 1]])
+        # Appending into spare capacity does not move the rows
+        self.assertTrue(np.shares_memory(data, buffer.array))
+
+        buffer.clear()
+        self.assertEqual(buffer.array.shape, (0, 3))
+
+    def test_assign(self):
+        values = np.zeros((2, 3), dtype=np.float32)
+        values.flags.writeable = False
+        geom = Geometry()
+        geom.vertices = values
+        self.assertTrue(np.shares_memory(geom.vertices, values))
+
+        # The assigned array is copied before rows are appended
+        geom.append(vertices=[1, 1, 1])
+        self.assertEqual(geom.vertices.shape, (3, 3))
+        self.assertFalse(np.shares_memory(geom.vertices, values))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from p5.core import p5
+from p5.core import primitives3d
+from p5.core.material import NormalMaterial
+from p5.core.primitives3d import MeshCache, mesh_cache
+from p5.pmath import matrix
+from p5.sketch.Vispy3DRenderer.renderer3d import Renderer3D
+
+
+class TestMeshCache(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        p5.renderer = Renderer3D()
+        mesh_cache.clear()
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+        mesh_cache.clear()
+
+    def test_shared_mesh(self):
+        first = primitives3d.sphere(10)
+        p5.renderer.style.material = NormalMaterial()
+        second = primitives3d.ellipsoid(5, 6, 7, 24, 16)
+        self.assertEqual((mesh_cache.hits, mesh_cache.misses), (1, 1))
+
+        # Only the transform and the material belong to the shape
+        self.assertTrue(np.shares_memory(first.vertices, second.vertices))
+        self.assertTrue(np.shares_memory(first.faces, second.faces))
+        np.testing.assert_array_equal(second.matrix, matrix.scale_transform(5, 6, 7))
+        self.assertIsInstance(second.material, NormalMaterial)
+        self.assertNotIsInstance(first.material, NormalMaterial)
+        with self.assertRaises(ValueError):
+            second.vertices[0, 0] = 1
+
+    def test_mesh(self):
+        # Same mesh as built without the cache
+        geom = primitives3d.box(2, 3, 4)
+        mesh = primitives3d._box_mesh(1, 1)
+        self.assertEqual(geom.vertices.shape, (24, 3))
+        np.testing.assert_array_equal(geom.vertices, mesh.vertices)
+        np.testing.assert_array_equal(geom.faces, mesh.faces)
+        np.testing.assert_array_equal(geom.edges, mesh.edges)
+        np.testing.assert_array_equal(geom.vertex_normals, mesh.vertex_normals)
+
+    def test_keys(self):
+        primitives3d.cylinder(10, 20)
+        primitives3d.cylinder(10, 20, top_cap=False)
+        primitives3d.cone(10, 20)
+        primitives3d.torus(50, 10)
+        primitives3d.torus(100, 20)
+        primitives3d.torus(50, 20)
+        primitives3d.plane(10, 10, 2, 2)
+        primitives3d.plane(10, 10, 2, 3)
+        self.assertEqual((mesh_cache.hits, mesh_cache.misses), (1, 7))
+
+    def test_least_recently_used(self):
+        cache = MeshCache(max_size=2)
+        build = primitives3d.Geometry
+        first = cache.get("a", build)
+        cache.get("b", build)
+        self.assertIs(cache.get("a", build), first)
+        cache.get("c", build)
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get("a", build), first)
+        self.assertIsNot(cache.get("b", build), None)
+        self.assertEqual(cache.misses, 4)
+
+        cache.max_size = 0
+        cache.get("d", build)
+        self.assertEqual(len(cache), 0)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 import unittest
 import numpy as np
 
+from p5.core import p5
+from p5.core.constants import SType
+from p5.sketch.Vispy2DRenderer.openglrenderer import get_render_primitives
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D
 from p5.sketch.Vispy2DRenderer.shape import PShape
 from p5.core.color import Color
 from p5.pmath import PI
@@ -152,5 +156,55 @@ class TestPShape(unittest.TestCase):
         quad.reset_matrix()
 
 
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        p5.renderer = VispyRenderer2D()
+        self.shape = PShape(
+            vertices=[(0, 0, 0), (100, 0, 0), (100, 100, 0), (0, 100, 0)],
+            contours=[[(25, 25, 0), (25, 75, 0), (75, 75, 0), (75, 25, 0)]],
+        )
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+
+    def test_cached(self):
+        primitives = get_render_primitives(self.shape)
+        self.assertIs(get_render_primitives(self.shape), primitives)
+
+    def test_2d_vertices(self):
+        line = PShape(vertices=[(0, 0), (10, 5)], shape_type=SType.LINES)
+        ((stype, vertices, idx),) = get_render_primitives(line)
+        np.testing.assert_array_equal(vertices, [[0, 0, 0], [10, 5, 0]])
+
+    def test_style_enabled(self):
+        primitives = get_render_primitives(self.shape)
+        p5.renderer.style.stroke_enabled = False
+        no_stroke = get_render_primitives(self.shape)
+        self.assertNotIn("lines", [stype for stype, _, _ in no_stroke])
+        p5.renderer.style.stroke_enabled = True
+        self.assertIs(get_render_primitives(self.shape), primitives)
+
+    def test_invalidate(self):
+        primitives = get_render_primitives(self.shape)
+        with self.shape.edit(reset=False):
+            self.shape.update_vertex(2, (200, 100))
+        updated = get_render_primitives(self.shape)
+        self.assertIsNot(updated, primitives)
+        self.assertEqual(updated[-2][1][:, 0].max(), 200)
+
+        with self.shape.edit():
+            for vertex in [(0, 0), (10, 0), (10, 10)]:
+                self.shape.add_vertex(vertex)
+        self.assertEqual(len(get_render_primitives(self.shape)[-1][1]), 3)
+
+        primitives = get_render_primitives(self.shape)
+        self.shape.stroke_weight = 4
+        self.assertIsNot(get_render_primitives(self.shape), primitives)
+        primitives = get_render_primitives(self.shape)
+        self.shape.vertices = [(0, 0, 0), (5, 0, 0), (5, 5, 0)]
+        self.assertEqual(len(get_render_primitives(self.shape)[-1][1]), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+
+import numpy as np
+
+from p5.core import p5
+from p5.core.triangulate import is_convex, triangulate
+from p5.sketch.Vispy2DRenderer.openglrenderer import (
+    TRIANGULATE_MIN_VERTICES,
+    get_render_primitives,
+    tessellation_stats,
+)
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D
+from p5.sketch.Vispy2DRenderer.shape import PShape
+
+
+def circle(n, radius=1, center=(0, 0)):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack(
+        (center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles))
+    )
+
+
+def polygon_area(vertices):
+    x, y = np.asarray(vertices, dtype=float)[:, :2].T
+    return abs(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)) / 2
+
+
+def triangle_areas(vertices, triangles):
+    a, b, c = (vertices[triangles[:, k], :2] for k in range(3))
+    ab, ac = b - a, c - a
+    return (ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]) / 2
+
+
+class TestTriangulate(unittest.TestCase):
+    def assertFills(self, outline, holes=()):
+        """Check that the triangles cover the polygon without overlaps"""
+        result = triangulate(outline, holes)
+        self.assertIsNotNone(result)
+        vertices, triangles = result
+        self.assertEqual(triangles.dtype, np.uint32)
+        areas = triangle_areas(vertices, triangles)
+        # All the triangles have the same orientation, up to rounding
+        self.assertTrue(np.all(areas > -1e-12) or np.all(areas < 1e-12))
+        expected = polygon_area(outline) - sum(polygon_area(hole) for hole in holes)
+        self.assertAlmostEqual(np.abs(areas).sum(), expected)
+        return vertices, triangles
+
+    def test_convex(self):
+        vertices, triangles = self.assertFills([(0, 0), (10, 0), (10, 10), (0, 10)])
+        self.assertEqual(vertices.shape, (4, 2))
+        self.assertEqual(triangles.shape, (2, 3))
+
+    def test_concave(self):
+        self.assertFills([(0, 0), (10, 0), (10, 10), (5, 5), (0, 10)])
+        comb = [(0, 0), (100, 0)]
+        for i in range(50, 0, -1):
+            comb += [(2 * i, 10), (2 * i - 1, 1)]
+        self.assertFills(comb)
+
+    def test_holes(self):
+        square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+        holes = [[(2, 2), (4, 2), (4, 4), (2, 4)], [(6, 6), (6, 8), (8, 8), (8, 6)]]
+        vertices, triangles = self.assertFills(square, holes)
+        # The original vertices come first
+        np.testing.assert_array_equal(vertices[:4], square)
+
+        grid = [
+            circle(8, 0.4, (x, y)) for x in range(1, 10, 2) for y in range(1, 10, 2)
+        ]
+        self.assertFills([(0, 0), (11, 0), (11, 11), (0, 11)], grid)
+
+        # Like with GLU, contours outside of the outline are filled
+        vertices, triangles = triangulate(square, [[(20, 20), (30, 20), (30, 30)]])
+        self.assertAlmostEqual(np.abs(triangle_areas(vertices, triangles)).sum(), 150)
+
+    def test_many_vertices(self):
+        self.assertFills(circle(5000))
+
+    def test_star(self):
+        # Symmetric vertices computed with cos() and sin() have heights
+        # that only differ by rounding errors
+        for n in (20, 100):
+            star = circle(n, radius=100)
+            star[1::2] *= 0.5
+            self.assertFills(star)
+
+    def test_collinear_and_duplicate_vertices(self):
+        self.assertFills([(0, 0), (5, 0), (10, 0), (10, 10), (10, 10), (0, 10)])
+
+    def test_3d(self):
+        vertices, triangles = triangulate([(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)])
+        self.assertEqual(vertices.shape, (4, 3))
+        self.assertEqual(triangles.shape, (2, 3))
+
+    def test_unsupported(self):
+        # Self-intersecting
+        self.assertIsNone(triangulate([(0, 0), (10, 10), (10, 0), (0, 10)]))
+        self.assertIsNone(
+            triangulate([(0, 0), (10, 0), (10, 10)], [[(5, -1), (6, 5), (4, 5)]])
+        )
+        self.assertIsNone(triangulate([]))
+
+    def test_no_area(self):
+        _, triangles = triangulate([(0, 0), (1, 1), (2, 2)])
+        self.assertEqual(len(triangles), 0)
+
+
+class TestConvex(unittest.TestCase):
+    def test_convex(self):
+        self.assertTrue(is_convex([(0, 0), (10, 0), (10, 10), (0, 10)]))
+        self.assertTrue(is_convex([(0, 10), (10, 10), (10, 0), (0, 0)]))
+        self.assertTrue(is_convex(circle(1000)))
+        self.assertTrue(is_convex([(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)]))
+        # Collinear and duplicate vertices
+        self.assertTrue(is_convex([(0, 0), (5, 0), (10, 0), (10, 10), (10, 10)]))
+
+    def test_not_convex(self):
+        self.assertFalse(is_convex([(0, 0), (10, 0), (10, 10), (5, 5), (0, 10)]))
+        # Bowtie and pentagram
+        self.assertFalse(is_convex([(0, 0), (10, 10), (10, 0), (0, 10)]))
+        self.assertFalse(is_convex(circle(5)[[0, 2, 4, 1, 3]]))
+        # Folding back on an edge
+        self.assertFalse(is_convex([(0, 0), (10, 0), (5, 0), (0, 10)]))
+        self.assertFalse(is_convex([(0, 0), (1, 1), (2, 2)]))
+        self.assertFalse(is_convex([(0, 0), (1, 1)]))
+
+
+class TestTessellation(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        p5.renderer = VispyRenderer2D()
+        p5.renderer.style.stroke_enabled = False
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+
+    def test_convex(self):
+        tessellation_stats.clear()
+        shape = PShape(vertices=circle(5))
+        ((stype, vertices, idx),) = get_render_primitives(shape)
+        self.assertEqual(stype, "triangles")
+        np.testing.assert_array_equal(idx, [0, 1, 2, 0, 2, 3, 0, 3, 4])
+        self.assertEqual(tessellation_stats, {"convex": 1})
+
+    def test_concave(self):
+        tessellation_stats.clear()
+        shape = PShape(vertices=[(0, 0, 0), (10, 0, 0), (10, 10, 0), (5, 2, 0)])
+        get_render_primitives(shape)
+        self.assertEqual(tessellation_stats, {"glu": 1})
+
+    def test_large_polygon(self):
+        tessellation_stats.clear()
+        angles = np.linspace(0, 2 * np.pi, TRIANGULATE_MIN_VERTICES, endpoint=False)
+        radii = 1 + 0.1 * np.sin(8 * angles)
+        shape = PShape(
+            vertices=np.column_stack((radii * np.cos(angles), radii * np.sin(angles)))
+        )
+        ((stype, vertices, idx),) = get_render_primitives(shape)
+        self.assertEqual(stype, "triangles")
+        np.testing.assert_array_equal(
+            vertices[:TRIANGULATE_MIN_VERTICES, :2], np.asarray(shape.vertices)[:, :2]
+        )
+        self.assertEqual(len(idx) % 3, 0)
+        self.assertEqual(tessellation_stats, {"triangulate": 1})
+
+    def test_self_intersecting(self):
+        # Left to the GLU tessellator, which adds the crossing points
+        n = TRIANGULATE_MIN_VERTICES + 1
+        angles = np.linspace(0, 4 * np.pi, n, endpoint=False)
+        star = np.column_stack((np.cos(angles), np.sin(angles), np.zeros(n)))
+        star[0, 0] = 2
+        self.assertIsNone(triangulate(star))
+        primitives = get_render_primitives(PShape(vertices=star))
+        self.assertTrue(len(primitives) > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Triangulate polygons with holes using NumPy.
+
+The polygon is cut into horizontal slabs at the height of each of its
+vertices. No vertex lies strictly inside a slab, so the edges crossing
+a slab can be sorted from left to right, and the space between the
+first and the second edge, the third and the fourth, ... is inside the
+polygon. Each of these trapezoids is filled with two triangles.
+
+Contours are handled like the outline, the polygon is filled with the
+odd winding rule used by the GLU tessellator. Edges crossing inside a
+slab would need new vertices at the crossing, :func:`triangulate`
+returns None for those self-intersecting polygons and the caller falls
+back to the GLU tessellator.
+"""
+
+import numpy as np
+
+# The number of crossings of edges and slabs allowed for one polygon,
+# polygons needing more (e.g. with many long spikes) are left to GLU.
+MIN_CROSSINGS = 10_000
+CROSSINGS_PER_VERTEX = 16
+
+# Coordinates closer than this fraction of the size of the polygon are
+# taken as equal, which absorbs the rounding errors of vertices
+# computed with cos() and sin()
+TOLERANCE = 1e-9
+
+# The axes kept by _project, after dropping x, y or z
+_KEPT_AXES = ([1, 2], [0, 2], [0, 1])
+
+
+def _next(values):
+    """The values shifted by one, the first moved to the end"""
+    return np.concatenate((values[1:], values[:1]))
+
+
+def _project(vertices):
+    """Project the vertices of a planar polygon to 2D by dropping the
+    axis along which its normal is the largest, or None if the polygon
+    has no area."""
+    if vertices.shape[1] == 2:
+        return vertices
+    following = _next(vertices)
+    # Normal of the polygon with Newell's method
+    normal = np.abs(
+        np.sum(
+            (vertices - following)[:, [1, 2, 0]] * (vertices + following)[:, [2, 0, 1]],
+            axis=0,
+        )
+    )
+    if not normal.any():
+        return None
+    return vertices[:, _KEPT_AXES[normal.argmax()]]
+
+
+def _snap(values, tolerance):
+    """The values, with runs of values less than `tolerance` apart
+    replaced by the lowest value of the run"""
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    starts = np.concatenate(([True], np.diff(ordered) > tolerance))
+    snapped = np.empty_like(values)
+    snapped[order] = ordered[starts][np.cumsum(starts) - 1]
+    return snapped
+
+
+def is_convex(vertices):
+    """Check whether the vertices are the outline of a convex polygon,
+    which can be filled with a triangle fan from any of its vertices.
+
+    :param vertices: (N, 2) or (N, 3) array of the outline of the
+        polygon. The vertices must lie in a plane.
+    :type vertices: np.ndarray
+
+    :rtype: bool
+    """
+    points = np.asarray(vertices, dtype=np.float64)
+    if points.ndim != 2 or len(points) < 3 or not np.isfinite(points).all():
+        return False
+    xy = _project(points)
+    if xy is None:
+        return False
+    edges = _next(xy) - xy
+    edges = edges[np.any(edges != 0, axis=1)]
+    following = _next(edges)
+    cross = edges[:, 0] * following[:, 1] - edges[:, 1] * following[:, 0]
+    dot = np.sum(edges * following, axis=1)
+    # Every corner turns the same way, and none folds back on its edge
+    if not (np.all(cross >= 0) or np.all(cross <= 0)):
+        return False
+    if np.any((cross == 0) & (dot < 0)):
+        return False
+    # Turning around once, and not twice like a pentagram
+    return abs(np.arctan2(cross, dot).sum()) < 3 * np.pi
+
+
+def triangulate(vertices, contours=()):
+    """Triangulate a polygon with holes.
+
+    :param vertices: (N, 2) or (N, 3) array of the outline of the
+        polygon. The vertices must lie in a plane.
+    :type vertices: np.ndarray
+
+    :param contours: outlines of the holes in the polygon
+    :type contours: list
+
+    :returns: ``(vertices, triangles)`` where `vertices` holds the
+        outline, the contours and the points added on their edges and
+        `triangles` is an (M, 3) array of indices into it, or None if
+        the polygon has to be tessellated with GLU.
+    :rtype: tuple | None
+    """
+    rings = [np.asarray(vertices, dtype=np.float64)]
+    rings += [np.asarray(contour, dtype=np.float64) for contour in contours]
+    rings = [ring for ring in rings if len(ring) > 0]
+    if not rings:
+        return None
+    dims = max(ring.shape[1] for ring in rings)
+    rings = [
+        np.hstack([ring, np.zeros((len(ring), dims - ring.shape[1]))]) for ring in rings
+    ]
+    points = np.concatenate(rings)
+    if not np.isfinite(points).all():
+        return None
+    xy = _project(points)
+    if xy is None:
+        return None
+    x, y = xy.T
+    # Heights apart by rounding errors would leave thin slabs, in which
+    # the edges meeting at those vertices seem to cross
+    tolerance = TOLERANCE * max(np.ptp(x), np.ptp(y))
+    y = _snap(y, tolerance)
+
+    # The edges of the closed rings, from their lower to their upper end
+    sizes = np.array([len(ring) for ring in rings])
+    start = np.arange(len(points))
+    end = start + 1
+    end[np.cumsum(sizes) - 1] -= sizes
+    lower = np.where(y[start] <= y[end], start, end)
+    upper = np.where(y[start] <= y[end], end, start)
+    sloped = y[lower] != y[upper]
+    lower, upper = lower[sloped], upper[sloped]
+
+    # Crossings of the edges with the slabs between consecutive heights
+    heights = np.unique(y)
+    first = np.searchsorted(heights, y[lower])
+    counts = np.searchsorted(heights, y[upper]) - first
+    if counts.sum() > MIN_CROSSINGS + CROSSINGS_PER_VERTEX * len(points):
+        return None
+    edge = np.repeat(np.arange(len(lower)), counts)
+    slab = np.repeat(first, counts) + (
+        np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+
+    # Where the edges enter (bottom) and leave (top) the slabs, sorted
+    # from left to right in every slab
+    x0, y0 = x[lower][edge], y[lower][edge]
+    x1, y1 = x[upper][edge], y[upper][edge]
+    slope = (x1 - x0) / (y1 - y0)
+    bottom = np.where(heights[slab] == y0, x0, x0 + (heights[slab] - y0) * slope)
+    top = np.where(heights[slab + 1] == y1, x1, x0 + (heights[slab + 1] - y0) * slope)
+    order = np.lexsort((bottom + top, slab))
+    edge, slab, bottom, top = edge[order], slab[order], bottom[order], top[order]
+
+    # The fill rule pairs up the edges, which must not cross in a slab
+    if np.any(np.bincount(slab) % 2):
+        return None
+    same_slab = slab[1:] == slab[:-1]
+    crossed = (bottom[1:] < bottom[:-1] - tolerance) | (top[1:] < top[:-1] - tolerance)
+    if np.any(same_slab & crossed):
+        return None
+
+    # Corners of the trapezoids. A crossing at the height of an end of
+    # its edge is that vertex, the others are added to the vertices.
+    n_heights = len(heights)
+    keys = np.concatenate((edge * n_heights + slab, edge * n_heights + slab + 1))
+    keys, corners = np.unique(keys, return_inverse=True)
+    corner_edge, corner_height = np.divmod(keys, n_heights)
+    a, b = lower[corner_edge], upper[corner_edge]
+    t = (heights[corner_height] - y[a]) / (y[b] - y[a])
+    idx = np.where(t == 0, a, np.where(t == 1, b, -1))
+    added = idx < 0
+    idx[added] = len(points) + np.arange(np.count_nonzero(added))
+    t = t[added, np.newaxis]
+    new_points = points[a[added]] * (1 - t) + points[b[added]] * t
+
+    corners = idx[corners]
+    n = len(edge)
+    bottom_left, bottom_right = corners[0:n:2], corners[1:n:2]
+    top_left, top_right = corners[n::2], corners[n + 1 :: 2]
+    # Trapezoids narrowing to a point only need one triangle
+    triangles = np.concatenate(
+        (
+            np.column_stack((bottom_left, bottom_right, top_right))[
+                bottom[1::2] > bottom[0::2]
+            ],
+            np.column_stack((bottom_left, top_right, top_left))[top[1::2] > top[0::2]],
+        )
+    )
+    return np.concatenate((points, new_points)), triangles.astype(np.uint32)
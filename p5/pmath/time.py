@@ -21,6 +21,12 @@ import builtins
 
 
 def millis():
+    """Milliseconds since the sketch started.
+
+    In batch mode, this is the virtual time of the current frame.
+    """
+    if builtins.virtual_time is not None:
+        return int(builtins.virtual_time * 1000)
     return int((time.perf_counter() - builtins.start_time) * 1000)
 
 
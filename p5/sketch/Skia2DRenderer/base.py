@@ -4,6 +4,9 @@ import skia
 from OpenGL import GL
 
 import copy
+from ..capture import capture_queue
+from ..userspace import stop_recording
+from ..util import advance_clock
 from ..events import handler_names
 from .handlers import *
 from .util import *
@@ -15,7 +18,16 @@ def _dummy(*args, **kwargs):
 
 
 class SkiaSketch:
-    def __init__(self, setup_method, draw_method, handlers=dict(), frame_rate=60):
+    def __init__(
+        self,
+        setup_method,
+        draw_method,
+        handlers=dict(),
+        frame_rate=60,
+        headless=False,
+        frames=None,
+        batch=False,
+    ):
         self._size = (600, 400)
         self.setup_method = setup_method
         self.draw_method = draw_method
@@ -36,6 +48,14 @@ class SkiaSketch:
         self.frame_rate = frame_rate
         self.pixel_density = 1
 
+        # Without a window, the sketch is drawn on a CPU raster surface
+        # and stops after `frames` frames (or when it stops looping).
+        self.headless = headless
+        self.frames = frames
+        # Draw the frames as fast as possible, on a virtual clock
+        # running at `frame_rate`
+        self.batch = batch
+
         """
         resized : (boolean) 
         When we make a call to resize the window, it does not happen instantly
@@ -67,7 +87,16 @@ class SkiaSketch:
         self._size = val
         self.resize()
 
+    @property
+    def done(self):
+        """Whether `frames` frames have been drawn"""
+        return self.frames is not None and builtins.frame_count >= self.frames
+
     def clean_up(self):
+        stop_recording()
+        capture_queue.flush()
+        if self.headless:
+            return
         glfw.terminate()
         self.context.abandonContext()
 
@@ -99,8 +128,19 @@ class SkiaSketch:
         assert surface is not None
         return surface
 
+    def raster_surface(self):
+        """A CPU surface with the same pixel format as the window surface"""
+        return make_raster_surface(*self._size)
+
     # create a new surface everytime
     def create_surface(self):
+        if self.headless:
+            builtins.width, builtins.height = self._size
+            self.surface = self.raster_surface()
+            self.canvas = self.surface.getCanvas()
+            p5.renderer.initialize_renderer(self.canvas, self.paint, self.path)
+            return
+
         self._size = glfw.get_framebuffer_size(self.window)
         builtins.width, builtins.height = self._size
         self.surface = self.skia_surface()
@@ -114,16 +154,21 @@ class SkiaSketch:
         # Set redraw and looping to False
         # This is done to ensure draw() is called atleast once
 
-        while self.main_loop_state:
+        while self.main_loop_state and not self.done:
             if (
                 self.resized
                 and (self.looping or self.redraw)
-                and (time() - last_render_call_time) > 1 / self.frame_rate
+                and (
+                    self.batch or (time() - last_render_call_time) > 1 / self.frame_rate
+                )
             ):
-                builtins.frame_count += 1
+                self._next_frame()
                 with self.surface as self.canvas:
                     self.draw_method()
 
+                if p5.recorder is not None:
+                    p5.recorder.capture(self._read_surface, builtins.frame_count)
+
                 p5.renderer._store_surface_state()
                 self.surface.flushAndSubmit()
                 glfw.swap_buffers(self.window)
@@ -147,6 +192,10 @@ class SkiaSketch:
                 function(event)
 
     def start(self):
+        if self.headless:
+            self.start_headless()
+            return
+
         self.window = self.glfw_window()
         self.create_surface()
         self.assign_callbacks()
@@ -173,7 +222,48 @@ class SkiaSketch:
         self.main_loop()
         self.clean_up()
 
+    def start_headless(self):
+        """Run the sketch without a window.
+
+        setup() and draw() are run back to back on a raster surface,
+        without waiting for the next frame and without polling events.
+        The surface keeps its contents between frames, so unlike
+        with a window nothing is copied between the frames.
+
+        The raster surface has the pixel format of the window surface
+        and of graphics buffers, and draws exactly the same pixels as a
+        graphics buffer. The window surface is rasterized by the GPU,
+        which computes the coverage of antialiased edges differently:
+        pixels within one pixel of the edge of a shape can differ by
+        up to about 45 / 255 per channel, all other pixels are the
+        same.
+        """
+        self.create_surface()
+        self.setup_method()
+        p5.renderer.render()
+
+        while self.main_loop_state and not self.done:
+            if not (self.looping or self.redraw):
+                break
+
+            self._next_frame()
+            with self.surface as self.canvas:
+                self.draw_method()
+
+            if p5.recorder is not None:
+                p5.recorder.capture(self._read_surface, builtins.frame_count)
+
+            self.redraw = False
+            p5.renderer.reset()
+
+        self.clean_up()
+
     def resize(self):
+        if self.headless:
+            # A raster surface is resized right away
+            self.create_surface()
+            return
+
         # when glfw changes the framebuffer size, we will be resized completely
         # until then hold the rendering calls
         self.resized = False
@@ -240,6 +330,21 @@ class SkiaSketch:
     def _enqueue_event(self, handler_name, event):
         self.handler_queue.append((self.handlers[handler_name], event))
 
+    def _next_frame(self):
+        builtins.frame_count += 1
+        if self.batch:
+            advance_clock(self.frame_rate)
+
+    def _read_surface(self):
+        """Read the RGBA pixels of the surface, whatever its color type."""
+        return self.surface.makeImageSnapshot().toarray(
+            colorType=skia.kRGBA_8888_ColorType, alphaType=skia.kUnpremul_AlphaType
+        )
+
     def exit(self):
+        if self.headless:
+            # Let start_headless() return to the caller
+            self.main_loop_state = False
+            return
         self.clean_up()
         exit()
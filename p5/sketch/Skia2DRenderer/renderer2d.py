@@ -11,6 +11,8 @@ from p5.pmath.utils import *
 
 from .image import SkiaPImage
 from .graphics import create_graphics_helper, SkiaGraphics
+from ..capture import capture_queue
+from ..Vispy2DRenderer.bulk import fan_indices, rect_polygons, vertex_colors
 
 
 @dataclass
@@ -63,6 +65,19 @@ class Style2D:
             self.stroke_join = skia.Paint.kBevel_Join
 
 
+def _skia_points(xy):
+    """The rows of an (N, 2) or (N, 3) array of coordinates, as a list
+    of skia.Point. z coordinates are ignored."""
+    return list(map(skia.Point, xy[:, 0].tolist(), xy[:, 1].tolist()))
+
+
+def _skia_colors(colors):
+    """An (N, 4) array of normalized colors, as a list of skia colors
+    (0xAARRGGBB integers)"""
+    r, g, b, a = np.rint(np.clip(colors, 0, 1) * 255).astype(np.uint32).T
+    return ((a << 24) | (r << 16) | (g << 8) | b).tolist()
+
+
 class SkiaRenderer:
     def __init__(self):
         self.canvas = None
@@ -528,6 +543,211 @@ class SkiaRenderer:
 
         self.render()
 
+    def _bulk_fill_paint(self):
+        """A copy of the paint set up to fill with the current style"""
+        paint = skia.Paint(self.paint)
+        paint.setStyle(skia.Paint.kFill_Style)
+        paint.setColor(skia.Color4f(*self.style.fill_color))
+        return paint
+
+    def _bulk_stroke_paint(self):
+        """A copy of the paint set up to stroke with the current style"""
+        paint = skia.Paint(self.paint)
+        paint.setStyle(skia.Paint.kStroke_Style)
+        paint.setStrokeCap(self.style.stroke_cap)
+        paint.setStrokeJoin(self.style.stroke_join)
+        paint.setStrokeWidth(self.style.stroke_weight)
+        paint.setColor(skia.Color4f(*self.style.stroke_color))
+        return paint
+
+    def _fill_bulk_polygons(self, polygons, colors):
+        """Fill convex polygons with one draw call, as a mesh of
+        triangles. Like the triangles of the mesh, the polygons are not
+        antialiased.
+
+        :param polygons: (N, K, 3) array of the K corners of every
+            polygon. The z coordinates are ignored.
+        :type polygons: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors replacing the
+            fill color of every polygon, or None
+        :type colors: np.ndarray | None
+        """
+        n_polygons, n_corners = polygons.shape[:2]
+        if n_polygons == 0:
+            return
+
+        idx = fan_indices(n_polygons, n_corners)
+        if colors is None:
+            fills = [skia.Color4f(*self.style.fill_color).toColor()] * len(idx)
+        else:
+            fills = _skia_colors(vertex_colors(colors, 3 * (n_corners - 2)))
+        vertices = skia.Vertices.MakeCopy(
+            skia.Vertices.kTriangles_VertexMode,
+            _skia_points(polygons.reshape(-1, 3)[idx]),
+            colors=fills,
+        )
+
+        # The colors of the vertices replace the color of the paint,
+        # but its alpha would still apply
+        paint = self._bulk_fill_paint()
+        paint.setColor(skia.ColorWHITE)
+        self.canvas.drawVertices(vertices, paint)
+
+    def _draw_bulk_points(self, mode, points, colors):
+        """Draw points or line segments with the stroke of the style.
+
+        Items of the same color are drawn with one draw call, in the
+        order their colors first appear.
+
+        :param mode: skia.Canvas.kPoints_PointMode or
+            skia.Canvas.kLines_PointMode
+        :type mode: skia.Canvas.PointMode
+
+        :param points: (N * K, 3) array of the K points of every item
+        :type points: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors replacing the
+            stroke color of every item, or None
+        :type colors: np.ndarray | None
+        """
+        paint = self._bulk_stroke_paint()
+        if colors is None:
+            if self.style.stroke_enabled:
+                self.canvas.drawPoints(mode, _skia_points(points), paint)
+            return
+
+        _, first, inverse = np.unique(
+            colors, axis=0, return_index=True, return_inverse=True
+        )
+        # Number the colors in the order they first appear
+        rank = np.empty(len(first), dtype=np.intp)
+        rank[np.argsort(first)] = np.arange(len(first))
+        groups = rank[inverse.ravel()]
+
+        items = points.reshape(len(colors), -1, 3)
+        per_item = items.shape[1]
+        order = np.argsort(groups, kind="stable")
+        grouped = _skia_points(items[order].reshape(-1, 3))
+
+        start = 0
+        counts = np.bincount(groups)
+        for color, count in zip(colors[np.sort(first)].tolist(), counts):
+            paint.setColor(skia.Color4f(*color))
+            end = start + count * per_item
+            self.canvas.drawPoints(mode, grouped[start:end], paint)
+            start = end
+
+    def points(self, vertices, colors=None):
+        """Draw points with the stroke color, weight and cap.
+
+        :param vertices: (N, 3) array of the points. The z coordinates
+            are ignored.
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            stroke color of every point
+        :type colors: np.ndarray | None
+        """
+        self._draw_bulk_points(skia.Canvas.kPoints_PointMode, vertices, colors)
+
+    def lines(self, vertices, colors=None):
+        """Draw line segments with the stroke of the style.
+
+        :param vertices: (N, 2, 3) array of the end points of the lines.
+            The z coordinates are ignored.
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            stroke color of every line
+        :type colors: np.ndarray | None
+        """
+        self._draw_bulk_points(
+            skia.Canvas.kLines_PointMode, vertices.reshape(-1, 3), colors
+        )
+
+    def rects(self, xywh, colors=None):
+        """Draw rectangles with the fill and stroke of the style.
+
+        All the rectangles are filled, and then all their outlines are
+        stroked.
+
+        :param xywh: (N, 4) array of the top-left corner, width and
+            height of the rectangles
+        :type xywh: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every rectangle
+        :type colors: np.ndarray | None
+        """
+        if colors is not None or self.style.fill_enabled:
+            self._fill_bulk_polygons(rect_polygons(xywh), colors)
+
+        if self.style.stroke_enabled:
+            outlines = skia.Path()
+            for x, y, w, h in xywh.tolist():
+                outlines.addRect(x, y, x + w, y + h)
+            self.canvas.drawPath(outlines, self._bulk_stroke_paint())
+
+    def circles(self, xyr, colors=None):
+        """Draw circles with the fill and stroke of the style.
+
+        All the circles are filled, and then all their outlines are
+        stroked. Unlike rectangles and triangles, the circles are
+        filled one by one: skia-python only takes the vertices of a
+        mesh as a list of points, and converting the corners of
+        polygons close enough to circles takes longer than drawing
+        the circles.
+
+        :param xyr: (N, 3) array of the center and radius of the circles
+        :type xyr: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every circle
+        :type colors: np.ndarray | None
+        """
+        if colors is not None or self.style.fill_enabled:
+            paint = self._bulk_fill_paint()
+            if colors is None:
+                for x, y, r in xyr.tolist():
+                    self.canvas.drawCircle(x, y, r, paint)
+            else:
+                for (x, y, r), color in zip(xyr.tolist(), _skia_colors(colors)):
+                    paint.setColor(color)
+                    self.canvas.drawCircle(x, y, r, paint)
+
+        if self.style.stroke_enabled:
+            outlines = skia.Path()
+            for x, y, r in xyr.tolist():
+                outlines.addCircle(x, y, r)
+            self.canvas.drawPath(outlines, self._bulk_stroke_paint())
+
+    def triangles(self, vertices, colors=None):
+        """Draw triangles with the fill and stroke of the style.
+
+        All the triangles are filled, and then all their outlines are
+        stroked.
+
+        :param vertices: (N, 3, 3) array of the corners of the
+            triangles. The z coordinates are ignored.
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every triangle
+        :type colors: np.ndarray | None
+        """
+        if colors is not None or self.style.fill_enabled:
+            self._fill_bulk_polygons(vertices, colors)
+
+        if self.style.stroke_enabled:
+            outlines = skia.Path()
+            for x1, y1, x2, y2, x3, y3 in vertices[:, :, :2].reshape(-1, 6).tolist():
+                outlines.moveTo(x1, y1)
+                outlines.lineTo(x2, y2)
+                outlines.lineTo(x3, y3)
+                outlines.close()
+            self.canvas.drawPath(outlines, self._bulk_stroke_paint())
+
     def _do_fill_stroke_close(self, close_shape):
         if close_shape:
             self.path.close()
@@ -755,7 +975,14 @@ class SkiaRenderer:
         if canvas:
             canvas = canvas.canvas
         image = canvas.getSurface().makeImageSnapshot()
-        image.save(filename)
+        # Only read the pixels here, they are encoded in the background
+        capture_queue.save(
+            image.toarray(
+                colorType=skia.kRGBA_8888_ColorType,
+                alphaType=skia.kUnpremul_AlphaType,
+            ),
+            filename,
+        )
 
     def create_graphics(self, width, height, renderer):
         if renderer != constants.P2D:
@@ -2,6 +2,8 @@
 This file hold utilities function for skia renderer
 """
 
+import skia
+
 from ...core import p5
 
 
@@ -21,3 +23,17 @@ def mode_adjust(a, b, c, d, mode):
 
 def should_draw():
     return p5.renderer.style.stroke_enabled or p5.renderer.style.fill_enabled
+
+
+def make_raster_surface(width, height):
+    """A CPU surface with the same pixel format as the window surface"""
+    info = skia.ImageInfo.Make(
+        width,
+        height,
+        skia.kRGBA_8888_ColorType,
+        skia.kPremul_AlphaType,
+        skia.ColorSpace.MakeSRGB(),
+    )
+    surface = skia.Surface.MakeRaster(info)
+    assert surface is not None
+    return surface
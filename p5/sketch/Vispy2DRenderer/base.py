@@ -20,11 +20,13 @@
 
 import builtins
 
-from PIL import Image
 from vispy import app
 
 from p5.core import p5
 
+from ..capture import capture_queue
+from ..userspace import stop_recording
+from ..util import advance_clock
 from ..events import KeyEvent
 from ..events import MouseEvent
 from ..events import handler_names
@@ -54,9 +56,25 @@ class VispySketch(app.Canvas):
     :param frame_rate:
     :type frame_rate: int
 
+    :param frames: number of frames to draw before closing the
+        sketch, or None to keep drawing until it is closed.
+    :type frames: int | None
+
+    :param batch: draw the frames as fast as possible, on a virtual
+        clock running at `frame_rate`.
+    :type batch: bool
+
     """
 
-    def __init__(self, setup_method, draw_method, handlers=dict(), frame_rate=60):
+    def __init__(
+        self,
+        setup_method,
+        draw_method,
+        handlers=dict(),
+        frame_rate=60,
+        frames=None,
+        batch=False,
+    ):
         app.Canvas.__init__(
             self,
             title=builtins.title,
@@ -73,7 +91,11 @@ class VispySketch(app.Canvas):
         self.looping = None
         self.redraw = None
         self.setup_done = False
-        self.timer = app.Timer(1.0 / frame_rate, connect=self.on_timer)
+        self.frame_rate = frame_rate
+        self.frames = frames
+        self.batch = batch
+        interval = 0 if batch else 1.0 / frame_rate
+        self.timer = app.Timer(interval, connect=self.on_timer)
         self.timer.events.ignore_callback_errors = False
 
         self.handlers = dict()
@@ -91,12 +113,13 @@ class VispySketch(app.Canvas):
         p5.renderer.clear()
 
     def on_timer(self, event):
-        self.measure_fps(callback=lambda _: None)
-        builtins.frame_rate = round(self.fps, 2)
+        if not self.batch:
+            self.measure_fps(callback=lambda _: None)
+            builtins.frame_rate = round(self.fps, 2)
 
         with p5.renderer.draw_loop():
             if not self.setup_done:
-                builtins.frame_count += 1
+                self._next_frame()
                 self.setup_method()
                 self.setup_done = True
                 self.show(visible=True)
@@ -106,11 +129,11 @@ class VispySketch(app.Canvas):
                     self.looping = True
 
             elif self.redraw:
-                builtins.frame_count += 1
+                self._next_frame()
                 self.draw_method()
                 self.redraw = False
             elif self.looping:
-                builtins.frame_count += 1
+                self._next_frame()
                 self.draw_method()
                 self.redraw = False
             elif not self.looping:
@@ -121,21 +144,36 @@ class VispySketch(app.Canvas):
                 event._update_builtins()
                 function(event)
 
+        if p5.recorder is not None:
+            p5.recorder.capture(self._read_buffer, builtins.frame_count)
         if self._save_flag:
             self._save_buffer()
         self.update()
 
+        if self.frames is not None and builtins.frame_count >= self.frames:
+            self.exiting = True
         if self.exiting:
             self.close()
             return
 
+    def _next_frame(self):
+        builtins.frame_count += 1
+        if self.batch:
+            advance_clock(self.frame_rate)
+
     def _save_buffer(self):
-        """Save the renderer buffer to the given file."""
-        img_data = p5.renderer.fbuffer.read(mode="color", alpha=False)
-        img = Image.fromarray(img_data)
-        img.save(self._save_fname)
+        """Save the renderer buffer to the given file.
+
+        The pixels are read right away, the file is written in the
+        background.
+        """
+        capture_queue.save(self._read_buffer(), self._save_fname)
         self._save_flag = False
 
+    def _read_buffer(self):
+        """Read the pixels of the renderer buffer."""
+        return p5.renderer.fbuffer.read(mode="color", alpha=False)
+
     def screenshot(self, filename):
         self.queue_screenshot(filename)
         p5.renderer.flush_geometry()
@@ -148,6 +186,8 @@ class VispySketch(app.Canvas):
 
     def on_close(self, event):
         self.timer.stop()
+        stop_recording()
+        capture_queue.flush()
         app.quit()
 
     def on_draw(self, event):
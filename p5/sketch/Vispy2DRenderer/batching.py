@@ -0,0 +1,218 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Group the entries of a draw queue into as few draw calls as possible.
+
+Entries are merged when they use the same primitive type and program.
+An entry may also be moved back to join an earlier batch with the same
+key, but only if it does not overlap anything drawn in between, so the
+result looks exactly as if the queue had been drawn in order.
+"""
+
+import math
+
+import numpy as np
+
+# Primitive types that are drawn as indexed triangles by the default
+# program, and hence can share a batch.
+FILL_TYPES = ("triangles", "triangle_strip", "triangle_fan")
+
+# Side length of the cells used to look up overlapping entries
+CELL_SIZE = 32
+# Entries covering more cells than this are tested one by one
+MAX_CELLS = 64
+# How many batches an entry may be moved back over
+MAX_LOOKBACK = 8
+
+
+def to_triangles(stype, idx):
+    """Convert the indices of a triangle strip or fan to plain triangles.
+
+    :param stype: primitive type of the indices
+    :type stype: str
+
+    :param idx: vertex indices of the primitive
+    :type idx: np.ndarray
+
+    :returns: indices for the "triangles" primitive type
+    :rtype: np.ndarray
+    """
+    idx = np.asarray(idx, dtype=np.uint32).ravel()
+    if stype == "triangles":
+        return idx
+
+    n_triangles = max(len(idx) - 2, 0)
+    k = np.arange(n_triangles)
+    if stype == "triangle_strip":
+        corners = np.column_stack((k, k + 1, k + 2))
+    elif stype == "triangle_fan":
+        corners = np.column_stack((np.zeros_like(k), k + 1, k + 2))
+    else:
+        raise ValueError("Can not convert {} to triangles".format(stype))
+    return idx[corners.ravel()]
+
+
+def is_planar_transform(m):
+    """Whether the transform `m` maps the z = 0 plane onto itself
+    with an affine transform"""
+    return not (m[2, 0] or m[2, 1] or m[2, 3] or m[3, 0] or m[3, 1] or m[3, 2]) and (
+        m[3, 3] == 1
+    )
+
+
+def _bounds(vertices, margin, transform=None):
+    """Screen space bounding box of a draw queue entry.
+
+    Returns None when the bounds are unknown (vertices out of the z = 0
+    plane end up somewhere else after the perspective projection), in
+    which case the entry is assumed to overlap everything.
+    """
+    vertices = np.asarray(vertices)
+    if len(vertices) == 0:
+        return None
+    if vertices.shape[1] > 2 and vertices[:, 2].any():
+        return None
+    x0, y0 = vertices[:, :2].min(axis=0).tolist()
+    x1, y1 = vertices[:, :2].max(axis=0).tolist()
+    if transform is not None:
+        if not is_planar_transform(transform):
+            return None
+        corners = np.array([[x0, x1, x0, x1], [y0, y0, y1, y1]])
+        corners = transform[:2, :2].dot(corners) + transform[:2, 3:]
+        x0, y0 = corners.min(axis=1).tolist()
+        x1, y1 = corners.max(axis=1).tolist()
+    bounds = (x0 - margin, y0 - margin, x1 + margin, y1 + margin)
+    if not all(map(math.isfinite, bounds)):
+        return None
+    return bounds
+
+
+def _line_bounds(vertices, idx, stroke, stroke_weight, transform=None):
+    """Bounding box of the stroke drawn by the line shader.
+
+    When every polyline is a single segment, both ends are capped and
+    the stroke stays within half the line width (along each axis) of
+    its end points. Joins between longer polylines can reach
+    arbitrarily far at sharp miters, so those are left unbounded.
+    """
+    idx = np.asarray(idx)
+    if idx.ndim != 2 or idx.shape[1] != 2:
+        return None
+    width = max(stroke_weight, 1)
+    return _bounds(vertices, width * np.sqrt(0.5) + 0.01, transform)
+
+
+def _overlap(a, b):
+    # Primitives that only touch do not share any pixel
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _cells(bounds):
+    x0, y0, x1, y1 = (math.floor(c / CELL_SIZE) for c in bounds)
+    return [(i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1)]
+
+
+class Batch:
+    """Draw queue entries that are drawn together with one draw call."""
+
+    def __init__(self, key, transform=None):
+        self.key = key
+        self.transform = transform
+        self._transform_key = None if transform is None else transform.tobytes()
+        self.entries = []
+        self.unbounded = False
+        self._grid = {}
+        self._large = []
+
+    def has_transform(self, transform):
+        """Whether the entries of the batch use the model transform `transform`"""
+        if transform is None:
+            return self._transform_key is None
+        return self._transform_key == transform.tobytes()
+
+    def add(self, entry, bounds):
+        self.entries.append(entry)
+        if bounds is None:
+            self.unbounded = True
+            return
+
+        cells = _cells(bounds)
+        if len(cells) > MAX_CELLS:
+            self._large.append(bounds)
+            return
+        for cell in cells:
+            self._grid.setdefault(cell, []).append(bounds)
+
+    def overlaps(self, bounds):
+        """Whether any entry of the batch overlaps `bounds`"""
+        if self.unbounded or bounds is None:
+            return True
+        if any(_overlap(bounds, other) for other in self._large):
+            return True
+
+        cells = _cells(bounds)
+        if len(cells) > MAX_CELLS:
+            cells = [cell for cell in cells if cell in self._grid]
+        for cell in cells:
+            if any(_overlap(bounds, other) for other in self._grid.get(cell, ())):
+                return True
+        return False
+
+
+def batch_draw_queue(draw_queue):
+    """Group a draw queue into batches that keep the painter's order.
+
+    :param draw_queue: list of ``(stype, entry, transform)`` tuples.
+        Entries of "lines" are ``(vertices, idx, stroke, stroke_weight,
+        stroke_cap, stroke_join)``, fill entries ``(vertices, idx,
+        fill)``. All other entries start with the vertices that bound
+        them, and `stype` is the key of their batch. `transform` is the
+        model transform the shaders apply to the vertices, or None.
+        Only entries with equal transforms share a batch.
+    :type draw_queue: list
+
+    :returns: list of batches. Fill entries are converted to the
+        "triangles" primitive type.
+    :rtype: list[Batch]
+    """
+    batches = []
+    for stype, entry, transform in draw_queue:
+        if stype == "lines":
+            key = "lines"
+            bounds = _line_bounds(*entry[:4], transform)
+        elif stype in FILL_TYPES:
+            key = "triangles"
+            vertices, idx, fill = entry
+            entry = (vertices, to_triangles(stype, idx), fill)
+            bounds = _bounds(vertices, 0, transform)
+        else:
+            key = stype
+            bounds = _bounds(entry[0], 0, transform)
+
+        target = None
+        for batch in reversed(batches[-MAX_LOOKBACK:]):
+            if batch.key == key and batch.has_transform(transform):
+                target = batch
+                break
+            if batch.overlaps(bounds):
+                break
+
+        if target is None:
+            target = Batch(key, transform)
+            batches.append(target)
+        target.add(entry, bounds)
+    return batches
@@ -0,0 +1,104 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Geometry of the shapes drawn by the bulk drawing functions.
+
+The bulk functions (:func:`p5.points`, :func:`p5.rects`, ...) draw
+many shapes of the same kind at once. The helpers here build the
+vertices and indices of all those shapes with a few array operations,
+so that they can be added to the draw queue as a single entry.
+"""
+
+import numpy as np
+
+# Number of corners of the polygons approximating circles, when they
+# can not be drawn as instances.
+CIRCLE_SEGMENTS = 36
+
+_CIRCLE_ANGLES = np.linspace(0, 2 * np.pi, CIRCLE_SEGMENTS, endpoint=False)
+_UNIT_CIRCLE = np.column_stack((np.cos(_CIRCLE_ANGLES), np.sin(_CIRCLE_ANGLES)))
+
+
+def rect_polygons(xywh):
+    """The corners of rectangles.
+
+    :param xywh: (N, 4) array of the corner, width and height of the
+        rectangles
+    :type xywh: np.ndarray
+
+    :returns: (N, 4, 3) array of the corners, in the z = 0 plane
+    :rtype: np.ndarray
+    """
+    x, y, w, h = np.asarray(xywh, dtype=np.float64).T
+    polygons = np.zeros((len(x), 4, 3))
+    polygons[:, :, 0] = np.column_stack((x, x + w, x + w, x))
+    polygons[:, :, 1] = np.column_stack((y, y, y + h, y + h))
+    return polygons
+
+
+def circle_polygons(xyr):
+    """Regular polygons approximating circles.
+
+    :param xyr: (N, 3) array of the center and radius of the circles
+    :type xyr: np.ndarray
+
+    :returns: (N, CIRCLE_SEGMENTS, 3) array of the corners, in the
+        z = 0 plane
+    :rtype: np.ndarray
+    """
+    xyr = np.asarray(xyr, dtype=np.float64)
+    polygons = np.zeros((len(xyr), CIRCLE_SEGMENTS, 3))
+    polygons[:, :, :2] = xyr[:, np.newaxis, :2] + xyr[:, np.newaxis, 2:] * _UNIT_CIRCLE
+    return polygons
+
+
+def fan_indices(n_polygons, n_corners):
+    """Triangle indices filling convex polygons stored one after the
+    other, with `n_corners` vertices each.
+
+    :rtype: np.ndarray
+    """
+    k = np.arange(1, n_corners - 1)
+    fan = np.column_stack((np.zeros_like(k), k, k + 1)).ravel()
+    offsets = np.arange(n_polygons) * n_corners
+    return (offsets[:, np.newaxis] + fan).ravel().astype(np.uint32)
+
+
+def outline_indices(n_polygons, n_corners):
+    """The edges of closed polygons stored one after the other, with
+    `n_corners` vertices each, as an (N * n_corners, 2) array.
+
+    :rtype: np.ndarray
+    """
+    k = np.arange(n_corners)
+    edges = np.column_stack((k, (k + 1) % n_corners))
+    offsets = np.arange(n_polygons) * n_corners
+    return (offsets[:, np.newaxis, np.newaxis] + edges).reshape(-1, 2).astype(np.uint32)
+
+
+def vertex_colors(colors, n_vertices):
+    """Repeat the color of every shape for its `n_vertices` vertices.
+
+    :param colors: (N, 4) array of colors, or a single color
+    :type colors: np.ndarray | tuple
+
+    :returns: (N * n_vertices, 4) array, or the single color unchanged
+    """
+    colors = np.asarray(colors)
+    if colors.ndim == 1:
+        return colors
+    return np.repeat(colors, n_vertices, axis=0)
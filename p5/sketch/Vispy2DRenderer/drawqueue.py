@@ -0,0 +1,135 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""The queue of the shapes drawn in the current frame.
+
+The vertices of the meshes drawn by the default program are written to
+arenas when the shapes are queued: arrays that are allocated once,
+grow geometrically and are reused every frame. Flushing the queue
+uploads the used part of the vertex arena at once, instead of copying
+the vertices and expanding the colors of every shape again.
+"""
+
+import numpy as np
+
+from .batching import to_triangles
+
+# Interleaved vertex layout of the default program
+MESH_VERTEX_DTYPE = np.dtype([("position", np.float32, 3), ("color", np.float32, 4)])
+
+
+class Arena:
+    """An array that rows are appended to.
+
+    :param dtype: type of the rows
+    :type dtype: np.dtype
+
+    :param capacity: initial number of rows
+    :type capacity: int
+    """
+
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    @property
+    def capacity(self):
+        return len(self.data)
+
+    @property
+    def view(self):
+        """The rows appended so far"""
+        return self.data[: self.size]
+
+    def extend(self, n):
+        """Append `n` rows, doubling the storage when it is full.
+
+        :returns: the new rows, to be filled by the caller
+        :rtype: np.ndarray
+        """
+        start, self.size = self.size, self.size + n
+        if self.size > self.capacity:
+            capacity = self.capacity
+            while capacity < self.size:
+                capacity *= 2
+            data = np.empty(capacity, dtype=self.data.dtype)
+            data[:start] = self.data[:start]
+            self.data = data
+        return self.data[start : self.size]
+
+    def clear(self):
+        self.size = 0
+
+
+class DrawQueue(list):
+    """List of the shapes to be drawn, with arenas for their meshes.
+
+    Entries are appended like to any list. Meshes of the default
+    program are added with :meth:`add_mesh` instead, which writes their
+    vertices, colors and indices to the arenas and returns the entry to
+    be queued.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.vertices = Arena(MESH_VERTEX_DTYPE)
+        self.indices = Arena(np.uint32)
+        # Whether the vertex arena changed since it was last uploaded
+        self.modified = False
+
+    def add_mesh(self, stype, vertices, idx, color):
+        """Write a mesh to the arenas.
+
+        :param stype: primitive type of the mesh, one of "triangles",
+            "triangle_strip", "triangle_fan", "lines" or "points"
+        :type stype: str
+
+        :param vertices: (N, 3) array of the vertices
+        :type vertices: np.ndarray
+
+        :param idx: indices into `vertices`
+        :type idx: np.ndarray
+
+        :param color: one color for the whole mesh, or an (N, 4) array
+            with one color per vertex
+        :type color: tuple | np.ndarray
+
+        :returns: ``(stype, (positions, indices, color))`` where strips
+            and fans are converted to "triangles", `positions` is the
+            part of the vertex arena holding the vertices and `indices`
+            the part of the index arena holding the indices, which
+            point into the whole vertex arena.
+        :rtype: tuple
+        """
+        if stype in ("triangle_strip", "triangle_fan"):
+            idx = to_triangles(stype, idx)
+            stype = "triangles"
+        idx = np.asarray(idx).ravel()
+        first = self.vertices.size
+        block = self.vertices.extend(len(vertices))
+        block["position"] = vertices
+        block["color"] = color
+        indices = self.indices.extend(len(idx))
+        np.add(idx, first, out=indices, casting="unsafe")
+        self.modified = True
+        return stype, (block["position"], indices, color)
+
+    def clear(self):
+        super().clear()
+        self.vertices.clear()
+        self.indices.clear()
+        self.modified = True
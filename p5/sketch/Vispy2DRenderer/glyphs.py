@@ -0,0 +1,231 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Glyph atlases used to draw text with the Vispy 2D renderer.
+
+Each glyph of a font is rasterized once by PIL into a shared texture.
+A string is then drawn as one textured quad per glyph, placed exactly
+where PIL would have drawn it.
+"""
+
+import math
+
+import numpy as np
+from PIL import ImageFont
+from vispy.gloo import Texture2D
+
+# Width of a new atlas and the height it starts with
+ATLAS_WIDTH = 512
+ATLAS_HEIGHT = 128
+# The atlas is not grown beyond this height
+MAX_ATLAS_HEIGHT = 4096
+# Empty pixels around every glyph. Glyphs are drawn with this margin,
+# so that the edges of the glyphs are interpolated with transparent
+# pixels when the text is scaled or rotated, and not with their
+# neighbours in the atlas.
+GLYPH_PADDING = 1
+
+# Value of ImageFont.LAYOUT_BASIC (ImageFont.Layout.BASIC in newer
+# versions of PIL). The text layout engine that supports complex
+# scripts can merge or reorder glyphs, so it can not be drawn glyph by
+# glyph.
+LAYOUT_BASIC = 0
+
+
+def atlas_key(font):
+    """The key of the atlas for `font`, or None if its glyphs can not
+    be drawn from an atlas.
+
+    Truetype fonts loaded from the same file at the same size share
+    an atlas. Bitmap fonts are not supported.
+
+    :param font: font to draw text with
+    :type font: PIL.ImageFont.ImageFont | PIL.ImageFont.FreeTypeFont
+
+    :rtype: tuple | PIL.ImageFont.FreeTypeFont | None
+    """
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        return None
+    if font.layout_engine != LAYOUT_BASIC:
+        return None
+    if isinstance(font.path, str):
+        return (font.path, font.size, font.index)
+    # Fonts loaded from file objects can only be told apart by identity
+    return font
+
+
+class Glyph:
+    """Position of a rasterized glyph.
+
+    :param offset: offset of the top left corner of the glyph bitmap
+        from the pen position
+    :type offset: tuple
+
+    :param size: width and height of the bitmap
+    :type size: tuple
+
+    :param position: top left corner of the bitmap in the atlas. The
+        bitmap is surrounded by GLYPH_PADDING empty pixels.
+    :type position: tuple
+    """
+
+    __slots__ = ("offset", "size", "position")
+
+    def __init__(self, offset, size, position):
+        self.offset = offset
+        self.size = size
+        self.position = position
+
+
+class GlyphAtlas:
+    """Glyphs of one font, packed into a single channel texture.
+
+    Glyphs are rasterized the first time they are drawn and packed in
+    rows ("shelves") from the top of the atlas. Only new glyphs are
+    uploaded to the texture; when the atlas is full its height is
+    doubled.
+
+    :param font: font of the glyphs
+    :type font: PIL.ImageFont.FreeTypeFont
+    """
+
+    def __init__(self, font, width=ATLAS_WIDTH, height=ATLAS_HEIGHT):
+        self.font = font
+        self.data = np.zeros((height, width), dtype=np.uint8)
+        self.texture = Texture2D(self.data, interpolation="linear")
+        self.glyphs = {}
+
+        self._advances = {}
+        self._pair_advances = {}
+
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+
+    @property
+    def size(self):
+        """Width and height of the atlas in pixels"""
+        height, width = self.data.shape
+        return width, height
+
+    def glyph(self, char):
+        """The glyph of `char`, rasterizing it if needed.
+
+        :returns: the glyph or None when the atlas is full.
+        :rtype: Glyph | None
+        """
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self._add(char)
+        return glyph
+
+    def _add(self, char):
+        mask, offset = self.font.getmask2(char, mode="L")
+        width, height = mask.size
+        if width == 0 or height == 0:
+            glyph = Glyph(offset, (0, 0), (0, 0))
+            self.glyphs[char] = glyph
+            return glyph
+
+        area = self._allocate(width + 2 * GLYPH_PADDING, height + 2 * GLYPH_PADDING)
+        if area is None:
+            return None
+
+        bitmap = np.frombuffer(bytes(mask), dtype=np.uint8).reshape(height, width)
+        x, y = area[0] + GLYPH_PADDING, area[1] + GLYPH_PADDING
+        position = (x, y)
+        self.data[y : y + height, x : x + width] = bitmap
+        self.texture.set_data(bitmap, offset=(y, x))
+
+        glyph = Glyph(offset, (width, height), position)
+        self.glyphs[char] = glyph
+        return glyph
+
+    def _allocate(self, width, height):
+        """Find a free (width, height) area, growing the atlas if needed"""
+        atlas_width, atlas_height = self.size
+        if width > atlas_width:
+            return None
+        if self._shelf_x + width > atlas_width:
+            self._shelf_y += self._shelf_height
+            self._shelf_x = 0
+            self._shelf_height = 0
+
+        while self._shelf_y + height > atlas_height:
+            if atlas_height * 2 > MAX_ATLAS_HEIGHT:
+                return None
+            atlas_height *= 2
+        if atlas_height != self.size[1]:
+            self._resize(atlas_height)
+
+        position = (self._shelf_x, self._shelf_y)
+        self._shelf_x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return position
+
+    def _resize(self, height):
+        data = np.zeros((height, self.size[0]), dtype=np.uint8)
+        data[: len(self.data)] = self.data
+        self.data = data
+        self.texture.resize(data.shape)
+        self.texture.set_data(data)
+
+    def _advance(self, char):
+        advance = self._advances.get(char)
+        if advance is None:
+            advance = self.font.getlength(char)
+            self._advances[char] = advance
+        return advance
+
+    def _pair_advance(self, first, second):
+        """Distance between the pen positions of two consecutive
+        characters, including the kerning between them"""
+        pair = first + second
+        advance = self._pair_advances.get(pair)
+        if advance is None:
+            advance = self.font.getlength(pair) - self._advance(second)
+            self._pair_advances[pair] = advance
+        return advance
+
+    def layout(self, text):
+        """Place the glyphs of a line of text drawn with its origin at (0, 0).
+
+        The pen advances by the (kerned) advance widths of the
+        characters and every glyph is drawn at the pixel nearest to the
+        pen position, like PIL does.
+
+        :param text: a single line of text
+        :type text: str
+
+        :returns: list of (glyph, x, y) tuples, where (x, y) is the top
+            left corner of the glyph bitmap, or None when the glyphs do
+            not fit in the atlas.
+        :rtype: list | None
+        """
+        placed = []
+        pen = 0.0
+        for i, char in enumerate(text):
+            if i > 0:
+                pen += self._pair_advance(text[i - 1], char)
+            glyph = self.glyph(char)
+            if glyph is None:
+                return None
+            if glyph.size[0] == 0:
+                continue
+            x = math.floor(pen + 0.5) + glyph.offset[0]
+            placed.append((glyph, x, glyph.offset[1]))
+        return placed
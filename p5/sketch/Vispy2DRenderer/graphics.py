@@ -0,0 +1,185 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Offscreen graphics buffers of the vispy renderer.
+
+A graphics buffer has a renderer of its own, which draws into a
+texture through a frame buffer object instead of drawing into the
+frame of the sketch. Drawing the graphics buffer with ``image()`` then
+costs a single textured quad, whatever was drawn into it.
+"""
+
+import builtins
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import Image
+from vispy import gloo
+
+from p5.core.constants import RGB
+from p5.core.graphics import Graphics
+from ..graphics import (
+    bind,
+    methods,
+    setup_default_renderer_dec,
+    wrap_instance_helper,
+)
+from . import renderer2d
+from .image import VispyPImage
+
+import p5 as p5_lib
+
+
+class GraphicsRenderer(renderer2d.VispyRenderer2D):
+    """Renderer drawing into the texture of a graphics buffer.
+
+    The texture starts out transparent. Colors are blended into it with
+    their alpha premultiplied, which keeps the edges of translucent
+    shapes right when the texture is drawn onto the sketch.
+
+    :param width: width of the texture in pixels
+    :type width: int
+
+    :param height: height of the texture in pixels
+    :type height: int
+
+    :param parent: renderer of the sketch
+    :type parent: VispyRenderer2D
+    """
+
+    def __init__(self, width, height, parent):
+        super().__init__()
+        self.parent = parent
+        self.size = (width, height)
+        self.style.background_color = (0.0, 0.0, 0.0, 0.0)
+        self.texture = renderer2d.FrameBufferTexture(
+            np.zeros((height, width, 4), dtype=np.uint8), interpolation="linear"
+        )
+        self.fbuffer.color_buffer = self.texture
+        self.reset_view()
+
+    def reset_view(self):
+        self.viewport = (0, 0, *self.size)
+        self.texture_viewport = self.viewport
+        self._update_projection(*self.size)
+
+    @contextmanager
+    def _target(self):
+        """Draw into the texture, and back into the frame of the sketch
+        afterwards."""
+        # Sprites of the parent queued before have to show the current
+        # content of the texture.
+        if self.texture in self.parent.sprite_textures:
+            self.parent.flush_geometry()
+        with self.fbuffer:
+            gloo.set_viewport(*self.viewport)  # pylint: disable=no-member
+            self._comm_toggles()
+            gloo.set_state(  # pylint: disable=no-member
+                blend_func=(
+                    "src_alpha",
+                    "one_minus_src_alpha",
+                    "one",
+                    "one_minus_src_alpha",
+                )
+            )
+            yield
+        gloo.set_viewport(*self.parent.texture_viewport)  # pylint: disable=no-member
+        self.parent._comm_toggles()
+
+    def clear(self, color=True, depth=True):
+        if color:
+            # Nothing drawn before would be visible
+            self.draw_queue.clear()
+            self.sprite_textures.clear()
+        with self._target():
+            super().clear(color, depth)
+
+    def _clear_color(self):
+        # The texture holds premultiplied colors, like the shapes
+        # blended into it
+        r, g, b, a = self.style.background_color
+        return (r * a, g * a, b * a, a)
+
+    def flush_geometry(self):
+        if len(self.draw_queue) == 0:
+            return
+        with self._target():
+            super().flush_geometry()
+
+    def load_pixels(self):
+        self.flush_geometry()
+        width, height = self.size
+        pixels = VispyPImage(width, height, RGB)
+        with self._target():
+            pixel_data = self.fbuffer.read(mode="color", alpha=False)
+
+        pixels._img = Image.fromarray(pixel_data)
+        builtins.pixels = pixels
+
+        pixels._load()
+
+
+class VispyGraphics(Graphics):
+    def __init__(self, width, height, parent):
+        """
+        Creates a frame buffer based Graphics object
+
+        :param width: width in pixels
+        :type width: int
+
+        :param height: height in pixels
+        :type height: int
+
+        :param parent: renderer of the sketch
+        :type parent: VispyRenderer2D
+        """
+        self.width = width
+        self.height = height
+        self.renderer = GraphicsRenderer(width, height, parent)
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def _img_texture(self):
+        return self.renderer.texture
+
+    @property
+    def _texture(self):
+        self.renderer.flush_geometry()
+        return self.renderer.texture
+
+    @property
+    def _texture_outdated(self):
+        """Whether shapes still have to be drawn into the texture"""
+        return len(self.renderer.draw_queue) > 0
+
+
+def create_graphics_helper(width, height, parent):
+    graphics = VispyGraphics(width, height, parent)
+    for method in methods:
+        # The vispy renderer saves screenshots of the whole window
+        if method is p5_lib.save_canvas:
+            continue
+        bind(
+            graphics,
+            setup_default_renderer_dec(wrap_instance_helper(method)),
+            method.__name__,
+        )
+
+    return graphics
@@ -6,6 +6,7 @@ import builtins
 import io
 import re
 import urllib
+import weakref
 
 import numpy as np
 from PIL import Image
@@ -35,6 +36,18 @@ def _ensure_loaded(func):
     return rfunc
 
 
+# Images that own a texture, to report the GPU memory they use
+_textured_images = weakref.WeakSet()
+
+
+def texture_memory():
+    """Number of bytes of GPU memory used by the textures of all images.
+
+    :rtype: int
+    """
+    return sum(img._texture_nbytes for img in _textured_images)
+
+
 @contextlib.contextmanager
 def _restore_color_mode():
     old_mode = p5.renderer.style.color_parse_mode
@@ -82,6 +95,7 @@ class VispyPImage(PImage):
         self._img = None
         self._img_format = format_map[fmt.lower()]
         self._img_texture = None
+        self._texture_stale = False
         self._img_data = None
 
     @property
@@ -136,14 +150,36 @@ class VispyPImage(PImage):
     @property
     @_ensure_loaded
     def _texture(self):
-        if self._img_texture is None:
-            texdata = self._data.astype(np.float32) / 255.0
-            if builtins.current_renderer == "vispy":
-                from vispy.gloo import Texture2D
+        if builtins.current_renderer != "vispy":
+            return self._img_texture
 
-                self._img_texture = Texture2D(texdata, interpolation="linear")
+        if self._img_texture is None:
+            from vispy.gloo import Texture2D
+
+            # uint8 data is normalized to [0, 1] by OpenGL
+            self._img_texture = Texture2D(self._data, interpolation="linear")
+            _textured_images.add(self)
+        elif self._texture_stale:
+            # Updated in place by OpenGL when the size and the format
+            # of the texture do not change
+            self._img_texture.set_data(self._data)
+        self._texture_stale = False
         return self._img_texture
 
+    @property
+    def _texture_outdated(self):
+        """Whether the texture has to be updated before it is used"""
+        return self._img_texture is not None and (
+            self._reload or self._img_data is None or self._texture_stale
+        )
+
+    @property
+    def _texture_nbytes(self):
+        """GPU memory used by the texture of the image"""
+        if self._img_texture is None:
+            return 0
+        return int(np.prod(self._img_texture.shape))
+
     @property
     @_ensure_loaded
     def _data(self):
@@ -158,12 +194,14 @@ class VispyPImage(PImage):
         self._height = height
         self._size = (width, height)
 
-        data = np.array(self._img.getdata(), dtype=np.uint8)
+        data = np.array(self._img)
+        if data.dtype != np.uint8:
+            data = np.array(self._img.getdata(), dtype=np.uint8)
 
         self._channels = len(self._img.getbands())
 
         self._img_data = data.reshape((height, width, self._channels))
-        self._img_texture = None
+        self._texture_stale = True
         self._reload = False
 
     @_ensure_loaded
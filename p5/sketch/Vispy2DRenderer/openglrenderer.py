@@ -1,13 +1,21 @@
+import weakref
 from abc import ABC
+from collections import Counter
 import numpy as np
 
 from p5.core import p5
 from p5.core.constants import SType, ROUND, MITER, LEFT, TOP, CORNER, CENTER, RGB
+from p5.core.triangulate import is_convex, triangulate
 from p5.pmath import matrix
+from .bulk import fan_indices
+from .drawqueue import MESH_VERTEX_DTYPE, DrawQueue
 from .shape import Arc, PShape
 
 from dataclasses import dataclass
+from vispy import gloo
+from vispy.gloo.context import get_current_canvas
 from vispy.gloo import Program, VertexBuffer, FrameBuffer, IndexBuffer
+from vispy.gloo.util import check_enum
 from OpenGL.GLU import (
     gluTessBeginPolygon,
     gluTessBeginContour,
@@ -22,6 +30,21 @@ from PIL import ImageFont
 COLOR_WHITE = (1, 1, 1, 1)
 COLOR_BLACK = (0, 0, 0, 1)
 
+# Ways of carrying the previous frame over into the next one, see
+# OpenGLRenderer.frame_copy
+FRAME_COPY_MODES = ("auto", "always", "never")
+
+# Smallest number of vertices of a TESS shape triangulated with NumPy
+# instead of the GLU tessellator, which has less overhead per shape but
+# more per vertex.
+TRIANGULATE_MIN_VERTICES = 128
+
+# Number of TESS shapes filled as a triangle fan ("convex"), with NumPy
+# ("triangulate") and with the GLU tessellator ("glu"). Shapes are
+# counted when their render primitives are built, drawing a cached shape
+# again is not counted.
+tessellation_stats = Counter()
+
 
 def to_3x3(mat):
     """Returns the upper left 3x3 corner of an np.array"""
@@ -180,18 +203,62 @@ def _get_meshes(shape):
             ]
         )
     elif shape.shape_type == SType.TESS:
-        gluTessBeginPolygon(p5.tess.tess, None)
-        _tess_new_contour(shape.vertices)
-        if len(shape.contours) > 0:
-            for contour in shape.contours:
-                _tess_new_contour(contour)
-        gluTessEndPolygon(p5.tess.tess)
-        render_primitives += p5.tess.get_result()
+        # Convex outlines are filled with a fan and large simple polygons
+        # are triangulated with NumPy. GLU is faster for other small
+        # polygons and needed for self-intersecting ones.
+        convex = len(shape.contours) == 0 and is_convex(shape.vertices)
+        result = None
+        n_total = n_vert + sum(len(contour) for contour in shape.contours)
+        if not convex and n_total >= TRIANGULATE_MIN_VERTICES:
+            result = triangulate(shape.vertices, shape.contours)
+        if convex:
+            tessellation_stats["convex"] += 1
+            render_primitives.append(
+                ["triangles", np.asarray(shape.vertices), fan_indices(1, n_vert)]
+            )
+        elif result is not None:
+            tessellation_stats["triangulate"] += 1
+            vertices, triangles = result
+            render_primitives.append(["triangles", vertices, triangles.ravel()])
+        else:
+            tessellation_stats["glu"] += 1
+            gluTessBeginPolygon(p5.tess.tess, None)
+            _tess_new_contour(shape.vertices)
+            if len(shape.contours) > 0:
+                for contour in shape.contours:
+                    _tess_new_contour(contour)
+            gluTessEndPolygon(p5.tess.tess)
+            render_primitives += p5.tess.get_result()
     return render_primitives
 
 
+def _to_3d(vertices):
+    """Returns the vertices as an (n, 3) float array, adding z = 0 to 2D vertices"""
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if len(vertices) and vertices.shape[1] == 2:
+        vertices = np.hstack([vertices, np.zeros((len(vertices), 1))])
+    return vertices
+
+
 def get_render_primitives(shape):
-    """Given a shape, return a list of render primitives in the form of [type, vertices, indices]"""
+    """Given a shape, return a list of render primitives in the form of [type, vertices, indices]
+
+    The primitives are cached on the shape until it is edited, so
+    drawing an unchanged shape again skips the tessellation. The
+    returned arrays are shared between calls and must not be modified.
+    """
+    key = (p5.renderer.style.fill_enabled, p5.renderer.style.stroke_enabled)
+    render_primitives = shape._render_cache.get(key)
+    if render_primitives is None:
+        render_primitives = [
+            (stype, _to_3d(vertices), idx)
+            for stype, vertices, idx in _build_render_primitives(shape)
+        ]
+        shape._render_cache[key] = render_primitives
+    return render_primitives
+
+
+def _build_render_primitives(shape):
     _check_shape(shape)
     render_primitives = []
     if isinstance(shape, Arc):
@@ -210,7 +277,7 @@ def get_render_primitives(shape):
         # Render points
         if shape.shape_type == SType.POINTS:
             render_primitives.append(
-                _vertices_to_render_primitive(render_primitives, "points")
+                _vertices_to_render_primitive("points", shape.vertices)
             )
         # Render meshes
         if p5.renderer.style.fill_enabled:
@@ -221,6 +288,74 @@ def get_render_primitives(shape):
     return render_primitives
 
 
+def draw_range(program, mode, first, count):
+    """Draw `count` vertices of the buffers bound to `program`, starting at `first`.
+
+    `Program.draw` always draws every vertex of the bound attribute
+    buffers, which rules out reusing a buffer that is larger than the
+    current geometry. This issues the same GLIR command with an
+    explicit range instead.
+    """
+    canvas = get_current_canvas()
+    canvas.context.glir.associate(program.glir)
+    canvas.context.glir.command("DRAW", program.id, check_enum(mode), (first, count))
+    canvas.context.flush_commands()
+
+
+class PersistentVertexBuffer:
+    """A vertex buffer that is allocated once and reused every frame.
+
+    The storage grows geometrically when more vertices are needed and
+    is otherwise updated in place, so drawing similar amounts of
+    geometry each frame does not allocate GPU memory.
+
+    :param dtype: structured dtype of one vertex. The field names are
+        bound to the attributes of the same name.
+    :type dtype: np.dtype
+
+    :param capacity: initial number of vertices
+    :type capacity: int
+    """
+
+    def __init__(self, dtype, capacity=1024):
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.size = 0
+        self.buffer = VertexBuffer(np.zeros(capacity, dtype=self.dtype))
+        self._programs = weakref.WeakSet()
+
+    def bind(self, program):
+        """Bind the fields of the buffer to the attributes of `program`."""
+        program.bind(self.buffer)
+        self._programs.add(program)
+
+    def set_data(self, data):
+        """Upload `data` to the start of the buffer, growing it if needed."""
+        self.size = len(data)
+        if self.size <= self.capacity:
+            self.buffer.set_subdata(data)
+            return
+
+        while self.capacity < self.size:
+            self.capacity *= 2
+        storage = np.zeros(self.capacity, dtype=self.dtype)
+        storage[: self.size] = data
+        self.buffer.set_data(storage)
+
+        # Views on the buffer remember its old size, so rebind them
+        for program in self._programs:
+            program.bind(self.buffer)
+
+    def draw(self, program, mode):
+        """Draw the vertices uploaded by the last `set_data` with `program`."""
+        if self.size > 0:
+            draw_range(program, mode, 0, self.size)
+
+    def delete(self):
+        self.buffer.delete()
+        self._programs.clear()
+
+
 @dataclass
 class Style2D:
     background_color = (0.8, 0.8, 0.8, 1.0)
@@ -278,6 +413,9 @@ class OpenGLRenderer(ABC):
 
         self.vertex_buffer = VertexBuffer()
         self.index_buffer = IndexBuffer()
+        # Vertices of the meshes in the draw queue
+        self.mesh_buffer = PersistentVertexBuffer(MESH_VERTEX_DTYPE)
+        self.mesh_buffer.bind(self.default_prog)
 
         # Renderer Globals
         # VIEW MATRICES, ETC
@@ -288,7 +426,22 @@ class OpenGLRenderer(ABC):
         self.projection_matrix = np.identity(4)
 
         # Renderer Globals: RENDERING
-        self.draw_queue = []
+        self.draw_queue = DrawQueue()
+
+        # Number of draw calls issued for the geometry of the current
+        # frame so far, and for the whole of the last completed frame.
+        self.draw_calls = 0
+        self.frame_draw_calls = 0
+
+        # Sketches draw on top of the previous frame, which is copied
+        # into the frame buffer every frame. With "always" the copy is
+        # drawn when the frame starts. With "auto" it is drawn just
+        # before the first draw call of the frame, and skipped when
+        # the frame is cleared (by background()) before that. "never"
+        # skips the copy, which only works for sketches that clear
+        # every frame before drawing anything.
+        self.frame_copy = "auto"
+        self._frame_copy_pending = False
 
         self.style = Style2D()
         self.style_stack = []
@@ -296,51 +449,66 @@ class OpenGLRenderer(ABC):
 
         self.curve_tightness = 0
 
-    def render_default(self, draw_type, draw_queue):
-        # 1. Get the maximum number of vertices persent in the shapes
-        # in the draw queue.
-        #
-        if len(draw_queue) == 0:
+    def _start_frame_copy(self):
+        """Schedule the copy of the previous frame at the start of a frame."""
+        if self.frame_copy not in FRAME_COPY_MODES:
+            raise ValueError(
+                "Unknown frame copy mode {!r}, expected one of {}".format(
+                    self.frame_copy, FRAME_COPY_MODES
+                )
+            )
+        self._frame_copy_pending = self.frame_copy != "never"
+        if self.frame_copy == "always":
+            self._copy_previous_frame()
+
+    def _copy_previous_frame(self):
+        """Draw the previous frame into the frame buffer if that is
+        still pending. Call this before drawing into the frame buffer."""
+        if not self._frame_copy_pending:
             return
+        self._frame_copy_pending = False
+        # The copy covers the whole frame, whatever the depth buffer
+        # holds, and leaves the depth buffer as it is.
+        gloo.set_state(depth_test=False)  # pylint: disable=no-member
+        self.fbuffer_prog["texture"] = self.fbuffer_tex_front
+        self.fbuffer_prog.draw("triangle_strip")
+        gloo.set_state(depth_test=True)  # pylint: disable=no-member
+
+    def _cancel_frame_copy(self):
+        """The frame buffer was cleared, so the previous frame does not
+        need to be copied anymore."""
+        self._frame_copy_pending = False
 
-        num_vertices = 0
-        for vertices, _, _ in draw_queue:
-            num_vertices = num_vertices + len(vertices)
-
-        # 2. Create empty buffers based on the number of vertices.
-        #
-        data = np.zeros(
-            num_vertices, dtype=[("position", np.float32, 3), ("color", np.float32, 4)]
-        )
-
-        # 3. Loop through all the shapes in the geometry queue adding
-        # it's information to the buffer.
-        #
-        sidx = 0
-        draw_indices = []
-        for vertices, idx, color in draw_queue:
-            num_shape_verts = len(vertices)
-
-            data["position"][sidx : (sidx + num_shape_verts),] = np.array(vertices)
-
-            color_array = np.array([color] * num_shape_verts)
-            data["color"][sidx : sidx + num_shape_verts, :] = color_array
+    def render_default(self, draw_type, draw_queue):
+        """Draw meshes added to the draw queue with `DrawQueue.add_mesh`.
 
-            draw_indices.append(sidx + idx)
+        The vertex arena of the draw queue is uploaded once for all the
+        draw calls of a flush, only the indices of the meshes in
+        `draw_queue` are uploaded for every call.
 
-            sidx += num_shape_verts
+        :param draw_type: primitive type of the meshes
+        :type draw_type: str
 
-        self.vertex_buffer.set_data(data)
-        self.index_buffer.set_data(np.hstack(draw_indices))
+        :param draw_queue: list of ``(vertices, idx, color)`` entries
+            returned by `DrawQueue.add_mesh`
+        :type draw_queue: list
+        """
+        if len(draw_queue) == 0:
+            return
 
-        # 4. Bind the buffer to the shader.
-        #
-        self.default_prog.bind(self.vertex_buffer)
+        if self.draw_queue.modified:
+            self.mesh_buffer.set_data(self.draw_queue.vertices.view)
+            self.draw_queue.modified = False
 
-        # 5. Draw the shape using the proper shape type and get rid of
-        # the buffers.
-        #
+        if len(draw_queue) == 1:
+            indices = draw_queue[0][1]
+        else:
+            indices = np.concatenate([idx for _, idx, _ in draw_queue])
+        if len(indices) == 0:
+            return
+        self.index_buffer.set_data(indices)
         self.default_prog.draw(draw_type, indices=self.index_buffer)
+        self.draw_calls += 1
 
     def cleanup(self):
         """Run the clean-up routine for the renderer.
@@ -350,6 +518,7 @@ class OpenGLRenderer(ABC):
 
         """
         self.default_prog.delete()
+        self.mesh_buffer.delete()
         self.fbuffer_prog.delete()
         self.fbuffer.delete()
 
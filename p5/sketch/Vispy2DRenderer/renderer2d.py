@@ -29,7 +29,6 @@ from PIL import ImageFont, ImageChops, ImageFilter, ImageDraw, Image
 from vispy import gloo
 from vispy.gloo import Program
 from vispy.gloo import Texture2D
-from vispy.gloo import VertexBuffer
 
 from p5.core import p5
 from p5.core.constants import (
@@ -41,25 +40,220 @@ from p5.core.constants import (
     CENTER,
     CORNERS,
     CORNER,
+    P2D,
     RGB,
+    ROUND,
 )
+from p5.core.graphics import Graphics
 from p5.core.image import image, image_mode
 from p5.core.structure import push_style
 from p5.pmath import matrix
+from .batching import batch_draw_queue, is_planar_transform
+from .bulk import (
+    circle_polygons,
+    fan_indices,
+    outline_indices,
+    rect_polygons,
+    vertex_colors,
+)
+from .glyphs import GLYPH_PADDING, GlyphAtlas, atlas_key
 from .image import VispyPImage
-from .openglrenderer import OpenGLRenderer, get_render_primitives, COLOR_WHITE
+from .openglrenderer import (
+    OpenGLRenderer,
+    PersistentVertexBuffer,
+    get_render_primitives,
+    COLOR_WHITE,
+)
 from .shaders2d import src_default, src_fbuffer
 from .shaders2d import src_line
 from .shaders2d import src_texture
+from .shaders2d import src_instance
+from .shaders2d import src_glyph
 from .shape import PShape, Arc
 
+STROKE_CAP_CODES = {"PROJECT": 0, "SQUARE": 1, "ROUND": 2}
+STROKE_JOIN_CODES = {"MITER": 0, "BEVEL": 1, "ROUND": 2}
+
+# Every line segment is drawn as two triangles. For the k-th vertex of
+# those triangles, SEGMENT_CORNERS[k] tells whether it belongs to the
+# start (0) or the end (1) of the segment.
+SEGMENT_CORNERS = np.array([0, 0, 1, 0, 1, 1])
+# Is the vertex up/below the line segment
+SEGMENT_MARKERS = np.array([1.0, -1.0, -1.0, -1.0, 1.0, -1.0], dtype=np.float32)
+# Left or right side of the segment
+SEGMENT_SIDES = np.array([1.0, 1.0, -1.0, 1.0, -1.0, -1.0], dtype=np.float32)
+
+# Interleaved vertex layout of the line shader
+LINE_VERTEX_DTYPE = np.dtype(
+    [
+        ("pos", np.float32, 3),
+        ("posPrev", np.float32, 3),
+        ("posCurr", np.float32, 3),
+        ("posNext", np.float32, 3),
+        ("marker", np.float32),
+        ("side", np.float32),
+        ("linewidth", np.float32),
+        ("join_type", np.float32),
+        ("cap_type", np.float32),
+        ("color", np.float32, 4),
+    ]
+)
+
+
+def tessellate_lines(queue):
+    """Build the vertex attributes of the line shader for a queue of lines.
+
+    Each entry of the queue is a tuple ``(vertices, idx, stroke,
+    stroke_weight, stroke_cap, stroke_join)`` where every row of
+    ``idx`` is a polyline given as indices into ``vertices``. `stroke`
+    is either one color for the whole entry or an array with one color
+    per polyline. All the segments in the queue are expanded to
+    triangles at once.
+
+    :param queue: list of line draw queue entries
+    :type queue: list
+
+    :returns: structured array of LINE_VERTEX_DTYPE with six vertices
+        per segment, or None if the queue has no segments.
+    :rtype: np.ndarray | None
+    """
+    curr, prev, nxt, pos = [], [], [], []
+    counts, widths, joins, caps = [], [], [], []
+    colors, polyline_counts = [], []
+
+    for vertices, idx, stroke, stroke_weight, stroke_cap, stroke_join in queue:
+        idx = np.asarray(idx)
+        if idx.ndim != 2 or idx.shape[1] < 2:
+            continue
+        vertices = np.asarray(vertices)
+
+        # Index (within a polyline) of the current, previous and next
+        # vertex for every triangle vertex of every segment.
+        n_points = idx.shape[1]
+        start = np.arange(n_points - 1)
+        local_curr = (start[:, np.newaxis] + SEGMENT_CORNERS).ravel()
+        local_prev = np.maximum(local_curr - 1, 0)
+        local_next = np.minimum(local_curr + 1, n_points - 1)
+        local_pos = np.repeat(start, len(SEGMENT_CORNERS))
+
+        for dest, local in [
+            (curr, local_curr),
+            (prev, local_prev),
+            (nxt, local_next),
+            (pos, local_pos),
+        ]:
+            dest.append(np.take(vertices, idx[:, local].ravel(), axis=0))
+
+        counts.append(idx.shape[0] * len(local_curr))
+        widths.append(stroke_weight)
+        joins.append(STROKE_JOIN_CODES[stroke_join])
+        caps.append(STROKE_CAP_CODES[stroke_cap])
+        colors.append(np.broadcast_to(stroke, (idx.shape[0], 4)))
+        polyline_counts.append(np.full(idx.shape[0], len(local_curr)))
+
+    if sum(counts) == 0:
+        return None
+
+    data = np.empty(sum(counts), dtype=LINE_VERTEX_DTYPE)
+    data["pos"] = np.concatenate(pos)
+    data["posPrev"] = np.concatenate(prev)
+    data["posCurr"] = np.concatenate(curr)
+    data["posNext"] = np.concatenate(nxt)
+    data["marker"] = np.tile(SEGMENT_MARKERS, len(data) // len(SEGMENT_MARKERS))
+    data["side"] = np.tile(SEGMENT_SIDES, len(data) // len(SEGMENT_SIDES))
+    data["linewidth"] = np.repeat(widths, counts)
+    data["join_type"] = np.repeat(joins, counts)
+    data["cap_type"] = np.repeat(caps, counts)
+    data["color"] = np.repeat(
+        np.concatenate(colors), np.concatenate(polyline_counts), axis=0
+    )
+    return data
+
+
+# Ellipses and rectangles are drawn from a unit quad (two triangles)
+# and a few attributes for every instance of the shape.
+INSTANCE_ELLIPSE = 0
+INSTANCE_RECT = 1
+UNIT_QUAD = np.array(
+    [[-1, -1], [1, -1], [1, 1], [-1, -1], [1, 1], [-1, 1]], dtype=np.float32
+)
+INSTANCE_DTYPE = np.dtype(
+    [
+        ("basis", np.float32, 4),
+        ("origin", np.float32, 2),
+        ("fill_color", np.float32, 4),
+        ("stroke_color", np.float32, 4),
+        ("half_width", np.float32),
+        ("kind", np.float32),
+        ("cap_type", np.float32),
+    ]
+)
+INSTANCE_VERTEX_DTYPE = np.dtype([("corner", np.float32, 2)] + INSTANCE_DTYPE.descr)
+NO_COLOR = (0.0, 0.0, 0.0, 0.0)
+IDENTITY = np.identity(4)
+
+# Interleaved vertex layout of the glyph shader
+GLYPH_VERTEX_DTYPE = np.dtype(
+    [
+        ("position", np.float32, 3),
+        ("texcoord", np.float32, 2),
+        ("color", np.float32, 4),
+    ]
+)
+# Corners of the two triangles of a glyph quad, relative to its size
+GLYPH_CORNERS = np.array([[0, 0], [1, 0], [0, 1], [1, 0], [1, 1], [0, 1]])
+
+# Interleaved vertex layout of the texture shader drawing images
+SPRITE_VERTEX_DTYPE = GLYPH_VERTEX_DTYPE
+# Texture coordinates of the corners for textures drawn into with a
+# frame buffer, whose first row is the bottom of the image
+FRAMEBUFFER_TEXCOORDS = GLYPH_CORNERS * (1, -1) + (0, 1)
+
+
+class FrameBufferTexture(Texture2D):
+    """Texture of an offscreen graphics buffer.
+
+    It is drawn into through a frame buffer, which stores the image
+    bottom-up with colors premultiplied by their alpha.
+    """
+
+
+def _axis_aligned_rect(path):
+    """Returns the center and half size of a quad if it is an axis
+    aligned rectangle in the z = 0 plane, otherwise None."""
+    p1, p2, p3, p4 = path
+    if p1.z != 0 or p2.z != 0 or p3.z != 0 or p4.z != 0:
+        return None
+    if not (
+        (p1.y == p2.y and p2.x == p3.x and p3.y == p4.y and p4.x == p1.x)
+        or (p1.x == p2.x and p2.y == p3.y and p3.x == p4.x and p4.y == p1.y)
+    ):
+        return None
+    center = ((p1.x + p3.x) / 2, (p1.y + p3.y) / 2)
+    radii = ((p3.x - p1.x) / 2, (p3.y - p1.y) / 2)
+    return center, radii
+
 
 class VispyRenderer2D(OpenGLRenderer):
     def __init__(self):
         super().__init__(src_fbuffer, src_default)
         self.texture_prog = Program(src_texture.vert, src_texture.frag)
-        self.texture_prog["texcoord"] = self.fbuf_texcoords
+        self.sprite_buffer = PersistentVertexBuffer(SPRITE_VERTEX_DTYPE)
+        self.sprite_buffer.bind(self.texture_prog)
+        # Textures of the images in the draw queue
+        self.sprite_textures = set()
         self.line_prog = None
+        # Apply the model transforms in the vertex shaders instead of
+        # transforming every vertex on the CPU.
+        self.gpu_transforms = False
+        self.line_buffer = PersistentVertexBuffer(LINE_VERTEX_DTYPE)
+        self.instance_prog = Program(src_instance.vert, src_instance.frag)
+        self.instance_buffer = PersistentVertexBuffer(INSTANCE_VERTEX_DTYPE)
+        self.instance_buffer.bind(self.instance_prog)
+        self.glyph_prog = Program(src_glyph.vert, src_glyph.frag)
+        self.glyph_buffer = PersistentVertexBuffer(GLYPH_VERTEX_DTYPE)
+        self.glyph_buffer.bind(self.glyph_prog)
+        self.glyph_atlases = {}
         self.modelview_matrix = np.identity(4)
 
     def reset_view(self):
@@ -77,14 +271,23 @@ class VispyRenderer2D(OpenGLRenderer):
         )
 
         gloo.set_viewport(*self.viewport)  # pylint: disable=no-member
+        self._update_projection(builtins.width, builtins.height)
+
+        self.fbuffer_tex_front = Texture2D((builtins.height, builtins.width, 3))
+        self.fbuffer_tex_back = Texture2D((builtins.height, builtins.width, 3))
+
+        for buf in [self.fbuffer_tex_front, self.fbuffer_tex_back]:
+            self.fbuffer.color_buffer = buf
+            with self.fbuffer:
+                self.clear()
 
-        cz = (builtins.height / 2) / math.tan(math.radians(30))
+    def _update_projection(self, width, height):
+        """Set up the programs to draw on a canvas of the given size"""
+        cz = (height / 2) / math.tan(math.radians(30))
         self.projection_matrix = matrix.perspective_matrix(
-            math.radians(60), builtins.width / builtins.height, 0.1 * cz, 10 * cz
-        )
-        self.modelview_matrix = matrix.translation_matrix(
-            -builtins.width / 2, builtins.height / 2, -cz
+            math.radians(60), width / height, 0.1 * cz, 10 * cz
         )
+        self.modelview_matrix = matrix.translation_matrix(-width / 2, height / 2, -cz)
         self.modelview_matrix = self.modelview_matrix.dot(
             matrix.scale_transform(1, -1, 1)
         )
@@ -97,27 +300,30 @@ class VispyRenderer2D(OpenGLRenderer):
         self.texture_prog["modelview"] = self.modelview_matrix.T.flatten()
         self.texture_prog["projection"] = self.projection_matrix.T.flatten()
 
+        self.instance_prog["modelview"] = self.modelview_matrix.T.flatten()
+        self.instance_prog["projection"] = self.projection_matrix.T.flatten()
+
+        self.glyph_prog["modelview"] = self.modelview_matrix.T.flatten()
+        self.glyph_prog["projection"] = self.projection_matrix.T.flatten()
+
         self.line_prog = Program(src_line.vert, src_line.frag)
 
         self.line_prog["modelview"] = self.modelview_matrix.T.flatten()
         self.line_prog["projection"] = self.projection_matrix.T.flatten()
-        self.line_prog["height"] = builtins.height
-
-        self.fbuffer_tex_front = Texture2D((builtins.height, builtins.width, 3))
-        self.fbuffer_tex_back = Texture2D((builtins.height, builtins.width, 3))
-
-        for buf in [self.fbuffer_tex_front, self.fbuffer_tex_back]:
-            self.fbuffer.color_buffer = buf
-            with self.fbuffer:
-                self.clear()
+        self.line_prog["height"] = height
+        self.line_buffer.bind(self.line_prog)
 
     def clear(self, color=True, depth=True):
         """Clear the renderer background."""
-        gloo.set_state(  # pylint: disable=no-member
-            clear_color=self.style.background_color
-        )
+        if color:
+            self._cancel_frame_copy()
+        gloo.set_state(clear_color=self._clear_color())  # pylint: disable=no-member
         gloo.clear(color=color, depth=depth)  # pylint: disable=no-member
 
+    def _clear_color(self):
+        """The color the frame is cleared with"""
+        return self.style.background_color
+
     def _comm_toggles(self, state=True):
         gloo.set_state(blend=state)  # pylint: disable=no-member
         gloo.set_state(depth_test=state)  # pylint: disable=no-member
@@ -133,6 +339,7 @@ class VispyRenderer2D(OpenGLRenderer):
         """The main draw loop context manager."""
 
         self.transform_matrix = np.identity(4)
+        self.draw_calls = 0
 
         self.default_prog["modelview"] = self.modelview_matrix.T.flatten()
         self.default_prog["projection"] = self.projection_matrix.T.flatten()
@@ -142,13 +349,13 @@ class VispyRenderer2D(OpenGLRenderer):
         with self.fbuffer:
             gloo.set_viewport(*self.texture_viewport)  # pylint: disable=no-member
             self._comm_toggles()
-            self.fbuffer_prog["texture"] = self.fbuffer_tex_front
-            self.fbuffer_prog.draw("triangle_strip")
+            self._start_frame_copy()
 
             yield
 
             self.flush_geometry()
             self.transform_matrix = np.identity(4)
+            self.frame_draw_calls = self.draw_calls
 
         gloo.set_viewport(*self.viewport)  # pylint: disable=no-member
         self._comm_toggles(False)
@@ -162,15 +369,29 @@ class VispyRenderer2D(OpenGLRenderer):
         )
 
     def _add_to_draw_queue(
-        self, stype, vertices, idx, fill, stroke, stroke_weight, stroke_cap, stroke_join
+        self,
+        stype,
+        vertices,
+        idx,
+        fill,
+        stroke,
+        stroke_weight,
+        stroke_cap,
+        stroke_join,
+        transform=None,
     ):
-        """Adds shape of stype to draw queue"""
+        """Adds shape of stype to draw queue
+
+        :param transform: model transform that the vertex shader should
+            apply to the vertices, or None if they are already
+            transformed.
+        :type transform: np.ndarray | None
+        """
         if stype == "lines":
-            self.draw_queue.append(
-                (stype, (vertices, idx, stroke, stroke_weight, stroke_cap, stroke_join))
-            )
+            entry = (vertices, idx, stroke, stroke_weight, stroke_cap, stroke_join)
         else:
-            self.draw_queue.append((stype, (vertices, idx, fill)))
+            stype, entry = self.draw_queue.add_mesh(stype, vertices, idx, fill)
+        self.draw_queue.append((stype, entry, transform))
 
     def render(self, shape):
         fill = shape.fill.normalized if shape.fill else None
@@ -179,18 +400,20 @@ class VispyRenderer2D(OpenGLRenderer):
         stroke_cap = shape.stroke_cap
         stroke_join = shape.stroke_join
 
+        transform = None
+        if self.gpu_transforms:
+            transform = self.transform_matrix.dot(shape._matrix)
+
         obj_list = get_render_primitives(shape)
         for obj in obj_list:
             stype, vertices, idx = obj
-            # Convert 2D vertices to 3D by adding "0" column, needed for further transformations
-            if len(vertices[0]) == 2:
-                vertices = np.hstack([vertices, np.zeros((len(vertices), 1))])
-            # Transform vertices
-            vertices = self._transform_vertices(
-                np.hstack([vertices, np.ones((len(vertices), 1))]),
-                shape._matrix,
-                self.transform_matrix,
-            )
+            # Transform vertices, unless the shaders do it
+            if transform is None:
+                vertices = self._transform_vertices(
+                    np.hstack([vertices, np.ones((len(vertices), 1))]),
+                    shape._matrix,
+                    self.transform_matrix,
+                )
             # Add to draw queue
             self._add_to_draw_queue(
                 stype,
@@ -201,23 +424,30 @@ class VispyRenderer2D(OpenGLRenderer):
                 stroke_weight,
                 stroke_cap,
                 stroke_join,
+                transform,
             )
 
     def flush_geometry(self):
         """Flush all the shape geometry from the draw queue to the GPU."""
-        current_queue = []
-        for index, shape in enumerate(self.draw_queue):
-            current_shape = self.draw_queue[index][0]
-            current_queue.append(self.draw_queue[index][1])
-
-            if current_shape == "lines":
-                self.render_line(current_queue)
+        self._copy_previous_frame()
+        for batch in batch_draw_queue(self.draw_queue):
+            transform = batch.transform if batch.transform is not None else IDENTITY
+            if batch.key == "lines":
+                self.line_prog["transform"] = transform.T.flatten()
+                self.render_line(batch.entries)
+            elif batch.key == "instances":
+                self.render_instances(batch.entries)
+            elif isinstance(batch.key, GlyphAtlas):
+                self.glyph_prog["transform"] = transform.T.flatten()
+                self.render_glyphs(batch.key, batch.entries)
+            elif isinstance(batch.key, Texture2D):
+                self.render_sprites(batch.key, batch.entries)
             else:
-                self.render_default(current_shape, current_queue)
-
-            current_queue = []
+                self.default_prog["transform"] = transform.T.flatten()
+                self.render_default(batch.key, batch.entries)
 
-        self.draw_queue = []
+        self.draw_queue.clear()
+        self.sprite_textures.clear()
 
     def render_line(self, queue):
         """
@@ -227,86 +457,200 @@ class VispyRenderer2D(OpenGLRenderer):
         Reference: https://blog.mapbox.com/drawing-antialiased-lines-with-opengl-8766f34192dc
         """
 
+        data = tessellate_lines(queue)
+        if data is None:
+            return
+
+        self.line_buffer.set_data(data)
+        self.line_buffer.draw(self.line_prog, "triangles")
+        self.draw_calls += 1
+
+    def _add_instance(self, kind, center, radii):
+        """Queue an ellipse or a rectangle to be drawn from the unit quad.
+
+        :param kind: INSTANCE_ELLIPSE or INSTANCE_RECT
+        :type kind: int
+
+        :param center: center of the shape
+        :type center: tuple
+
+        :param radii: half the width and height of the shape
+        :type radii: tuple
+
+        :returns: False if the shape can not be drawn this way (the
+            current transform leaves the z = 0 plane or the shape is
+            degenerate), True otherwise.
+        :rtype: bool
+        """
+        m = self.transform_matrix
+        if not is_planar_transform(m):
+            return False
+
+        a, b = m[0, 0] * radii[0], m[0, 1] * radii[1]
+        c, d = m[1, 0] * radii[0], m[1, 1] * radii[1]
+        if a * d - b * c == 0:
+            return False
+
+        style = self.style
+        if not (style.fill_enabled or style.stroke_enabled):
+            return True
+        fill = style.fill_color if style.fill_enabled else NO_COLOR
+        if style.stroke_enabled:
+            stroke = style.stroke_color
+            half_width = max(style.stroke_weight, 1) / 2
+        else:
+            stroke = NO_COLOR
+            half_width = 0
+
+        x = m[0, 0] * center[0] + m[0, 1] * center[1] + m[0, 3]
+        y = m[1, 0] * center[0] + m[1, 1] * center[1] + m[1, 3]
+        # Bounding box of the pixels the instance may cover
+        ex = abs(a) + abs(b) + half_width + 0.01
+        ey = abs(c) + abs(d) + half_width + 0.01
+        bounds = np.array([[x - ex, y - ey], [x + ex, y + ey]])
+
+        instance = (
+            (a, c, b, d),
+            (x, y),
+            fill,
+            stroke,
+            half_width,
+            kind,
+            STROKE_CAP_CODES[style.stroke_cap],
+        )
+        self.draw_queue.append(("instances", (bounds, instance), None))
+        return True
+
+    def _add_instances(self, kind, centers, radii, fill, stroke, half_width):
+        """Queue many ellipses or rectangles as a single draw queue
+        entry, like `_add_instance` does for one of them.
+
+        Degenerate shapes are skipped.
+
+        :param kind: INSTANCE_ELLIPSE or INSTANCE_RECT
+        :type kind: int
+
+        :param centers: (N, 2) array of the centers of the shapes
+        :type centers: np.ndarray
+
+        :param radii: (N, 2) array of half the width and height of the
+            shapes
+        :type radii: np.ndarray
+
+        :param fill: fill color of every shape as an (N, 4) array, or
+            one color for all of them
+        :type fill: np.ndarray | tuple
+
+        :param stroke: stroke color of every shape as an (N, 4) array,
+            or one color for all of them
+        :type stroke: np.ndarray | tuple
+
+        :param half_width: half the width of the stroke
+        :type half_width: float
+
+        :returns: False if the shapes can not be drawn this way (the
+            current transform leaves the z = 0 plane), True otherwise.
+        :rtype: bool
+        """
+        m = self.transform_matrix
+        if not is_planar_transform(m):
+            return False
+
+        a, b = m[0, 0] * radii[:, 0], m[0, 1] * radii[:, 1]
+        c, d = m[1, 0] * radii[:, 0], m[1, 1] * radii[:, 1]
+        x = m[0, 0] * centers[:, 0] + m[0, 1] * centers[:, 1] + m[0, 3]
+        y = m[1, 0] * centers[:, 0] + m[1, 1] * centers[:, 1] + m[1, 3]
+
+        instances = np.empty(len(centers), dtype=INSTANCE_DTYPE)
+        instances["basis"] = np.column_stack((a, c, b, d))
+        instances["origin"] = np.column_stack((x, y))
+        instances["fill_color"] = fill
+        instances["stroke_color"] = stroke
+        instances["half_width"] = half_width
+        instances["kind"] = kind
+        instances["cap_type"] = STROKE_CAP_CODES[self.style.stroke_cap]
+
+        keep = a * d - b * c != 0
+        if not keep.all():
+            instances, a, b, c, d, x, y = (
+                v[keep] for v in (instances, a, b, c, d, x, y)
+            )
+        if len(instances) == 0:
+            return True
+
+        # Bounding box of the pixels all the instances may cover
+        ex = np.abs(a) + np.abs(b) + half_width + 0.01
+        ey = np.abs(c) + np.abs(d) + half_width + 0.01
+        bounds = np.array(
+            [[(x - ex).min(), (y - ey).min()], [(x + ex).max(), (y + ey).max()]]
+        )
+        self.draw_queue.append(("instances", (bounds, instances), None))
+        return True
+
+    def render_instances(self, queue):
+        """Draw the queued ellipses and rectangles with one draw call.
+
+        Without instanced drawing in vispy, the per-instance attributes
+        are repeated for the six vertices of the unit quad.
+        """
         if len(queue) == 0:
             return
 
-        pos = []
-        posPrev = []
-        posCurr = []
-        posNext = []
-        markers = []
-        side = []
-
-        linewidth = []
-        join_type = []
-        cap_type = []
-        color = []
-
-        stroke_cap_codes = {"PROJECT": 0, "SQUARE": 1, "ROUND": 2}
-
-        stroke_join_codes = {"MITER": 0, "BEVEL": 1, "ROUND": 2}
-
-        for line in queue:
-            if len(line[1]) == 0:
-                continue
-
-            for segment in line[1]:
-                for i in range(
-                    len(segment) - 1
-                ):  # the data is sent to renderer in line segments
-                    for j in [0, 0, 1, 0, 1, 1]:  # all the vertices of triangles
-                        if i + j - 1 >= 0:
-                            posPrev.append(line[0][segment[i + j - 1]])
-                        else:
-                            posPrev.append(line[0][segment[i + j]])
-
-                        if i + j + 1 < len(segment):
-                            posNext.append(line[0][segment[i + j + 1]])
-                        else:
-                            posNext.append(line[0][segment[i + j]])
-
-                        posCurr.append(line[0][segment[i + j]])
-
-                    # Is the vertex up/below the line segment
-                    markers.extend([1.0, -1.0, -1.0, -1.0, 1.0, -1.0])
-                    # Left or right side of the segment
-                    side.extend([1.0, 1.0, -1.0, 1.0, -1.0, -1.0])
-                    # Left vertex of each segment
-                    pos.extend([line[0][segment[i]]] * 6)
-                    linewidth.extend([line[3]] * 6)
-                    join_type.extend([stroke_join_codes[line[5]]] * 6)
-                    cap_type.extend([stroke_cap_codes[line[4]]] * 6)
-                    color.extend([line[2]] * 6)
-
-        if len(pos) == 0:
+        # Entries are single instances, or arrays of instances queued
+        # by the bulk drawing functions. Keep them in order.
+        parts, singles = [], []
+        for _, instance in queue:
+            if isinstance(instance, np.ndarray):
+                if singles:
+                    parts.append(np.array(singles, dtype=INSTANCE_DTYPE))
+                    singles = []
+                parts.append(instance)
+            else:
+                singles.append(instance)
+        if singles:
+            parts.append(np.array(singles, dtype=INSTANCE_DTYPE))
+        instances = np.concatenate(parts)
+        data = np.empty(len(instances) * len(UNIT_QUAD), dtype=INSTANCE_VERTEX_DTYPE)
+        data["corner"] = np.tile(UNIT_QUAD, (len(instances), 1))
+        for name in INSTANCE_DTYPE.names:
+            data[name] = np.repeat(instances[name], len(UNIT_QUAD), axis=0)
+
+        self.instance_buffer.set_data(data)
+        self.instance_buffer.draw(self.instance_prog, "triangles")
+        self.draw_calls += 1
+
+    def render_glyphs(self, atlas, queue):
+        """Draw queued text from the same glyph atlas with one draw call.
+
+        :param atlas: atlas of the glyphs
+        :type atlas: GlyphAtlas
+
+        :param queue: list of (vertices, texcoords, color) entries, with
+            the texture coordinates in atlas pixels.
+        :type queue: list
+        """
+        if len(queue) == 0:
             return
 
-        posPrev = np.array(posPrev, np.float32)
-        posCurr = np.array(posCurr, np.float32)
-        posNext = np.array(posNext, np.float32)
-        markers = np.array(markers, np.float32)
-        side = np.array(side, np.float32)
-        pos = np.array(pos, np.float32)
-        linewidth = np.array(linewidth, np.float32)
-        join_type = np.array(join_type, np.float32)
-        cap_type = np.array(cap_type, np.float32)
-        color = np.array(color, np.float32)
-
-        self.line_prog["pos"] = gloo.VertexBuffer(pos)
-        self.line_prog["posPrev"] = gloo.VertexBuffer(posPrev)
-        self.line_prog["posCurr"] = gloo.VertexBuffer(posCurr)
-        self.line_prog["posNext"] = gloo.VertexBuffer(posNext)
-        self.line_prog["marker"] = gloo.VertexBuffer(markers)
-        self.line_prog["side"] = gloo.VertexBuffer(side)
-        self.line_prog["linewidth"] = gloo.VertexBuffer(linewidth)
-        self.line_prog["join_type"] = gloo.VertexBuffer(join_type)
-        self.line_prog["cap_type"] = gloo.VertexBuffer(cap_type)
-        self.line_prog["color"] = gloo.VertexBuffer(color)
-
-        self.line_prog.draw("triangles")
+        data = np.empty(sum(len(entry[0]) for entry in queue), GLYPH_VERTEX_DTYPE)
+        data["position"] = np.concatenate([vertices for vertices, _, _ in queue])
+        data["texcoord"] = np.concatenate([texcoords for _, texcoords, _ in queue])
+        data["texcoord"] /= atlas.size
+        data["color"] = np.repeat(
+            [color for _, _, color in queue], [len(entry[0]) for entry in queue], axis=0
+        )
+
+        self.glyph_prog["atlas"] = atlas.texture
+        self.glyph_buffer.set_data(data)
+        self.glyph_buffer.draw(self.glyph_prog, "triangles")
+        self.draw_calls += 1
 
     def render_image(self, image, location, size):
-        """Render the image.
+        """Queue the image to be drawn as a sprite.
+
+        Sprites sharing a texture are drawn together with one draw
+        call, with the tint and the transform of each sprite applied to
+        its vertices.
 
         :param image: image to be rendered
         :type image: builtins.Image
@@ -317,29 +661,51 @@ class VispyRenderer2D(OpenGLRenderer):
         :param size: target size of the image to draw.
         :type size: tuple | list | builtins.Vector
         """
-        self.flush_geometry()
-
-        self.texture_prog["fill_color"] = (
-            self.style.tint_color if self.style.tint_enabled else COLOR_WHITE
-        )
-        self.texture_prog["transform"] = self.transform_matrix.T.flatten()
+        # The queued sprites have to be drawn before their texture is
+        # updated with the new pixels of the image.
+        if image._img_texture in self.sprite_textures and image._texture_outdated:
+            self.flush_geometry()
+        texture = image._texture
+        self.sprite_textures.add(texture)
 
         x, y = location
         sx, sy = size
-        imx, imy = image.size
-        data = np.zeros(
-            4, dtype=[("position", np.float32, 2), ("texcoord", np.float32, 2)]
-        )
-        data["texcoord"] = np.array(
-            [[0.0, 1.0], [1.0, 1.0], [0.0, 0.0], [1.0, 0.0]], dtype=np.float32
-        )
-        data["position"] = np.array(
-            [[x, y + sy], [x + sx, y + sy], [x, y], [x + sx, y]], dtype=np.float32
+        vertices = np.zeros((len(GLYPH_CORNERS), 4))
+        vertices[:, :2] = GLYPH_CORNERS * (sx, sy) + (x, y)
+        vertices[:, 3] = 1
+        vertices = self._transform_vertices(vertices, IDENTITY, self.transform_matrix)
+        tint = self.style.tint_color if self.style.tint_enabled else COLOR_WHITE
+        if isinstance(texture, FrameBufferTexture):
+            texcoords = FRAMEBUFFER_TEXCOORDS
+        else:
+            texcoords = GLYPH_CORNERS
+        self.draw_queue.append((texture, (vertices, texcoords, tint), None))
+
+    def render_sprites(self, texture, queue):
+        """Draw queued images sharing a texture with one draw call.
+
+        :param texture: texture of the images
+        :type texture: Texture2D
+
+        :param queue: list of (vertices, texcoords, tint) entries
+        :type queue: list
+        """
+        if len(queue) == 0:
+            return
+
+        data = np.empty(len(queue) * len(GLYPH_CORNERS), SPRITE_VERTEX_DTYPE)
+        data["position"] = np.concatenate([vertices for vertices, _, _ in queue])
+        # All the sprites of a texture have the same texture coordinates
+        data["texcoord"] = np.tile(queue[0][1], (len(queue), 1))
+        data["color"] = np.repeat(
+            [tint for _, _, tint in queue], len(GLYPH_CORNERS), axis=0
         )
 
-        self.texture_prog["texture"] = image._texture
-        self.texture_prog.bind(VertexBuffer(data))
-        self.texture_prog.draw("triangle_strip")
+        self.texture_prog["texture"] = texture
+        self.texture_prog["premultiplied"] = isinstance(texture, FrameBufferTexture)
+        self.sprite_buffer.set_data(data)
+        self.sprite_buffer.draw(self.texture_prog, "triangles")
+        self.draw_calls += 1
 
     def cleanup(self):
         """Run the clean-up routine for the renderer.
@@ -350,6 +716,15 @@ class VispyRenderer2D(OpenGLRenderer):
         """
         OpenGLRenderer.cleanup(self)
         self.line_prog.delete()
+        self.line_buffer.delete()
+        self.instance_prog.delete()
+        self.instance_buffer.delete()
+        self.glyph_prog.delete()
+        self.glyph_buffer.delete()
+        self.texture_prog.delete()
+        self.sprite_buffer.delete()
+        for atlas in self.glyph_atlases.values():
+            atlas.texture.delete()
 
     def render_shape(self, shape):
         self.render(shape)
@@ -374,6 +749,9 @@ class VispyRenderer2D(OpenGLRenderer):
 
     def quad(self, *args):
         path = args[0]
+        rect = _axis_aligned_rect(path)
+        if rect is not None and self._add_instance(INSTANCE_RECT, *rect):
+            return
         self.render_shape(PShape(vertices=path, shape_type=SType.QUADS))
 
     def arc(self, *args):
@@ -383,8 +761,187 @@ class VispyRenderer2D(OpenGLRenderer):
         stop_angle = args[3]
         mode = args[4]
 
+        is_ellipse = mode == "CHORD" and stop_angle - start_angle >= math.pi * 2
+        if is_ellipse and self._add_instance(INSTANCE_ELLIPSE, center, dim):
+            return
         self.render_shape(Arc(center, dim, start_angle, stop_angle, mode))
 
+    def _bulk_fill(self, colors):
+        """Fill color of the shapes drawn by the bulk functions, or None"""
+        if colors is not None:
+            return colors
+        return self.style.fill_color if self.style.fill_enabled else None
+
+    def _bulk_stroke(self, colors=None):
+        """Stroke color of the shapes drawn by the bulk functions, or None"""
+        if colors is not None:
+            return colors
+        return self.style.stroke_color if self.style.stroke_enabled else None
+
+    def _add_bulk(self, stype, vertices, idx, fill, stroke):
+        """Queue the vertices of all the shapes of a bulk call as one entry"""
+        transform = None
+        if self.gpu_transforms:
+            transform = self.transform_matrix.copy()
+        else:
+            vertices = self._transform_vertices(
+                np.hstack([vertices, np.ones((len(vertices), 1))]),
+                IDENTITY,
+                self.transform_matrix,
+            )
+        self._add_to_draw_queue(
+            stype,
+            vertices,
+            idx,
+            fill,
+            stroke,
+            self.style.stroke_weight,
+            self.style.stroke_cap,
+            self.style.stroke_join,
+            transform,
+        )
+
+    def _add_polygons(self, polygons, fill, stroke):
+        """Queue convex polygons with the same number of corners.
+
+        :param polygons: (N, k, 3) array of the corners of the polygons
+        :type polygons: np.ndarray
+
+        :param fill: fill color of every polygon as an (N, 4) array,
+            one color for all of them, or None
+        :param stroke: stroke color, like `fill`
+        """
+        n_polygons, n_corners = polygons.shape[:2]
+        vertices = polygons.reshape(-1, 3)
+        if fill is not None:
+            self._add_bulk(
+                "triangles",
+                vertices,
+                fan_indices(n_polygons, n_corners),
+                vertex_colors(fill, n_corners),
+                None,
+            )
+        if stroke is not None:
+            self._add_bulk(
+                "lines",
+                vertices,
+                outline_indices(n_polygons, n_corners),
+                None,
+                vertex_colors(stroke, n_corners),
+            )
+
+    def points(self, vertices, colors=None):
+        """Draw points with the stroke color and weight.
+
+        :param vertices: (N, 3) array of the points
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            stroke color of every point
+        :type colors: np.ndarray | None
+        """
+        stroke = self._bulk_stroke(colors)
+        if stroke is None or len(vertices) == 0:
+            return
+
+        round_points = self.style.stroke_cap == ROUND
+        radii = np.full((len(vertices), 2), self.style.stroke_weight / 2)
+        kind = INSTANCE_ELLIPSE if round_points else INSTANCE_RECT
+        if not vertices[:, 2].any() and self._add_instances(
+            kind, vertices[:, :2], radii, stroke, NO_COLOR, 0
+        ):
+            return
+
+        centers = np.column_stack((vertices[:, :2], radii[:, 0]))
+        if round_points:
+            polygons = circle_polygons(centers)
+        else:
+            polygons = rect_polygons(
+                np.column_stack((vertices[:, :2] - radii, 2 * radii))
+            )
+        polygons[:, :, 2] = vertices[:, 2:]
+        self._add_polygons(polygons, stroke, None)
+
+    def lines(self, vertices, colors=None):
+        """Draw line segments with the stroke color and weight.
+
+        :param vertices: (N, 2, 3) array of the end points of the lines
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            stroke color of every line
+        :type colors: np.ndarray | None
+        """
+        stroke = self._bulk_stroke(colors)
+        if stroke is None or len(vertices) == 0:
+            return
+        idx = np.arange(2 * len(vertices), dtype=np.uint32).reshape(-1, 2)
+        self._add_bulk("lines", vertices.reshape(-1, 3), idx, None, stroke)
+
+    def rects(self, xywh, colors=None):
+        """Draw rectangles with the fill and stroke of the style.
+
+        :param xywh: (N, 4) array of the top-left corner, width and
+            height of the rectangles
+        :type xywh: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every rectangle
+        :type colors: np.ndarray | None
+        """
+        radii = xywh[:, 2:] / 2
+        self._fill_instances(INSTANCE_RECT, xywh[:, :2] + radii, radii, colors)
+
+    def circles(self, xyr, colors=None):
+        """Draw circles with the fill and stroke of the style.
+
+        :param xyr: (N, 3) array of the center and radius of the circles
+        :type xyr: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every circle
+        :type colors: np.ndarray | None
+        """
+        radii = np.repeat(xyr[:, 2:], 2, axis=1)
+        self._fill_instances(INSTANCE_ELLIPSE, xyr[:, :2], radii, colors)
+
+    def _fill_instances(self, kind, centers, radii, colors):
+        fill = self._bulk_fill(colors)
+        stroke = self._bulk_stroke()
+        if (fill is None and stroke is None) or len(centers) == 0:
+            return
+
+        half_width = max(self.style.stroke_weight, 1) / 2 if stroke is not None else 0
+        if self._add_instances(
+            kind,
+            centers,
+            radii,
+            NO_COLOR if fill is None else fill,
+            NO_COLOR if stroke is None else stroke,
+            half_width,
+        ):
+            return
+
+        if kind == INSTANCE_RECT:
+            polygons = rect_polygons(np.column_stack((centers - radii, 2 * radii)))
+        else:
+            polygons = circle_polygons(np.column_stack((centers, radii[:, 0])))
+        self._add_polygons(polygons, fill, stroke)
+
+    def triangles(self, vertices, colors=None):
+        """Draw triangles with the fill and stroke of the style.
+
+        :param vertices: (N, 3, 3) array of the corners of the triangles
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every triangle
+        :type colors: np.ndarray | None
+        """
+        if len(vertices) == 0:
+            return
+        self._add_polygons(vertices, self._bulk_fill(colors), self._bulk_stroke())
+
     def shape(self, vertices, contours, shape_type, *args):
         """Render a Pshape"""
         self.render_shape(
@@ -416,7 +973,82 @@ class VispyRenderer2D(OpenGLRenderer):
         """Loads the given font into a font object"""
         return self.create_font(font_name)
 
+    def _queue_glyphs(self, text_string, position, wrap_at):
+        """Queue a line of text to be drawn from the glyph atlas of the
+        current font.
+
+        :returns: False if the text has to be rasterized as a whole
+            instead. This is the case for multiline text, bitmap fonts,
+            strokes wider than one pixel and image modes other than
+            CORNER.
+        :rtype: bool
+        """
+        style = self.style
+        if wrap_at is not None or "\n" in text_string or style.image_mode != CORNER:
+            return False
+        key = atlas_key(style.font_family)
+        if key is None:
+            return False
+
+        # A one pixel stroke is the difference between the text and
+        # itself, which is invisible, but it still pads the text.
+        padding = 0
+        if style.stroke_enabled and style.stroke_weight != 0:
+            if abs(style.stroke_weight) != 1:
+                return False
+            padding = 1
+
+        atlas = self.glyph_atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(style.font_family)
+            self.glyph_atlases[key] = atlas
+        placed = atlas.layout(text_string)
+        if placed is None:
+            return False
+        if not (style.fill_enabled and placed):
+            return True
+
+        _, _, width, height = style.font_family.getbbox(text_string)
+        x, y = position[0] + padding, position[1] + padding
+        if style.text_align_x == RIGHT:
+            x -= width + 2 * padding
+        elif style.text_align_x == CENTER:
+            x -= (width + 2 * padding) / 2
+        if style.text_align_y == BOTTOM:
+            y -= height + 2 * padding
+        elif style.text_align_y == CENTER:
+            y -= (height + 2 * padding) / 2
+
+        glyphs = np.array(
+            [(gx, gy) + glyph.size + glyph.position for glyph, gx, gy in placed]
+        )
+        # Quads include the empty margin around the glyphs
+        glyphs[:, [0, 1, 4, 5]] -= GLYPH_PADDING
+        glyphs[:, 2:4] += 2 * GLYPH_PADDING
+        sizes = glyphs[:, None, 2:4]
+        corners = (glyphs[:, None, 0:2] + GLYPH_CORNERS * sizes).reshape(-1, 2)
+        texcoords = (glyphs[:, None, 4:6] + GLYPH_CORNERS * sizes).reshape(-1, 2)
+        vertices = np.zeros((len(corners), 3))
+        vertices[:, :2] = corners + (x, y)
+
+        transform = None
+        if self.gpu_transforms:
+            transform = self.transform_matrix
+        else:
+            vertices = self._transform_vertices(
+                np.hstack([vertices, np.ones((len(vertices), 1))]),
+                IDENTITY,
+                self.transform_matrix,
+            )
+        self.draw_queue.append(
+            (atlas, (vertices, texcoords, style.fill_color), transform)
+        )
+        return True
+
     def text(self, text_string, position, wrap_at):
+        if self._queue_glyphs(text_string, position, wrap_at):
+            return text_string
+
         multiline = False
         if not (wrap_at is None):
             text_string = textwrap.fill(text_string, wrap_at)
@@ -547,7 +1179,8 @@ class VispyRenderer2D(OpenGLRenderer):
         # Add else statement below to resize the img._img first,
         #   or it will take much time to render large image,
         #   even when small size is specified to the image
-        if size != img.size:
+        # Graphics buffers are scaled when they are drawn instead
+        if size != img.size and not isinstance(img, Graphics):
             img.size = size
 
         lx, ly = location
@@ -578,6 +1211,7 @@ class VispyRenderer2D(OpenGLRenderer):
     def load_pixels(self):
         pixels = VispyPImage(builtins.width, builtins.height, RGB)
         # sketch.renderer.flush_geometry()
+        self._copy_previous_frame()
         pixel_data = self.fbuffer.read(mode="color", alpha=False)
 
         pixels._img = Image.fromarray(pixel_data)
@@ -600,6 +1234,11 @@ class VispyRenderer2D(OpenGLRenderer):
             p5.sketch.screenshot("Screen.png")
 
     def create_graphics(self, width, height, renderer):
-        raise NotImplementedError(
-            "Vispy Renderer does not support offscreen buffers yet, use 'skia' as your backend renderer"
-        )
+        if renderer != P2D:
+            raise NotImplementedError(
+                "Vispy Renderer only supports 2D offscreen buffers, use P2D as the renderer"
+            )
+        # Imported here as the graphics renderer extends this class
+        from .graphics import create_graphics_helper
+
+        return create_graphics_helper(width, height, self)
@@ -0,0 +1,12 @@
+// The atlas stores the coverage of the glyphs, which becomes the
+// opacity of the fill color.
+uniform sampler2D atlas;
+
+varying vec2 vertex_texcoord;
+varying vec4 frag_color;
+
+void main()
+{
+    float coverage = texture2D(atlas, vertex_texcoord).r;
+    gl_FragColor = vec4(frag_color.rgb, frag_color.a * coverage);
+}
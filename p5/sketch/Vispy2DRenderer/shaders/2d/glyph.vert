@@ -0,0 +1,17 @@
+attribute vec3 position;
+attribute vec2 texcoord;
+attribute vec4 color;
+
+uniform mat4 transform;
+uniform mat4 modelview;
+uniform mat4 projection;
+
+varying vec2 vertex_texcoord;
+varying vec4 frag_color;
+
+void main()
+{
+    gl_Position = projection * modelview * transform * vec4(position, 1.0);
+    vertex_texcoord = texcoord;
+    frag_color = color;
+}
@@ -0,0 +1,53 @@
+varying vec2 v_local;
+varying vec2 v_grad_x;
+varying vec2 v_grad_y;
+varying vec4 v_fill_color;
+varying vec4 v_stroke_color;
+varying float v_half_width;
+varying float v_kind;
+varying float v_cap_type;
+
+void main()
+{
+    bool inside_fill;
+    bool inside_stroke;
+    float h = v_half_width;
+
+    if(v_kind < 0.5){ // ellipse
+        float r = length(v_local);
+        vec2 grad = (v_local.x * v_grad_x + v_local.y * v_grad_y) / max(r, 1e-6);
+        float d = (r - 1.0) / length(grad); // signed distance in pixels
+
+        inside_fill = r <= 1.0;
+        inside_stroke = abs(d) <= h;
+    } else{ // rectangle
+        float dx = (abs(v_local.x) - 1.0) / length(v_grad_x);
+        float dy = (abs(v_local.y) - 1.0) / length(v_grad_y);
+
+        inside_fill = dx <= 0.0 && dy <= 0.0;
+        inside_stroke = (abs(dx) <= h && dy <= 0.0) || (abs(dy) <= h && dx <= 0.0);
+
+        // Every edge is a separate segment, the corners are filled
+        // by the stroke caps.
+        if(!inside_stroke && dx <= h && dy <= h){
+            if(v_cap_type == 0.0){ // PROJECT
+                inside_stroke = true;
+            } else if(v_cap_type == 2.0){ // ROUND
+                inside_stroke = dx * dx + dy * dy <= h * h;
+            }
+        }
+    }
+
+    // Composite the stroke over the fill, as if they were drawn one
+    // after the other.
+    float fill_alpha = inside_fill ? v_fill_color.a : 0.0;
+    float stroke_alpha = inside_stroke ? v_stroke_color.a : 0.0;
+    float alpha = stroke_alpha + fill_alpha * (1.0 - stroke_alpha);
+    if(alpha <= 0.0){
+        discard;
+    }
+
+    vec3 color = stroke_alpha * v_stroke_color.rgb
+        + (1.0 - stroke_alpha) * fill_alpha * v_fill_color.rgb;
+    gl_FragColor = vec4(color / alpha, alpha);
+}
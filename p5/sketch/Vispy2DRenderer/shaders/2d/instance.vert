@@ -0,0 +1,50 @@
+// Ellipses and rectangles are drawn as a quad covering the shape. The
+// quad is given in the local coordinates of a unit shape, every vertex
+// carries the attributes of its instance.
+attribute vec2 corner;
+attribute vec4 basis;  // columns of the local to screen transform
+attribute vec2 origin; // screen position of the center of the shape
+attribute vec4 fill_color;
+attribute vec4 stroke_color;
+attribute float half_width; // half the stroke weight, 0 without stroke
+attribute float kind;       // 0: ellipse, 1: rectangle
+attribute float cap_type;
+
+uniform mat4 modelview;
+uniform mat4 projection;
+
+varying vec2 v_local;
+varying vec2 v_grad_x; // screen space gradients of the local coordinates
+varying vec2 v_grad_y;
+varying vec4 v_fill_color;
+varying vec4 v_stroke_color;
+varying float v_half_width;
+varying float v_kind;
+varying float v_cap_type;
+
+void main()
+{
+    mat2 m = mat2(basis.xy, basis.zw);
+    float det = m[0][0] * m[1][1] - m[1][0] * m[0][1];
+    mat2 inv = mat2(m[1][1], -m[0][1], -m[1][0], m[0][0]) / det;
+
+    v_grad_x = vec2(inv[0][0], inv[1][0]);
+    v_grad_y = vec2(inv[0][1], inv[1][1]);
+
+    // Grow the quad so that it also covers the outer half of the stroke
+    vec2 margin = (half_width + 1.0) * vec2(length(v_grad_x), length(v_grad_y));
+    v_local = corner * (1.0 + margin);
+
+    // Pixel centers often lie exactly on the edges of shapes drawn at
+    // integer coordinates. Nudging the shape makes the distance tests
+    // in the fragment shader pick the same pixels as the rasterizer
+    // picks for the triangles of other shapes.
+    vec2 position = origin + vec2(-1.0, 1.0) / 256.0 + m * v_local;
+    gl_Position = projection * modelview * vec4(position, 0.0, 1.0);
+
+    v_fill_color = fill_color;
+    v_stroke_color = stroke_color;
+    v_half_width = half_width;
+    v_kind = kind;
+    v_cap_type = cap_type;
+}
@@ -10,6 +10,7 @@ attribute float side;
 attribute float join_type;
 attribute float cap_type;
 
+uniform mat4 transform; // model transform of the line vertices
 uniform mat4 modelview;
 uniform mat4 projection;
 
@@ -26,8 +27,18 @@ varying vec3 v_tangentPrev;
 
 varying vec3 v_pos;
 
+vec3 apply_transform(vec3 p)
+{
+    vec4 q = transform * vec4(p, 1.0);
+    return q.xyz / q.w;
+}
+
 void main()
-{   
+{
+    vec3 world_pos = apply_transform(pos);
+    vec3 world_prev = apply_transform(posPrev);
+    vec3 world_curr = apply_transform(posCurr);
+    vec3 world_next = apply_transform(posNext);
 
     float width = 1.0;
 
@@ -40,8 +51,8 @@ void main()
         width = linewidth;
     }
 
-    vec3 tangentPrev = posPrev - posCurr;
-    vec3 tangentNext = posNext - posCurr;
+    vec3 tangentPrev = world_prev - world_curr;
+    vec3 tangentNext = world_next - world_curr;
     vec3 lineTangent;
     vec3 outsideTangent;
 
@@ -120,22 +131,22 @@ void main()
         v_cap = -1.0;
     }
 
-    gl_Position = projection * modelview * vec4(posCurr + offset + marker*width*perpendicular/2/factor, 1.0);
+    gl_Position = projection * modelview * vec4(world_curr + offset + marker*width*perpendicular/2/factor, 1.0);
     frag_color = color;
 
     //Set vertex shader variables
     v_linewidth = width;
     v_cap_type = cap_type;
     v_join_type = join_type;
-    v_pos = pos;
+    v_pos = world_pos;
 
     if(side > 0.0){ // left side
-        v_tangentNext = posNext - posCurr;
-        v_tangentPrev = posPrev - posCurr;
+        v_tangentNext = world_next - world_curr;
+        v_tangentPrev = world_prev - world_curr;
         v_length = length(v_tangentNext);
     } else{ // right side
-        v_tangentNext = posCurr - posPrev;
-        v_tangentPrev = posCurr - posNext;
+        v_tangentNext = world_curr - world_prev;
+        v_tangentPrev = world_curr - world_next;
         v_length = length(v_tangentNext);
     }    
 }
@@ -1,9 +1,14 @@
-uniform vec4 fill_color;
 uniform sampler2D texture;
+// Whether the colors of the texture are premultiplied by their alpha
+uniform bool premultiplied;
 
 varying vec4 vertex_texcoord;
+varying vec4 frag_color;
 
 void main()
 {
-    gl_FragColor = texture2D(texture, vertex_texcoord.st) * fill_color;
+    vec4 color = texture2D(texture, vertex_texcoord.st);
+    if (premultiplied && color.a > 0.0)
+        color.rgb /= color.a;
+    gl_FragColor = color * frag_color;
 }
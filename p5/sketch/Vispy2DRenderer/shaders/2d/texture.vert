@@ -1,14 +1,19 @@
-attribute vec2 position;
+// Sprites drawn by image(). The positions are already transformed and
+// the tint is a vertex attribute, so that sprites drawn with different
+// transforms and tints share a draw call.
+attribute vec3 position;
 attribute vec2 texcoord;
+attribute vec4 color;
 
-uniform mat4 transform;
 uniform mat4 modelview;
 uniform mat4 projection;
 
 varying vec4 vertex_texcoord;
+varying vec4 frag_color;
 
 void main()
 {
-    gl_Position = projection * modelview * transform * vec4(position, 0.0, 1.0);
+    gl_Position = projection * modelview * vec4(position, 1.0);
     vertex_texcoord = vec4(texcoord, 1.0, 1.0);
+    frag_color = color;
 }
@@ -39,3 +39,11 @@ src_line = ShaderSource(
     read_shader("Vispy2DRenderer/shaders/2d/stroke.vert"),
     read_shader("Vispy2DRenderer/shaders/2d/stroke.frag"),
 )
+src_instance = ShaderSource(
+    read_shader("Vispy2DRenderer/shaders/2d/instance.vert"),
+    read_shader("Vispy2DRenderer/shaders/2d/instance.frag"),
+)
+src_glyph = ShaderSource(
+    read_shader("Vispy2DRenderer/shaders/2d/glyph.vert"),
+    read_shader("Vispy2DRenderer/shaders/2d/glyph.frag"),
+)
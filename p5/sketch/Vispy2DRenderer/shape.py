@@ -20,6 +20,7 @@
 
 import contextlib
 import functools
+from collections import OrderedDict
 
 import numpy as np
 import math
@@ -28,7 +29,7 @@ from p5.core.color import Color
 from p5.core.constants import SType
 from p5.pmath import matrix
 from p5.pmath.vector import Point
-from p5.pmath.utils import SINCOS
+from p5.pmath.utils import PRE_COS, PRE_SIN, SINCOS
 from p5.core import p5
 
 __all__ = ["PShape"]
@@ -107,6 +108,9 @@ class PShape:
         vertices=tuple(),
         shape_type=SType.TESS,
     ):
+        # render primitives of the shape, cached until it is edited
+        self._render_cache = {}
+
         # basic properties of the shape
         self._fill = None
         self._stroke = None
@@ -153,6 +157,38 @@ class PShape:
             self._stroke = color
         elif name == "fill":
             self._fill = color
+        self._invalidate()
+
+    def _invalidate(self):
+        """Mark the cached render primitives of the shape as stale."""
+        self._render_cache.clear()
+
+    @property
+    def vertices(self):
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, new_vertices):
+        self._vertices = new_vertices
+        self._invalidate()
+
+    @property
+    def contours(self):
+        return self._contours
+
+    @contours.setter
+    def contours(self, new_contours):
+        self._contours = new_contours
+        self._invalidate()
+
+    @property
+    def shape_type(self):
+        return self._shape_type
+
+    @shape_type.setter
+    def shape_type(self, new_type):
+        self._shape_type = new_type
+        self._invalidate()
 
     @property
     def fill(self):
@@ -180,6 +216,7 @@ class PShape:
             self._stroke_weight = p5.renderer.style.stroke_weight
         else:
             self._stroke_weight = stroke
+        self._invalidate()
 
     @property
     def stroke_join(self):
@@ -191,6 +228,7 @@ class PShape:
             self._stroke_join = p5.renderer.style.stroke_join
         else:
             self._stroke_join = stroke
+        self._invalidate()
 
     @property
     def stroke_cap(self):
@@ -202,6 +240,7 @@ class PShape:
             self._stroke_cap = p5.renderer.style.stroke_cap
         else:
             self._stroke_cap = stroke
+        self._invalidate()
 
     @contextlib.contextmanager
     def edit(self, reset=True):
@@ -223,8 +262,10 @@ class PShape:
             self.vertices = []
             self.contours = []
         self._in_edit_mode = True
+        self._invalidate()
         yield
         self._in_edit_mode = False
+        self._invalidate()
 
     @_ensure_editable
     def add_vertex(self, vertex):
@@ -234,6 +275,7 @@ class PShape:
         :type vertex: tuple | list | p5.Vector | np.ndarray
         """
         self.vertices.append(Point(*vertex))
+        self._invalidate()
 
     @_ensure_editable
     def update_vertex(self, idx, vertex):
@@ -246,6 +288,7 @@ class PShape:
         :type vertex: tuple | list | p5.Vector | np.ndarray
         """
         self.vertices[idx] = Point(*vertex)
+        self._invalidate()
 
     def add_child(self, child):
         """Add a child shape to the current shape
@@ -453,6 +496,87 @@ MIN_POINT_ACCURACY = 20
 MAX_POINT_ACCURACY = 200
 POINT_ACCURACY_FACTOR = 10
 
+# Maximum number of unit arcs kept in the arc cache
+ARC_CACHE_SIZE = 512
+
+_UNIT_CIRCLE = np.column_stack((PRE_COS, PRE_SIN, np.zeros(len(PRE_SIN))))
+
+
+class ArcCache:
+    """A least recently used cache of arcs on the unit circle.
+
+    Every arc with the same point accuracy, start and stop angles and
+    mode has the same vertices up to a scale and an offset, so an
+    ellipse drawn every frame only needs to scale a cached array.
+
+    :param max_size: maximum number of arcs kept in the cache
+    :type max_size: int
+    """
+
+    def __init__(self, max_size=ARC_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._arcs = OrderedDict()
+
+    def __len__(self):
+        return len(self._arcs)
+
+    def get(self, acc, start_index, end_index, mode):
+        """Vertices of an arc of the unit circle.
+
+        :param acc: point accuracy, i.e. number of subdivisions of the
+            whole circle
+        :type acc: int
+
+        :param start_index: index of the start angle in SINCOS
+        :type start_index: int
+
+        :param end_index: index of the stop angle in SINCOS
+        :type end_index: int
+
+        :param mode: arc mode, one of {None, "OPEN", "CHORD", "PIE"}
+        :type mode: str | None
+
+        :returns: read-only (n, 3) array of vertices
+        :rtype: np.ndarray
+        """
+        key = (acc, start_index, end_index, mode)
+        vertices = self._arcs.get(key)
+        if vertices is not None:
+            self.hits += 1
+            self._arcs.move_to_end(key)
+            return vertices
+
+        self.misses += 1
+        vertices = self._build(acc, start_index, end_index, mode)
+        vertices.flags.writeable = False
+        self._arcs[key] = vertices
+        if len(self._arcs) > self.max_size:
+            self._arcs.popitem(last=False)
+        return vertices
+
+    def clear(self):
+        """Remove all arcs and reset the counters."""
+        self._arcs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _build(acc, start_index, end_index, mode):
+        sclen = len(SINCOS)
+        inc = int(sclen / acc)
+        indices = np.append(np.arange(start_index, end_index, inc), end_index) % sclen
+        parts = [_UNIT_CIRCLE[indices]]
+        if mode in ["PIE", None]:
+            parts.insert(0, np.zeros((1, 3)))
+        if mode in ["CHORD", "PIE"]:
+            parts.append(parts[0][:1])
+        return np.concatenate(parts)
+
+
+arc_cache = ArcCache()
+
 
 class Arc(PShape):
     def __init__(
@@ -506,23 +630,10 @@ class Arc(PShape):
         ) / POINT_ACCURACY_FACTOR
 
         acc = min(MAX_POINT_ACCURACY, max(MIN_POINT_ACCURACY, int(size_acc)))
-        inc = int(len(SINCOS) / acc)
 
         sclen = len(SINCOS)
         start_index = int((self._start_angle / (math.pi * 2)) * sclen)
         end_index = int((self._stop_angle / (math.pi * 2)) * sclen)
 
-        vertices = [(c1x, c1y, 0)] if self.arc_mode in ["PIE", None] else []
-        for idx in range(start_index, end_index, inc):
-            i = idx % sclen
-            vertices.append((c1x + rx * SINCOS[i][1], c1y + ry * SINCOS[i][0], 0))
-        vertices.append(
-            (
-                c1x + rx * SINCOS[end_index % sclen][1],
-                c1y + ry * SINCOS[end_index % sclen][0],
-                0,
-            )
-        )
-        if self.arc_mode == "CHORD" or self.arc_mode == "PIE":
-            vertices.append(vertices[0])
-        self.vertices = vertices
+        unit = arc_cache.get(acc, start_index, end_index, self.arc_mode)
+        self.vertices = unit * (rx, ry, 0) + (c1x, c1y, 0)
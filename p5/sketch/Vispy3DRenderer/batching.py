@@ -0,0 +1,123 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Group the entries of the 3D draw queue by primitive type and material.
+
+The depth test decides which of two opaque shapes is in front, whatever
+order they are drawn in, so opaque entries can join any earlier group
+drawn with the same program and uniforms. Translucent entries are
+blended with what was drawn before them and keep their place in the
+queue: no entry is moved back over them.
+
+Entries whose model transform is applied by the shaders only share a
+group with entries of the same transform.
+"""
+
+import numpy as np
+
+from p5.core.material import BasicMaterial, BlinnPhongMaterial, NormalMaterial
+
+
+def material_key(material):
+    """Key of the program and uniforms drawing a material.
+
+    :param material: material of a draw queue entry
+    :type material: None | BasicMaterial | NormalMaterial | BlinnPhongMaterial
+
+    :returns: None for materials drawn by the default program, which
+        only uses the colors of the vertices, otherwise a hashable key
+        that is equal for materials drawn alike.
+    :rtype: None | tuple
+    """
+    if material is None or isinstance(material, BasicMaterial):
+        return None
+    if isinstance(material, NormalMaterial):
+        return ("normal",)
+    if isinstance(material, BlinnPhongMaterial):
+        return (
+            "phong",
+            np.asarray(material.ambient, dtype=np.float32).tobytes(),
+            np.asarray(material.diffuse, dtype=np.float32).tobytes(),
+            np.asarray(material.specular, dtype=np.float32).tobytes(),
+            float(material.shininess),
+        )
+    raise NotImplementedError("Material not implemented")
+
+
+def is_translucent(draw_type, color, material):
+    """Whether an entry drawn with `color` is blended with the shapes
+    behind it"""
+    if material_key(material) is not None and draw_type not in ("points", "lines"):
+        # The lit programs ignore the colors and draw opaque shapes
+        return False
+    return bool(np.any(np.asarray(color, dtype=np.float64)[..., 3] < 1))
+
+
+class MaterialGroup:
+    """Draw queue entries that are drawn together with one draw call.
+
+    :param draw_type: primitive type of the entries
+    :type draw_type: str
+
+    :param material: material of the first entry, None for entries
+        drawn by the default program
+
+    :param transform: model transform the shaders apply to the
+        vertices, None when they are transformed on the CPU
+    :type transform: None | np.ndarray
+    """
+
+    def __init__(self, draw_type, material, transform=None):
+        self.draw_type = draw_type
+        self.material = material
+        self.transform = transform
+        self.entries = []
+
+
+def group_draw_queue(draw_queue):
+    """Group a 3D draw queue into as few draw calls as possible.
+
+    :param draw_queue: list of ``(stype, (vertices, idx, color, normals,
+        material), transform)`` entries
+    :type draw_queue: list
+
+    :returns: groups in the order they have to be drawn
+    :rtype: list[MaterialGroup]
+    """
+    groups = []
+    # Groups that opaque entries may still join
+    open_groups = {}
+    for draw_type, entry, transform in draw_queue:
+        _, _, color, _, material = entry
+        if draw_type in ("points", "lines"):
+            material = None
+        key = (
+            draw_type,
+            material_key(material),
+            None if transform is None else transform.tobytes(),
+        )
+        translucent = is_translucent(draw_type, color, material)
+
+        group = open_groups.get(key)
+        if group is None or (translucent and group is not groups[-1]):
+            group = MaterialGroup(draw_type, material, transform)
+            groups.append(group)
+            open_groups[key] = group
+        if translucent:
+            open_groups = {key: group}
+        group.entries.append(entry)
+    return groups
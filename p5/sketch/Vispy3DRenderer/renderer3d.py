@@ -16,7 +16,6 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from numpy.linalg import inv
 from dataclasses import dataclass
 from sys import stderr
 import numpy as np
@@ -32,6 +31,13 @@ from contextlib import contextmanager
 from p5.core.constants import Z_EPSILON
 from p5.core.geometry import Geometry
 from ..Vispy2DRenderer.shape import PShape
+from ..Vispy2DRenderer.bulk import (
+    circle_polygons,
+    fan_indices,
+    outline_indices,
+    rect_polygons,
+    vertex_colors,
+)
 from ..Vispy2DRenderer.openglrenderer import Style2D
 
 from p5.pmath.matrix import translation_matrix
@@ -42,6 +48,7 @@ from ..Vispy2DRenderer.openglrenderer import (
     to_3x3,
     COLOR_WHITE,
 )
+from .batching import group_draw_queue, material_key
 from .shaders3d import src_default, src_fbuffer, src_normal, src_phong
 from p5.core.material import BasicMaterial, NormalMaterial, BlinnPhongMaterial
 
@@ -124,6 +131,15 @@ class Renderer3D(OpenGLRenderer):
             self.curr_constant_falloff,
         ) = (0.0, 0.0, 0.0)
         self.light_specular = np.array([0.0] * 3)
+        # Apply the model transforms in the vertex shaders instead of
+        # transforming every vertex on the CPU.
+        self.gpu_transforms = False
+        # Normal matrices of the transforms used in the current frame
+        self._normal_matrices = {}
+        for prog in [self.default_prog, self.normal_prog, self.phong_prog]:
+            prog["model"] = np.identity(4).flatten()
+        for prog in [self.normal_prog, self.phong_prog]:
+            prog["normal_matrix"] = np.identity(3).flatten()
 
     def reset_view(self):
         self.viewport = (
@@ -160,6 +176,8 @@ class Renderer3D(OpenGLRenderer):
 
     def clear(self, color=True, depth=True):
         """Clear the renderer background."""
+        if color:
+            self._cancel_frame_copy()
         gloo.set_state(  # pylint: disable=no-member
             clear_color=self.style.background_color
         )
@@ -213,13 +231,13 @@ class Renderer3D(OpenGLRenderer):
 
         self.transform_matrix = np.identity(4)
         self._update_shader_transforms()
+        self.draw_calls = 0
         self.fbuffer.color_buffer = self.fbuffer_tex_back
 
         with self.fbuffer:
             gloo.set_viewport(*self.texture_viewport)  # pylint: disable=no-member
             self._comm_toggles()
-            self.fbuffer_prog["texture"] = self.fbuffer_tex_front
-            self.fbuffer_prog.draw("triangle_strip")
+            self._start_frame_copy()
             self.clear(color=False, depth=True)
             self.clear_lights()
 
@@ -227,6 +245,7 @@ class Renderer3D(OpenGLRenderer):
 
             self.flush_geometry()
             self.transform_matrix = np.identity(4)
+            self.frame_draw_calls = self.draw_calls
 
         gloo.set_viewport(*self.viewport)  # pylint: disable=no-member
         self._comm_toggles(False)
@@ -239,29 +258,59 @@ class Renderer3D(OpenGLRenderer):
             self.fbuffer_tex_front,
         )
 
-    def _add_to_draw_queue_simple(self, stype, vertices, idx, color):
-        """Adds shape of stype to draw queue"""
-        self.draw_queue.append((stype, (vertices, idx, color, None, None)))
+    def _queue_mesh(
+        self, stype, vertices, idx, color, normals=None, material=None, transform=None
+    ):
+        """Adds a mesh to the draw queue. Meshes drawn by the default
+        program are written to the arenas of the draw queue, lit meshes
+        keep their own vertices and normals. `transform` is the model
+        transform the shaders apply to the vertices, or None."""
+        if stype in ["points", "lines"] or material is None or isinstance(
+            material, BasicMaterial
+        ):
+            stype, entry = self.draw_queue.add_mesh(stype, vertices, idx, color)
+            self.draw_queue.append((stype, (*entry, normals, material), transform))
+        else:
+            self.draw_queue.append(
+                (stype, (vertices, idx, color, normals, material), transform)
+            )
+
+    def _normal_matrix(self, transform):
+        """The inverse transpose of the upper 3x3 part of `transform`,
+        which transforms normals. It is computed once per distinct
+        transform in a frame."""
+        key = transform.tobytes()
+        normal_matrix = self._normal_matrices.get(key)
+        if normal_matrix is None:
+            normal_matrix = np.linalg.inv(to_3x3(transform)).T
+            self._normal_matrices[key] = normal_matrix
+        return normal_matrix
 
     def tnormals(self, shape):
         """Obtain a list of vertex normals in world coordinates"""
         if isinstance(shape.material, BasicMaterial):  # Basic shader doesn't need this
             return None
-        return shape.vertex_normals @ np.linalg.inv(
-            to_3x3(self.transform_matrix) @ to_3x3(shape.matrix)
-        )
+        return shape.vertex_normals @ self._normal_matrix(
+            self.transform_matrix @ shape.matrix
+        ).T
 
     def render(self, shape):
         if isinstance(shape, Geometry):
-            n = len(shape.vertices)
-            # Perform model transform
-            # TODO: Investigate moving model transform from CPU to the GPU
-            tverts = self._transform_vertices(
-                np.hstack([shape.vertices, np.ones((n, 1))]),
-                shape.matrix,
-                self.transform_matrix,
-            )
-            tnormals = self.tnormals(shape)
+            transform = None
+            if self.gpu_transforms:
+                transform = self.transform_matrix.dot(shape.matrix)
+                tverts = shape.vertices
+                tnormals = None
+                if not isinstance(shape.material, BasicMaterial):
+                    tnormals = shape.vertex_normals
+            else:
+                n = len(shape.vertices)
+                tverts = self._transform_vertices(
+                    np.hstack([shape.vertices, np.ones((n, 1))]),
+                    shape.matrix,
+                    self.transform_matrix,
+                )
+                tnormals = self.tnormals(shape)
 
             edges = shape.edges
             faces = shape.faces
@@ -275,24 +324,34 @@ class Renderer3D(OpenGLRenderer):
                 self.style.stroke_color,
                 tnormals,
                 self.style.material,
+                transform,
             )
 
         elif isinstance(shape, PShape):
             fill = shape.fill.normalized if shape.fill else None
             stroke = shape.stroke.normalized if shape.stroke else None
 
+            transform = None
+            if self.gpu_transforms:
+                transform = self.transform_matrix.dot(shape._matrix)
+
             obj_list = get_render_primitives(shape)
             for obj in obj_list:
                 stype, vertices, idx = obj
-                # Transform vertices
-                vertices = self._transform_vertices(
-                    np.hstack([vertices, np.ones((len(vertices), 1))]),
-                    shape._matrix,
-                    self.transform_matrix,
-                )
+                # Transform vertices, unless the shaders do it
+                if transform is None:
+                    vertices = self._transform_vertices(
+                        np.hstack([vertices, np.ones((len(vertices), 1))]),
+                        shape._matrix,
+                        self.transform_matrix,
+                    )
                 # Add to draw queue
-                self._add_to_draw_queue_simple(
-                    stype, vertices, idx, stroke if stype == "lines" else fill
+                self._queue_mesh(
+                    stype,
+                    vertices,
+                    idx,
+                    stroke if stype == "lines" else fill,
+                    transform=transform,
                 )
 
     def add_to_draw_queue(
@@ -305,6 +364,7 @@ class Renderer3D(OpenGLRenderer):
         stroke=None,
         normals=None,
         material=None,
+        transform=None,
     ):
         """Add the given vertex data to the draw queue.
 
@@ -333,6 +393,11 @@ class Renderer3D(OpenGLRenderer):
                 tuple. When set to `None` the shape doesn't get stroke
                 (default: None)
         :type stroke: None | tuple
+
+        :param transform: model transform applied to the vertices and
+                normals by the shaders, or None when they are already
+                transformed (default: None)
+        :type transform: None | np.ndarray
         // TODO: Update documentation
         // TODO: Unite style-related attributes for both 2D and 3D under one material class
         """
@@ -341,66 +406,87 @@ class Renderer3D(OpenGLRenderer):
         stroke_shape = self.style.stroke_enabled and not (stroke is None)
 
         if fill_shape and stype not in ["point", "path"]:
-            idx = np.array(faces, dtype=np.uint32).ravel()
-            self.draw_queue.append(
-                ["triangles", (vertices, idx, fill, normals, material)]
+            idx = np.asarray(faces, dtype=np.uint32).ravel()
+            self._queue_mesh(
+                "triangles", vertices, idx, fill, normals, material, transform
             )
 
         if stroke_shape:
             if stype == "point":
                 idx = np.arange(0, len(vertices), dtype=np.uint32)
-                self.draw_queue.append(
-                    ["points", (vertices, idx, stroke, normals, material)]
+                self._queue_mesh(
+                    "points", vertices, idx, stroke, normals, material, transform
                 )
             else:
-                idx = np.array(edges, dtype=np.uint32).ravel()
-                self.draw_queue.append(
-                    ["lines", (vertices, idx, stroke, normals, material)]
+                idx = np.asarray(edges, dtype=np.uint32).ravel()
+                self._queue_mesh(
+                    "lines", vertices, idx, stroke, normals, material, transform
                 )
 
-    def render_with_shaders(self, draw_type, draw_obj):
-        vertices, idx, color, normals, material = draw_obj
-        """Like render_default but is aware of shaders other than the basic one"""
-        # 0. If material does not need normals nor extra info, strip them out
-        # and use the method from superclass
-        if (
-            material is None
-            or isinstance(material, BasicMaterial)
-            or draw_type in ["points", "lines"]
-        ):
-            OpenGLRenderer.render_default(self, draw_type, [draw_obj[:3]])
-            return
+    def render_with_shaders(self, draw_type, material, draw_queue, transform=None):
+        """Like render_default but is aware of shaders other than the basic one.
 
-        # 1. Get the number of vertices
-        num_vertices = len(vertices)
+        The vertices, normals and indices of all the entries are
+        merged, uploaded and drawn with one draw call.
 
-        # 2. Create empty buffers based on the number of vertices.
-        #
-        data = np.zeros(
-            num_vertices, dtype=[("position", np.float32, 3), ("normal", np.float32, 3)]
-        )
+        :param draw_type: primitive type of the entries
+        :type draw_type: str
+
+        :param material: material of the entries
+        :type material: None | BasicMaterial | NormalMaterial | BlinnPhongMaterial
+
+        :param draw_queue: list of (vertices, idx, color, normals,
+            material) entries, which all have the same material key
+        :type draw_queue: list
+
+        :param transform: model transform the shaders apply to the
+            vertices of the entries, None when they are already
+            transformed
+        :type transform: None | np.ndarray
+        """
+        model = np.identity(4) if transform is None else transform
+        # If the material does not need normals nor extra info, strip
+        # them out and use the method from superclass
+        if material_key(material) is None or draw_type in ["points", "lines"]:
+            self.default_prog["model"] = model.T.flatten()
+            OpenGLRenderer.render_default(
+                self, draw_type, [entry[:3] for entry in draw_queue]
+            )
+            return
 
-        # 3. Loop through all the shapes in the geometry queue adding
-        # it's information to the buffer.
-        #
-        draw_indices = []
-        data["position"][0:num_vertices,] = np.array(vertices)
-        draw_indices.append(idx)
-        data["normal"][0:num_vertices,] = np.array(normals)
+        sizes = [len(vertices) for vertices, *_ in draw_queue]
+        data = np.empty(
+            sum(sizes), dtype=[("position", np.float32, 3), ("normal", np.float32, 3)]
+        )
+        data["position"] = np.concatenate(
+            [np.asarray(vertices)[:, :3] for vertices, *_ in draw_queue]
+        )
+        data["normal"] = np.concatenate([normals for _, _, _, normals, _ in draw_queue])
+        offsets = np.cumsum([0] + sizes[:-1])
+        indices = np.concatenate(
+            [
+                np.asarray(idx, dtype=np.uint32).ravel() + np.uint32(offset)
+                for (_, idx, *_), offset in zip(draw_queue, offsets)
+            ]
+        )
+        if len(indices) == 0:
+            return
         self.vertex_buffer.set_data(data)
-        self.index_buffer.set_data(np.hstack(draw_indices))
+        self.index_buffer.set_data(indices)
+        normal_matrix = (
+            np.identity(3) if transform is None else self._normal_matrix(transform)
+        )
 
         if isinstance(material, NormalMaterial):
-            # 4. Bind the buffer to the shader.
-            #
+            self.normal_prog["model"] = model.T.flatten()
+            self.normal_prog["normal_matrix"] = normal_matrix.T.flatten()
             self.normal_prog.bind(self.vertex_buffer)
-
-            # 5. Draw the shape using the proper shape type and get rid of
-            # the buffers.
-            #
             self.normal_prog.draw(draw_type, indices=self.index_buffer)
+            self.draw_calls += 1
         elif isinstance(material, BlinnPhongMaterial):
             self.phong_prog.bind(self.vertex_buffer)
+            self.phong_prog["model"] = model.T.flatten()
+            self.phong_prog["normal_matrix"] = normal_matrix.T.flatten()
             self.phong_prog["u_cam_pos"] = self.camera_pos
             # Material attributes
             self.phong_prog["u_ambient_color"] = material.ambient
@@ -432,35 +518,31 @@ class Renderer3D(OpenGLRenderer):
             self.phong_prog["u_quadratic_falloff"] = self.quadratic_falloff.data
             # Draw
             self.phong_prog.draw(draw_type, indices=self.index_buffer)
+            self.draw_calls += 1
         else:
             raise NotImplementedError("Material not implemented")
 
     def flush_geometry(self):
-        """Flush all the shape geometry from the draw queue to the GPU."""
-        for index, shape in enumerate(self.draw_queue):
-            current_shape, current_obj = (
-                self.draw_queue[index][0],
-                self.draw_queue[index][1],
-            )
-            # If current_shape is lines, bring it to the front by epsilon
-            # to resolve z-fighting
-            if current_shape == "lines":
-                # line_transform is used whenever we render lines to break ties in depth
-                # We transform the points to camera space, move them by
-                # Z_EPSILON, and them move them back to world space
-                line_transform = inv(self.lookat_matrix).dot(
-                    translation_matrix(0, 0, Z_EPSILON).dot(self.lookat_matrix)
-                )
-                vertices = current_obj[0]
-                current_obj = (
-                    np.hstack([vertices, np.ones((vertices.shape[0], 1))]).dot(
-                        line_transform.T
-                    )[:, :3],
-                    *current_obj[1:],
-                )
-            self.render_with_shaders(current_shape, current_obj)
+        """Flush all the shape geometry from the draw queue to the GPU.
+
+        Entries are grouped by primitive type and material, and every
+        group is drawn with one draw call.
+        """
+        self._copy_previous_frame()
+        # Lines are brought to the front by Z_EPSILON in camera space to
+        # resolve z-fighting
+        line_matrix = translation_matrix(0, 0, Z_EPSILON).dot(self.lookat_matrix)
+        for group in group_draw_queue(self.draw_queue):
+            args = (group.draw_type, group.material, group.entries, group.transform)
+            if group.draw_type == "lines":
+                self.default_prog["perspective_matrix"] = line_matrix.T.flatten()
+                self.render_with_shaders(*args)
+                self.default_prog["perspective_matrix"] = self.lookat_matrix.T.flatten()
+            else:
+                self.render_with_shaders(*args)
 
-        self.draw_queue = []
+        self.draw_queue.clear()
+        self._normal_matrices.clear()
 
     def cleanup(self):
         super(Renderer3D, self).cleanup()
@@ -535,6 +617,144 @@ class Renderer3D(OpenGLRenderer):
     def frustum(self):
         raise NotImplementedError
 
+    def _bulk_vertices(self, vertices):
+        """Apply the current transform to the vertices of a bulk call"""
+        return self._transform_vertices(
+            np.hstack([vertices, np.ones((len(vertices), 1))]),
+            np.identity(4),
+            self.transform_matrix,
+        )
+
+    def _add_polygons(self, polygons, fill, stroke):
+        """Queue convex polygons with the same number of corners as one
+        triangle and one line entry.
+
+        :param polygons: (N, k, 3) array of the corners of the polygons
+        :type polygons: np.ndarray
+
+        :param fill: fill color of every polygon as an (N, 4) array,
+            one color for all of them, or None
+        :param stroke: stroke color, like `fill`
+        """
+        n_polygons, n_corners = polygons.shape[:2]
+        vertices = self._bulk_vertices(polygons.reshape(-1, 3))
+
+        if fill is not None:
+            material = self.style.material
+            normals = None
+            if not isinstance(material, BasicMaterial):
+                # Every polygon is flat, so all its vertices share the
+                # normal of its first triangle
+                corners = vertices.reshape(n_polygons, n_corners, 3)
+                normals = np.cross(
+                    corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+                )
+                lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+                normals = np.divide(
+                    normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+                )
+                normals = np.repeat(normals, n_corners, axis=0)
+            idx = fan_indices(n_polygons, n_corners)
+            colors = vertex_colors(fill, n_corners)
+            self._queue_mesh("triangles", vertices, idx, colors, normals, material)
+
+        if stroke is not None:
+            idx = outline_indices(n_polygons, n_corners).ravel()
+            colors = vertex_colors(stroke, n_corners)
+            self._queue_mesh("lines", vertices, idx, colors)
+
+    def _bulk_fill(self, colors):
+        """Fill color of the shapes drawn by the bulk functions, or None"""
+        if colors is not None:
+            return colors
+        return self.style.fill_color if self.style.fill_enabled else None
+
+    def _bulk_stroke(self, colors=None):
+        """Stroke color of the shapes drawn by the bulk functions, or None"""
+        if colors is not None:
+            return colors
+        return self.style.stroke_color if self.style.stroke_enabled else None
+
+    def points(self, vertices, colors=None):
+        """Draw points with the stroke color.
+
+        :param vertices: (N, 3) array of the points
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            stroke color of every point
+        :type colors: np.ndarray | None
+        """
+        stroke = self._bulk_stroke(colors)
+        if stroke is None or len(vertices) == 0:
+            return
+        idx = np.arange(len(vertices), dtype=np.uint32)
+        self._queue_mesh("points", self._bulk_vertices(vertices), idx, stroke)
+
+    def lines(self, vertices, colors=None):
+        """Draw line segments with the stroke color.
+
+        :param vertices: (N, 2, 3) array of the end points of the lines
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            stroke color of every line
+        :type colors: np.ndarray | None
+        """
+        stroke = self._bulk_stroke(colors)
+        if stroke is None or len(vertices) == 0:
+            return
+        idx = np.arange(2 * len(vertices), dtype=np.uint32)
+        vertices = self._bulk_vertices(vertices.reshape(-1, 3))
+        self._queue_mesh("lines", vertices, idx, vertex_colors(stroke, 2))
+
+    def rects(self, xywh, colors=None):
+        """Draw rectangles in the z = 0 plane.
+
+        :param xywh: (N, 4) array of the top-left corner, width and
+            height of the rectangles
+        :type xywh: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every rectangle
+        :type colors: np.ndarray | None
+        """
+        if len(xywh) == 0:
+            return
+        self._add_polygons(
+            rect_polygons(xywh), self._bulk_fill(colors), self._bulk_stroke()
+        )
+
+    def circles(self, xyr, colors=None):
+        """Draw circles in the z = 0 plane.
+
+        :param xyr: (N, 3) array of the center and radius of the circles
+        :type xyr: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every circle
+        :type colors: np.ndarray | None
+        """
+        if len(xyr) == 0:
+            return
+        self._add_polygons(
+            circle_polygons(xyr), self._bulk_fill(colors), self._bulk_stroke()
+        )
+
+    def triangles(self, vertices, colors=None):
+        """Draw triangles.
+
+        :param vertices: (N, 3, 3) array of the corners of the triangles
+        :type vertices: np.ndarray
+
+        :param colors: (N, 4) array of normalized colors, replacing the
+            fill color of every triangle
+        :type colors: np.ndarray | None
+        """
+        if len(vertices) == 0:
+            return
+        self._add_polygons(vertices, self._bulk_fill(colors), self._bulk_stroke())
+
     def shape(self, vertices, contours, shape_type, *args):
         """Render a PShape"""
         self.render(PShape(vertices=vertices, contours=contours, shape_type=shape_type))
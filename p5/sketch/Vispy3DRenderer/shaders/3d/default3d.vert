@@ -5,10 +5,13 @@ varying vec4 frag_color;
 
 uniform mat4 projection;
 uniform mat4 perspective_matrix;
+// Model transform of the vertices, the identity when they are
+// transformed on the CPU
+uniform mat4 model;
 
 void main()
 {
-    gl_Position = projection * perspective_matrix * vec4(position, 1.0);
+    gl_Position = projection * perspective_matrix * model * vec4(position, 1.0);
     frag_color = color;
 }
 
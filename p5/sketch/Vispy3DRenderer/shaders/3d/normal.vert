@@ -6,10 +6,14 @@ varying vec3 v_normal;
 uniform mat4 projection;
 uniform mat4 perspective;
 uniform mat3 normal_transform;
+// Model transform of the vertices and the inverse transpose of its
+// upper 3x3 part, which transforms the normals
+uniform mat4 model;
+uniform mat3 normal_matrix;
 
 void main()
 {
-    mat4 transform = projection * perspective;
+    mat4 transform = projection * perspective * model;
     gl_Position = transform * vec4(position, 1.0);
-    v_normal = normal_transform * normal;
+    v_normal = normal_transform * normal_matrix * normal;
 }
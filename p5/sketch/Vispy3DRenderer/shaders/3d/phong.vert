@@ -6,11 +6,16 @@ varying vec3 v_position;
 
 uniform mat4 projection;
 uniform mat4 perspective;
+// Model transform of the vertices and the inverse transpose of its
+// upper 3x3 part, which transforms the normals
+uniform mat4 model;
+uniform mat3 normal_matrix;
 
 void main()
 {
-    v_normal = normalize(normal);
-    v_position = position;
+    vec4 world = model * vec4(position, 1.0);
+    v_normal = normalize(normal_matrix * normal);
+    v_position = world.xyz / world.w;
     mat4 transform = projection * perspective;
-    gl_Position = transform * vec4(position, 1.0);
+    gl_Position = transform * world;
 }
@@ -1,6 +1,6 @@
 # This file adds compatibility for processing API
 
-from .userspace import no_loop, save_frame
+from .userspace import no_loop, save_frame, stop_recording
 
 
 """Stop draw() from being continuously called.
@@ -37,3 +37,13 @@ on Windows).
 
 """
 saveFrame = save_frame
+
+
+"""Stop the recording started by :meth:`p5.record` and finish
+writing it.
+
+:returns: the number of recorded frames
+:rtype: int
+
+"""
+stopRecording = stop_recording
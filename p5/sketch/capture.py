@@ -0,0 +1,424 @@
+#
+# Part of p5: A Python package based on Processing
+# Copyright (C) 2017-2019 Abhik Pal
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Write the frames saved or recorded by a sketch.
+
+The pixels of a frame have to be read on the thread that renders the
+sketch, but encoding them as PNG or JPEG and writing the file does
+not. Those steps are handed to a small pool of worker threads, so that
+saving every frame does not stall the sketch.
+"""
+
+import atexit
+import os
+import re
+import shutil
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+from PIL import Image
+
+# Number of threads encoding frames. PIL releases the GIL while it
+# compresses an image, so a few threads encode in parallel.
+CAPTURE_WORKERS = min(4, os.cpu_count() or 1)
+# Number of frames that can wait to be written before saving a frame
+# blocks the sketch.
+MAX_PENDING_FRAMES = 8
+
+
+class CaptureQueue:
+    """A bounded queue of frames to be written to image files.
+
+    Frames are encoded and written by a pool of worker threads. When
+    `max_pending` frames are waiting to be written, `save` blocks
+    until one of them is done. This bounds the memory used by the
+    queue when a sketch saves frames faster than they can be written.
+
+    Errors raised while writing a frame are raised again by the next
+    call to `save` or `flush`.
+
+    :param workers: number of worker threads
+    :type workers: int
+
+    :param max_pending: maximum number of frames waiting to be written
+    :type max_pending: int
+    """
+
+    def __init__(self, workers=CAPTURE_WORKERS, max_pending=MAX_PENDING_FRAMES):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._errors = []
+
+    @property
+    def pending(self):
+        """Number of frames that have not been written yet"""
+        with self._lock:
+            return len(self._pending)
+
+    def save(self, pixels, filename):
+        """Queue a frame to be written to `filename`.
+
+        The format of the image is chosen from the extension of the
+        file name, like :meth:`PIL.Image.Image.save` does.
+
+        :param pixels: RGB or RGBA pixels of the frame, as an array of
+            shape (height, width, channels). The array is written
+            later, so it must not be modified afterwards.
+        :type pixels: np.ndarray
+
+        :param filename: path of the image file
+        :type filename: str
+
+        :returns: future that completes once the file is written
+        :rtype: concurrent.futures.Future
+        """
+        self._raise_errors()
+        self._slots.acquire()
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="p5-capture"
+                )
+            future = self._executor.submit(self._write, pixels, filename)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _write(self, pixels, filename):
+        img = Image.fromarray(pixels)
+        extension = os.path.splitext(filename)[1].lower()
+        if img.mode == "RGBA" and extension in (".jpg", ".jpeg"):
+            img = img.convert("RGB")
+        img.save(filename)
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            if not future.cancelled() and future.exception() is not None:
+                self._errors.append(future.exception())
+        self._slots.release()
+
+    def _raise_errors(self):
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def flush(self):
+        """Wait until all the queued frames are written."""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending)
+        self._raise_errors()
+
+    def close(self):
+        """Write the queued frames and stop the worker threads."""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# Queue used by save() and save_frame(). It is flushed when the
+# interpreter exits, so frames saved just before the sketch is closed
+# are not lost.
+capture_queue = CaptureQueue()
+atexit.register(capture_queue.close)
+
+
+def frame_filename(pattern, frame):
+    """The file name of a frame of an image sequence.
+
+    Like in Processing, the last run of "#" characters in `pattern` is
+    replaced by the frame number, padded with zeros to the same
+    width. When `pattern` has no "#", "-####" is added before the
+    extension.
+
+    :param pattern: file name pattern, e.g. ``frames/frame-####.png``
+    :type pattern: str
+
+    :param frame: frame number
+    :type frame: int
+
+    :rtype: str
+    """
+    if "#" not in pattern:
+        root, extension = os.path.splitext(pattern)
+        pattern = root + "-####" + extension
+    head, digits, tail = re.match(r"(.*?)(#+)([^#]*)$", pattern).groups()
+    return "{}{:0{}d}{}".format(head, frame, len(digits), tail)
+
+
+class Recorder(ABC):
+    """Base class of the recorders used by :func:`p5.record`.
+
+    A frame is recorded once per frame number, so the recording
+    follows `frame_count` and not the time it took to draw the frames.
+
+    :param max_frames: stop recording after this many frames, or None
+        to record until the recorder is closed
+    :type max_frames: int | None
+    """
+
+    def __init__(self, max_frames=None):
+        self.max_frames = max_frames
+        self.frames = 0
+        self._last_frame = None
+
+    @property
+    def full(self):
+        """Whether the recorder has recorded `max_frames` frames"""
+        return self.max_frames is not None and self.frames >= self.max_frames
+
+    def capture(self, read_pixels, frame):
+        """Record the frame numbered `frame`, unless it was already
+        recorded.
+
+        :param read_pixels: function returning the pixels of the frame
+            as an array of shape (height, width, channels). It is only
+            called when the frame is recorded.
+        :type read_pixels: function
+
+        :param frame: frame number of the frame
+        :type frame: int
+        """
+        if frame == self._last_frame or self.full:
+            return
+        self._last_frame = frame
+        self.add_frame(read_pixels(), frame)
+        self.frames += 1
+
+    @abstractmethod
+    def add_frame(self, pixels, frame):
+        """Write the pixels of a frame to the recording.
+
+        :param pixels: (height, width, channels) array of the frame
+        :type pixels: np.ndarray
+
+        :param frame: frame number of the frame
+        :type frame: int
+        """
+
+    def close(self):
+        """Finish writing the recording."""
+
+
+class ImageSequenceRecorder(Recorder):
+    """Record frames as numbered image files, written in the
+    background by a :class:`CaptureQueue`.
+
+    :param pattern: file name pattern, see :func:`frame_filename`
+    :type pattern: str
+    """
+
+    def __init__(self, pattern, max_frames=None, queue=None):
+        super().__init__(max_frames)
+        self.pattern = pattern
+        self.queue = capture_queue if queue is None else queue
+
+    def add_frame(self, pixels, frame):
+        self.queue.save(pixels, frame_filename(self.pattern, frame))
+
+    def close(self):
+        self.queue.flush()
+
+
+class RawRecorder(Recorder):
+    """Record uncompressed frames into a single file.
+
+    The file holds the frames one after the other as (height, width,
+    channels) arrays of bytes, the top row first. The shape of the
+    frames is available as `shape` and a recording can be loaded with
+    ``np.fromfile(filename, np.uint8).reshape((-1, *shape))``.
+
+    Frames recorded to ``.rgb`` and ``.rgba`` files are converted to
+    three and four channels, dropping alpha or adding an opaque one, so
+    the file has the layout its name says whatever the renderer reads.
+    ``.raw`` files keep the channels of the frames.
+
+    When `max_frames` is given, the file is allocated up front and
+    memory mapped, and truncated to the recorded frames when the
+    recorder is closed. Otherwise the frames are appended to the file.
+
+    :param filename: path of the file
+    :type filename: str
+    """
+
+    def __init__(self, filename, max_frames=None):
+        super().__init__(max_frames)
+        self.filename = filename
+        extension = os.path.splitext(filename)[1].lower()
+        self.channels = RAW_CHANNELS.get(extension)
+        self.shape = None
+        self._file = None
+        self._frames = None
+
+    def add_frame(self, pixels, frame):
+        pixels = self._convert(pixels)
+        if self.shape is None:
+            self.shape = pixels.shape
+            if self.max_frames is None:
+                self._file = open(self.filename, "wb")
+            else:
+                self._frames = np.memmap(
+                    self.filename,
+                    dtype=np.uint8,
+                    mode="w+",
+                    shape=(self.max_frames, *self.shape),
+                )
+        elif pixels.shape != self.shape:
+            raise ValueError(
+                "Frame size changed from {} to {} while recording".format(
+                    self.shape, pixels.shape
+                )
+            )
+
+        if self._frames is not None:
+            self._frames[self.frames] = pixels
+        else:
+            self._file.write(np.ascontiguousarray(pixels, dtype=np.uint8).data)
+
+    def _convert(self, pixels):
+        """The pixels with the channels of the file"""
+        if pixels.ndim != 3 or pixels.shape[2] not in (3, 4):
+            raise ValueError("Can not record frames of shape {}".format(pixels.shape))
+        if self.channels is None or pixels.shape[2] == self.channels:
+            return pixels
+        if self.channels == 3:
+            return pixels[:, :, :3]
+        alpha = np.full((*pixels.shape[:2], 1), 255, dtype=pixels.dtype)
+        return np.concatenate((pixels, alpha), axis=2)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._frames is not None:
+            self._frames.flush()
+            self._frames = None
+            os.truncate(self.filename, self.frames * int(np.prod(self.shape)))
+
+
+class EncoderRecorder(Recorder):
+    """Record a video by piping the frames to an ffmpeg process.
+
+    The frames are written to the standard input of the encoder as raw
+    video, so the video has exactly one frame per recorded frame,
+    played back at `frame_rate`.
+
+    :param filename: path of the video. The format and codec are
+        chosen by ffmpeg from its extension.
+    :type filename: str
+
+    :param frame_rate: frame rate of the video
+    :type frame_rate: float
+
+    :param encoder: path of the ffmpeg executable
+    :type encoder: str
+
+    :raises RuntimeError: when the encoder is not installed.
+    """
+
+    def __init__(self, filename, frame_rate=60, max_frames=None, encoder="ffmpeg"):
+        super().__init__(max_frames)
+        self.filename = filename
+        self.frame_rate = frame_rate
+        self.encoder = shutil.which(encoder)
+        if self.encoder is None:
+            raise RuntimeError(
+                "Recording {} needs {} to be installed. Record to a .raw "
+                "file or to an image sequence instead.".format(filename, encoder)
+            )
+        self._process = None
+
+    def add_frame(self, pixels, frame):
+        if self._process is None:
+            height, width, channels = pixels.shape
+            self._process = subprocess.Popen(
+                [
+                    self.encoder,
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "rawvideo",
+                    "-pix_fmt",
+                    "rgba" if channels == 4 else "rgb24",
+                    "-s",
+                    "{}x{}".format(width, height),
+                    "-r",
+                    str(self.frame_rate),
+                    "-i",
+                    "-",
+                    self.filename,
+                ],
+                stdin=subprocess.PIPE,
+            )
+        self._process.stdin.write(np.ascontiguousarray(pixels, dtype=np.uint8).data)
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        returncode = self._process.wait()
+        self._process = None
+        if returncode != 0:
+            raise RuntimeError(
+                "{} exited with status {} while encoding {}".format(
+                    self.encoder, returncode, self.filename
+                )
+            )
+
+
+# Extensions of the files recorded as raw frames and as videos
+RAW_EXTENSIONS = (".raw", ".rgb", ".rgba")
+# Channels of the frames of raw files, None to keep those of the frames
+RAW_CHANNELS = {".rgb": 3, ".rgba": 4}
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".webm", ".avi", ".gif")
+
+
+def create_recorder(filename, max_frames=None, frame_rate=60):
+    """The recorder for `filename`, chosen from its extension.
+
+    :raises ValueError: when the extension is not supported.
+    :raises RuntimeError: when a video is recorded and ffmpeg is not
+        installed.
+
+    :rtype: Recorder
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in RAW_EXTENSIONS:
+        return RawRecorder(filename, max_frames)
+    if extension in VIDEO_EXTENSIONS:
+        return EncoderRecorder(filename, frame_rate, max_frames)
+    if extension in Image.registered_extensions():
+        return ImageSequenceRecorder(filename, max_frames)
+    raise ValueError("Can not record to {}".format(filename))
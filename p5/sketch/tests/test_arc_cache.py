@@ -0,0 +1,87 @@
+import math
+import unittest
+
+import numpy as np
+
+from p5.core import p5
+from p5.pmath.utils import SINCOS
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D
+from p5.sketch.Vispy2DRenderer.shape import Arc, ArcCache, arc_cache
+
+
+def reference_vertices(center, radii, start_index, end_index, acc, mode):
+    """The per-vertex loop previously used by Arc._tessellate"""
+    c1x, c1y = center
+    rx, ry = radii
+    inc = int(len(SINCOS) / acc)
+    sclen = len(SINCOS)
+
+    vertices = [(c1x, c1y, 0)] if mode in ["PIE", None] else []
+    for idx in range(start_index, end_index, inc):
+        i = idx % sclen
+        vertices.append((c1x + rx * SINCOS[i][1], c1y + ry * SINCOS[i][0], 0))
+    vertices.append(
+        (
+            c1x + rx * SINCOS[end_index % sclen][1],
+            c1y + ry * SINCOS[end_index % sclen][0],
+            0,
+        )
+    )
+    if mode == "CHORD" or mode == "PIE":
+        vertices.append(vertices[0])
+    return vertices
+
+
+class TestArcCache(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        p5.renderer = VispyRenderer2D()
+        arc_cache.clear()
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+
+    def test_vertices(self):
+        sclen = len(SINCOS)
+        for mode in [None, "OPEN", "CHORD", "PIE"]:
+            for start, stop in [(0, 2 * math.pi), (0.5, math.pi), (-1, 7.5)]:
+                with self.subTest(mode=mode, start=start, stop=stop):
+                    arc = Arc((10, 20), (30, 15), start, stop, mode)
+                    expected = reference_vertices(
+                        (10, 20),
+                        (30, 15),
+                        int(start / (math.pi * 2) * sclen),
+                        int(stop / (math.pi * 2) * sclen),
+                        int(math.hypot(30, 15) * math.pi * 2 / 10),
+                        mode,
+                    )
+                    np.testing.assert_array_equal(arc.vertices, expected)
+
+    def test_hits(self):
+        Arc((10, 20), (30, 15), 0, math.pi, "PIE")
+        Arc((50, 50), (30, 15), 0, math.pi, "PIE")
+        Arc((50, 50), (30, 15), 0, math.pi, "OPEN")
+        self.assertEqual((arc_cache.hits, arc_cache.misses), (1, 2))
+        self.assertEqual(len(arc_cache), 2)
+
+    def test_read_only(self):
+        unit = arc_cache.get(20, 0, 10, "OPEN")
+        with self.assertRaises(ValueError):
+            unit[0, 0] = 1
+        arc = Arc((10, 20), (30, 15), 0, math.pi, "OPEN")
+        arc.vertices[0, 0] = 1
+
+    def test_max_size(self):
+        cache = ArcCache(max_size=2)
+        first = cache.get(20, 0, 10, None)
+        cache.get(20, 0, 20, None)
+        cache.get(20, 0, 10, None)
+        cache.get(20, 0, 30, None)
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(20, 0, 10, None), first)
+        cache.get(20, 0, 20, None)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
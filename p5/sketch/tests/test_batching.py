@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from p5.sketch.Vispy2DRenderer.batching import batch_draw_queue, to_triangles
+
+COLOR = (1.0, 0.0, 0.0, 1.0)
+
+
+def rect_entries(x, y, w, h, transform=None):
+    """Fill and stroke queue entries of a rectangle, like rect() queues them"""
+    vertices = np.array(
+        [[x, y, 0], [x + w, y, 0], [x + w, y + h, 0], [x, y + h, 0]], dtype=float
+    )
+    fill = ("triangles", (vertices, np.array([0, 1, 2, 0, 2, 3]), COLOR), transform)
+    edges = np.array([[0, 1], [1, 2], [2, 3], [3, 0]], dtype=np.uint32)
+    stroke = ("lines", (vertices, edges, COLOR, 1, "ROUND", "MITER"), transform)
+    return [fill, stroke]
+
+
+class TestToTriangles(unittest.TestCase):
+    def test_triangles(self):
+        idx = np.arange(6, dtype=np.uint32)
+        np.testing.assert_array_equal(to_triangles("triangles", idx), idx)
+
+    def test_strip(self):
+        np.testing.assert_array_equal(
+            to_triangles("triangle_strip", np.arange(5)),
+            [0, 1, 2, 1, 2, 3, 2, 3, 4],
+        )
+
+    def test_fan(self):
+        np.testing.assert_array_equal(
+            to_triangles("triangle_fan", np.array([3, 4, 5, 6])),
+            [3, 4, 5, 3, 5, 6],
+        )
+
+    def test_too_short(self):
+        self.assertEqual(len(to_triangles("triangle_fan", np.arange(2))), 0)
+
+
+class TestBatchDrawQueue(unittest.TestCase):
+    def test_consecutive(self):
+        queue = [rect_entries(0, 0, 5, 5)[0], rect_entries(0, 0, 5, 5)[0]]
+        batches = batch_draw_queue(queue)
+        self.assertEqual([b.key for b in batches], ["triangles"])
+        self.assertEqual(len(batches[0].entries), 2)
+
+    def test_disjoint_shapes(self):
+        queue = []
+        for i in range(20):
+            for j in range(20):
+                queue.extend(rect_entries(i * 10, j * 10, 6, 6))
+        batches = batch_draw_queue(queue)
+        self.assertEqual([b.key for b in batches], ["triangles", "lines"])
+        self.assertEqual(len(batches[0].entries), 400)
+        self.assertEqual(len(batches[1].entries), 400)
+
+    def test_overlapping_shapes(self):
+        queue = rect_entries(0, 0, 10, 10) + rect_entries(5, 5, 10, 10)
+        batches = batch_draw_queue(queue)
+        self.assertEqual(
+            [b.key for b in batches], ["triangles", "lines", "triangles", "lines"]
+        )
+
+    def test_order_within_batch(self):
+        first, second, third = (rect_entries(i * 20, 0, 10, 10) for i in range(3))
+        batches = batch_draw_queue(first + second + third)
+        fills = [entry[0][0, 0] for entry in batches[0].entries]
+        self.assertEqual(fills, [0, 20, 40])
+
+    def test_out_of_plane(self):
+        fill, stroke = rect_entries(0, 0, 5, 5)
+        far = rect_entries(50, 50, 5, 5)[0]
+        far[1][0][:, 2] = 10
+        batches = batch_draw_queue([fill, stroke, far])
+        self.assertEqual([b.key for b in batches], ["triangles", "lines", "triangles"])
+
+    def test_transforms(self):
+        shift = np.identity(4)
+        shift[0, 3] = 100
+        queue = (
+            rect_entries(0, 0, 5, 5, shift)
+            + rect_entries(20, 0, 5, 5, shift)
+            + rect_entries(40, 0, 5, 5)
+        )
+        batches = batch_draw_queue(queue)
+        self.assertEqual(
+            [(b.key, b.transform is shift) for b in batches],
+            [
+                ("triangles", True),
+                ("lines", True),
+                ("triangles", False),
+                ("lines", False),
+            ],
+        )
+        self.assertEqual(len(batches[0].entries), 2)
+
+    def test_transformed_overlap(self):
+        shift = np.identity(4)
+        shift[0, 3] = 100
+        # Drawn at x = 100 on screen, on top of the second rectangle
+        queue = rect_entries(0, 0, 5, 5, shift) + rect_entries(100, 0, 5, 5)
+        queue.append(rect_entries(0, 0, 5, 5, shift)[0])
+        batches = batch_draw_queue(queue)
+        self.assertEqual(len(batches), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
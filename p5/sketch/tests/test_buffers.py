@@ -0,0 +1,32 @@
+import unittest
+
+import numpy as np
+
+from p5.sketch.Vispy2DRenderer.openglrenderer import PersistentVertexBuffer
+
+dtype = np.dtype([("position", np.float32, 3), ("color", np.float32, 4)])
+
+
+class TestPersistentVertexBuffer(unittest.TestCase):
+    def test_reuse(self):
+        buffer = PersistentVertexBuffer(dtype, capacity=8)
+        storage = buffer.buffer
+        buffer.set_data(np.zeros(8, dtype=dtype))
+        buffer.set_data(np.zeros(3, dtype=dtype))
+        self.assertIs(buffer.buffer, storage)
+        self.assertEqual(buffer.capacity, 8)
+        self.assertEqual(buffer.size, 3)
+        self.assertEqual(buffer.buffer.size, 8)
+
+    def test_growth(self):
+        buffer = PersistentVertexBuffer(dtype, capacity=8)
+        buffer.set_data(np.zeros(9, dtype=dtype))
+        self.assertEqual(buffer.capacity, 16)
+        buffer.set_data(np.zeros(100, dtype=dtype))
+        self.assertEqual(buffer.capacity, 128)
+        self.assertEqual(buffer.buffer.size, 128)
+        self.assertEqual(buffer.size, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+import builtins
+import unittest
+from unittest import mock
+
+import numpy as np
+import skia
+
+from p5.core import p5
+from p5.core.color import color_mode, parse_colors
+from p5.core.primitives import circles, lines, points, rects, triangles
+from p5.pmath import matrix
+from p5.sketch.Skia2DRenderer.renderer2d import SkiaRenderer
+from p5.sketch.Vispy2DRenderer.renderer2d import (
+    INSTANCE_ELLIPSE,
+    INSTANCE_RECT,
+    NO_COLOR,
+    VispyRenderer2D,
+    tessellate_lines,
+)
+from p5.sketch.Vispy3DRenderer.renderer3d import Renderer3D
+
+
+class BulkTestCase(unittest.TestCase):
+    renderer_class = VispyRenderer2D
+
+    def setUp(self):
+        self.previous = (p5.renderer, builtins.current_renderer)
+        self.renderer = self.renderer_class()
+        p5.renderer = self.renderer
+
+    def tearDown(self):
+        p5.renderer, builtins.current_renderer = self.previous
+
+    def queued_types(self):
+        return [item[0] for item in self.renderer.draw_queue]
+
+
+class TestBulk2D(BulkTestCase):
+    def test_rects(self):
+        rects([[10, 20, 30, 40], [0, 0, 4, 2]], colors=[[255, 0, 0], [0, 0, 255]])
+        self.assertEqual(self.queued_types(), ["instances"])
+        bounds, instances = self.renderer.draw_queue[0][1]
+        np.testing.assert_array_equal(instances["kind"], INSTANCE_RECT)
+        np.testing.assert_array_equal(instances["origin"], [(25, 40), (2, 1)])
+        np.testing.assert_array_equal(
+            instances["basis"], [(15, 0, 0, 20), (2, 0, 0, 1)]
+        )
+        np.testing.assert_array_equal(
+            instances["fill_color"], [(1, 0, 0, 1), (0, 0, 1, 1)]
+        )
+        np.testing.assert_allclose(bounds, [[-0.51, -0.51], [40.51, 60.51]])
+
+    def test_rect_mode(self):
+        rects([[25, 40, 30, 40]], mode="CENTER")
+        _, instances = self.renderer.draw_queue[0][1]
+        np.testing.assert_array_equal(instances["origin"], [(25, 40)])
+        np.testing.assert_array_equal(instances["basis"], [(15, 0, 0, 20)])
+
+    def test_circles(self):
+        self.renderer.style.stroke_enabled = False
+        circles([[50, 50, 10], [0, 0, 0]])
+        _, instances = self.renderer.draw_queue[0][1]
+        # The circle without radius is skipped
+        self.assertEqual(len(instances), 1)
+        self.assertEqual(instances["kind"][0], INSTANCE_ELLIPSE)
+        np.testing.assert_array_equal(instances["stroke_color"], [NO_COLOR])
+        self.assertEqual(instances["half_width"][0], 0)
+
+    def test_points(self):
+        self.renderer.style.stroke_weight = 4
+        points([[1, 2], [3, 4]])
+        _, instances = self.renderer.draw_queue[0][1]
+        np.testing.assert_array_equal(instances["origin"], [(1, 2), (3, 4)])
+        np.testing.assert_array_equal(instances["basis"], [(2, 0, 0, 2)] * 2)
+        np.testing.assert_array_equal(instances["fill_color"], [(0, 0, 0, 1)] * 2)
+
+        self.renderer.style.stroke_enabled = False
+        points([[1, 2]])
+        self.assertEqual(len(self.renderer.draw_queue), 1)
+
+    def test_lines(self):
+        segments = [[0, 0, 10, 0], [0, 5, 10, 5], [0, 9, 10, 9]]
+        lines(segments, colors=[0, 128, 255])
+        self.assertEqual(self.queued_types(), ["lines"])
+        vertices, idx, stroke = self.renderer.draw_queue[0][1][:3]
+        self.assertEqual(vertices.shape, (6, 3))
+        np.testing.assert_array_equal(idx, [[0, 1], [2, 3], [4, 5]])
+
+        data = tessellate_lines([self.renderer.draw_queue[0][1]])
+        np.testing.assert_allclose(
+            data["color"][::6], parse_colors([0, 128, 255]), rtol=1e-6
+        )
+
+    def test_triangles(self):
+        triangles(
+            [[0, 0, 10, 0, 0, 10], [5, 5, 15, 5, 5, 15]], colors=[[255, 0, 0]] * 2
+        )
+        self.assertEqual(self.queued_types(), ["triangles", "lines"])
+        vertices, idx, fill = self.renderer.draw_queue[0][1]
+        np.testing.assert_array_equal(idx, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(fill.shape, (6, 4))
+        _, edges, stroke = self.renderer.draw_queue[1][1][:3]
+        np.testing.assert_array_equal(edges[:3], [[0, 1], [1, 2], [2, 0]])
+        self.assertEqual(tuple(stroke), self.renderer.style.stroke_color)
+
+    def test_out_of_plane(self):
+        self.renderer.transform_matrix = matrix.rotation_matrix(
+            np.array([0, 1, 0]), 0.5
+        )
+        rects([[0, 0, 4, 2]] * 3)
+        self.assertEqual(self.queued_types(), ["triangles", "lines"])
+        vertices, idx, fill = self.renderer.draw_queue[0][1]
+        self.assertEqual(vertices.shape, (12, 3))
+        self.assertEqual(len(idx), 18)
+
+    def test_hsb_colors(self):
+        color_mode("HSB", 360, 100, 100)
+        circles([[0, 0, 1]], colors=[[120, 100, 100]])
+        _, instances = self.renderer.draw_queue[0][1]
+        np.testing.assert_allclose(instances["fill_color"], [(0, 1, 0, 1)])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            rects([[0, 0, 1]])
+        with self.assertRaises(ValueError):
+            triangles([[0, 0, 1, 1]])
+        with self.assertRaises(ValueError):
+            circles([[0, 0, 1]], colors=[0, 0])
+
+
+class TestBulk3D(BulkTestCase):
+    renderer_class = Renderer3D
+
+    def test_lines(self):
+        lines([[0, 0, 0, 1, 1, 1], [1, 0, 0, 0, 1, 0]], colors=[0, 255])
+        self.assertEqual(self.queued_types(), ["lines"])
+        vertices, idx, stroke, _, _ = self.renderer.draw_queue[0][1]
+        np.testing.assert_array_equal(idx, [0, 1, 2, 3])
+        np.testing.assert_array_equal(stroke[:, 0], [0, 0, 1, 1])
+
+    def test_triangles(self):
+        triangles(np.array([[[0, 0, 0], [1, 0, 0], [0, 1, 0]]] * 4))
+        self.assertEqual(self.queued_types(), ["triangles", "lines"])
+        vertices, idx, fill, normals, _ = self.renderer.draw_queue[0][1]
+        self.assertEqual(vertices.shape, (12, 3))
+        self.assertEqual(len(idx), 12)
+
+    def test_circles(self):
+        self.renderer.style.stroke_enabled = False
+        circles([[0, 0, 1]] * 5)
+        self.assertEqual(self.queued_types(), ["triangles"])
+
+
+class TestBulkSkia(BulkTestCase):
+    renderer_class = SkiaRenderer
+
+    def setUp(self):
+        super().setUp()
+        builtins.current_renderer = "skia"
+        self.surface = skia.Surface.MakeRaster(
+            skia.ImageInfo.Make(
+                20, 20, skia.ColorType.kRGBA_8888_ColorType, skia.kPremul_AlphaType
+            )
+        )
+        self.renderer.initialize_renderer(
+            self.surface.getCanvas(), skia.Paint(), skia.Path()
+        )
+
+    def pixel(self, x, y):
+        return tuple(self.surface.makeImageSnapshot().toarray()[y, x])
+
+    def test_rects(self):
+        self.renderer.style.stroke_enabled = False
+        rects([[0, 0, 10, 10], [5, 5, 10, 10]], colors=[[255, 0, 0], [0, 0, 255]])
+        self.assertEqual(self.pixel(2, 2), (255, 0, 0, 255))
+        # Shapes are drawn in order
+        self.assertEqual(self.pixel(7, 7), (0, 0, 255, 255))
+
+    def spy_canvas(self):
+        canvas = mock.Mock(wraps=self.renderer.canvas)
+        self.renderer.canvas = canvas
+        return canvas
+
+    def test_rects_draw_calls(self):
+        canvas = self.spy_canvas()
+        xywh = np.column_stack(
+            (np.arange(50) % 10, np.arange(50) // 10, [4] * 50, [3] * 50)
+        )
+        rects(xywh, colors=np.random.randint(0, 256, (50, 3)))
+        self.assertEqual(canvas.drawVertices.call_count, 1)
+        self.assertEqual(canvas.drawPath.call_count, 1)
+        canvas.drawRect.assert_not_called()
+
+    def test_translucent_fills(self):
+        self.renderer.style.stroke_enabled = False
+        rects([[0, 0, 10, 10], [5, 5, 10, 10]], colors=[[255, 0, 0, 128]] * 2)
+        self.assertEqual(self.pixel(2, 2), (255, 0, 0, 128))
+        # Overlapping rectangles are blended one over the other
+        self.assertEqual(self.pixel(7, 7), (255, 0, 0, 192))
+
+    def test_triangles(self):
+        self.renderer.style.stroke_enabled = False
+        triangles(
+            [[0, 0, 20, 0, 0, 20], [20, 20, 20, 0, 0, 20]],
+            colors=[[255, 0, 0], [0, 0, 255]],
+        )
+        self.assertEqual(self.pixel(3, 3), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(16, 16), (0, 0, 255, 255))
+
+    def test_circles(self):
+        canvas = self.spy_canvas()
+        circles([[5, 5, 4], [14, 14, 4]], colors=[[255, 0, 0], [0, 0, 255]])
+        self.assertEqual(canvas.drawPath.call_count, 1)
+        self.assertEqual(self.pixel(5, 5), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(14, 14), (0, 0, 255, 255))
+
+    def test_points(self):
+        self.renderer.style.stroke_weight = 4
+        points([[5, 5], [15, 15]], colors=[[255, 0, 0], [0, 255, 0]])
+        self.assertEqual(self.pixel(5, 5)[0], 255)
+        self.assertEqual(self.pixel(15, 15)[1], 255)
+        self.assertEqual(self.pixel(10, 10), (0, 0, 0, 0))
+
+    def test_points_grouped_by_color(self):
+        canvas = self.spy_canvas()
+        self.renderer.style.stroke_weight = 4
+        red, green = [255, 0, 0], [0, 255, 0]
+        points([[3, 3], [9, 9], [15, 15], [9, 3]], colors=[red, green, red, green])
+        self.assertEqual(canvas.drawPoints.call_count, 2)
+        self.assertEqual(self.pixel(15, 15), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(9, 3), (0, 255, 0, 255))
+
+    def test_lines_grouped_by_color(self):
+        canvas = self.spy_canvas()
+        self.renderer.style.stroke_weight = 2
+        lines(
+            [[0, 5, 20, 5], [0, 10, 20, 10], [0, 15, 20, 15]],
+            colors=[[0, 0, 255], [255, 0, 0], [0, 0, 255]],
+        )
+        self.assertEqual(canvas.drawPoints.call_count, 2)
+        self.assertEqual(self.pixel(10, 10), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(10, 15), (0, 0, 255, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,245 @@
+import os
+import tempfile
+import threading
+import types
+import unittest
+
+import numpy as np
+import skia
+from PIL import Image
+
+from p5.core import p5
+from p5.sketch.capture import (
+    CaptureQueue,
+    EncoderRecorder,
+    ImageSequenceRecorder,
+    RawRecorder,
+    Recorder,
+    capture_queue,
+    frame_filename,
+)
+from p5.sketch.Skia2DRenderer.renderer2d import SkiaRenderer
+from p5.sketch.Skia2DRenderer.base import SkiaSketch
+from p5.sketch.userspace import record, stop_recording
+
+
+class BlockingQueue(CaptureQueue):
+    """Writes frames once `release` is set"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.written = []
+
+    def _write(self, pixels, filename):
+        self.release.wait()
+        self.written.append(filename)
+
+
+class TestCaptureQueue(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_write(self):
+        queue = CaptureQueue()
+        pixels = np.random.randint(0, 256, (20, 30, 3), dtype=np.uint8)
+        for i in range(10):
+            queue.save(pixels, self.path("frame-{}.png".format(i)))
+        queue.close()
+        self.assertEqual(queue.pending, 0)
+        for i in range(10):
+            with Image.open(self.path("frame-{}.png".format(i))) as img:
+                np.testing.assert_array_equal(np.array(img), pixels)
+
+    def test_jpeg_alpha(self):
+        queue = CaptureQueue()
+        queue.save(np.zeros((4, 4, 4), dtype=np.uint8), self.path("frame.jpg"))
+        queue.close()
+        with Image.open(self.path("frame.jpg")) as img:
+            self.assertEqual(img.mode, "RGB")
+
+    def test_backpressure(self):
+        queue = BlockingQueue(workers=1, max_pending=2)
+        pixels = np.zeros((4, 4, 3), dtype=np.uint8)
+        queue.save(pixels, "first")
+        queue.save(pixels, "second")
+
+        third = threading.Thread(target=queue.save, args=(pixels, "third"))
+        third.start()
+        third.join(0.1)
+        self.assertTrue(third.is_alive())
+        self.assertEqual(queue.pending, 2)
+
+        queue.release.set()
+        third.join()
+        queue.close()
+        self.assertEqual(queue.written, ["first", "second", "third"])
+
+    def test_errors(self):
+        queue = CaptureQueue()
+        pixels = np.zeros((4, 4, 3), dtype=np.uint8)
+        queue.save(pixels, self.path(os.path.join("missing", "frame.png")))
+        with self.assertRaises(FileNotFoundError):
+            queue.flush()
+        queue.save(pixels, self.path("frame.png"))
+        queue.close()
+        self.assertTrue(os.path.exists(self.path("frame.png")))
+
+
+def frames(count, shape=(3, 5, 3)):
+    return [np.full(shape, i, dtype=np.uint8) for i in range(count)]
+
+
+class TestRecorders(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_frame_filename(self):
+        self.assertEqual(frame_filename("frame-####.png", 12), "frame-0012.png")
+        self.assertEqual(frame_filename("a#/b-##.png", 3), "a#/b-03.png")
+        self.assertEqual(frame_filename("screen.png", 7), "screen-0007.png")
+        self.assertEqual(frame_filename("f-##.png", 1234), "f-1234.png")
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            Recorder()  # pylint: disable=abstract-class-instantiated
+
+    def test_image_sequence(self):
+        recorder = ImageSequenceRecorder(self.path("frame-###.png"))
+        for i, pixels in enumerate(frames(3)):
+            recorder.capture(lambda: pixels, i + 5)
+        recorder.close()
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ["frame-005.png", "frame-006.png", "frame-007.png"],
+        )
+
+    def test_frame_count(self):
+        recorder = RawRecorder(self.path("frames.raw"))
+        read = []
+        for frame, pixels in zip([1, 1, 2, 2, 2, 3], frames(6)):
+            recorder.capture(lambda: read.append(frame) or pixels, frame)
+        recorder.close()
+        self.assertEqual(read, [1, 2, 3])
+        self.assertEqual(recorder.frames, 3)
+
+    def test_raw(self):
+        recorder = RawRecorder(self.path("frames.raw"))
+        for i, pixels in enumerate(frames(4)):
+            recorder.capture(lambda: pixels, i)
+        recorder.close()
+        data = np.fromfile(self.path("frames.raw"), np.uint8)
+        np.testing.assert_array_equal(
+            data.reshape((-1, *recorder.shape)), np.array(frames(4))
+        )
+
+    def test_raw_preallocated(self):
+        recorder = RawRecorder(self.path("frames.raw"), max_frames=10)
+        for i, pixels in enumerate(frames(4)):
+            recorder.capture(lambda: pixels, i)
+        recorder.close()
+        data = np.fromfile(self.path("frames.raw"), np.uint8)
+        np.testing.assert_array_equal(
+            data.reshape((-1, *recorder.shape)), np.array(frames(4))
+        )
+
+    def test_rgba_from_rgb(self):
+        # Vispy reads the frames without alpha
+        recorder = RawRecorder(self.path("frames.rgba"), max_frames=2)
+        pixels = frames(1)[0]
+        recorder.capture(lambda: pixels, 0)
+        recorder.close()
+        data = np.fromfile(self.path("frames.rgba"), np.uint8).reshape((3, 5, 4))
+        np.testing.assert_array_equal(data[:, :, :3], pixels)
+        self.assertTrue(np.all(data[:, :, 3] == 255))
+
+    def test_rgb_from_rgba(self):
+        # Skia reads the frames with alpha
+        recorder = RawRecorder(self.path("frames.rgb"))
+        pixels = frames(1, (3, 5, 4))[0]
+        recorder.capture(lambda: pixels, 0)
+        recorder.close()
+        self.assertEqual(recorder.shape, (3, 5, 3))
+        data = np.fromfile(self.path("frames.rgb"), np.uint8).reshape((3, 5, 3))
+        np.testing.assert_array_equal(data, pixels[:, :, :3])
+
+        with self.assertRaises(ValueError):
+            RawRecorder(self.path("gray.rgb")).add_frame(np.zeros((3, 5)), 0)
+
+    def test_max_frames(self):
+        recorder = RawRecorder(self.path("frames.raw"), max_frames=2)
+        for i, pixels in enumerate(frames(4)):
+            recorder.capture(lambda: pixels, i)
+        recorder.close()
+        self.assertTrue(recorder.full)
+        self.assertEqual(os.path.getsize(self.path("frames.raw")), 2 * 3 * 5 * 3)
+
+    def test_resized(self):
+        recorder = RawRecorder(self.path("frames.raw"))
+        recorder.capture(lambda: frames(1)[0], 0)
+        with self.assertRaises(ValueError):
+            recorder.capture(lambda: frames(1, (5, 3, 3))[0], 1)
+        recorder.close()
+
+    def test_missing_encoder(self):
+        with self.assertRaises(RuntimeError):
+            EncoderRecorder(self.path("video.mp4"), encoder="p5-missing-encoder")
+
+    def test_record(self):
+        record(self.path("frames.rgb"))
+        self.assertIsInstance(p5.recorder, RawRecorder)
+        p5.recorder.capture(lambda: frames(1)[0], 0)
+        self.assertEqual(stop_recording(), 1)
+        self.assertIsNone(p5.recorder)
+        self.assertEqual(stop_recording(), 0)
+
+        record(self.path("frame-##.jpg"), max_frames=3)
+        self.assertIsInstance(p5.recorder, ImageSequenceRecorder)
+        stop_recording()
+
+        with self.assertRaises(ValueError):
+            record(self.path("frames.unknown"))
+
+
+class TestSkiaCapture(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.previous_renderer = p5.renderer
+        p5.renderer = SkiaRenderer()
+        # Surfaces created without an image info use the native color
+        # type of the platform, which may be BGRA
+        self.surface = skia.Surface(4, 4)
+        self.surface.getCanvas().clear(skia.Color(255, 0, 0, 255))
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+        self.directory.cleanup()
+
+    def test_save_canvas(self):
+        filename = os.path.join(self.directory.name, "canvas.png")
+        graphics = types.SimpleNamespace(canvas=self.surface.getCanvas())
+        p5.renderer.save_canvas(filename, graphics)
+        capture_queue.flush()
+        with Image.open(filename) as img:
+            self.assertEqual(img.getpixel((0, 0)), (255, 0, 0, 255))
+
+    def test_read_surface(self):
+        sketch = types.SimpleNamespace(surface=self.surface)
+        pixels = SkiaSketch._read_surface(sketch)
+        self.assertEqual(tuple(pixels[0, 0]), (255, 0, 0, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from p5.sketch.Vispy2DRenderer.drawqueue import Arena, DrawQueue
+
+COLOR = (1.0, 0.0, 0.0, 1.0)
+SQUARE = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=float)
+
+
+class TestArena(unittest.TestCase):
+    def test_grow(self):
+        arena = Arena(np.uint32, capacity=4)
+        arena.extend(3)[:] = [1, 2, 3]
+        arena.extend(6)[:] = 7
+        self.assertEqual(arena.capacity, 16)
+        np.testing.assert_array_equal(arena.view, [1, 2, 3] + [7] * 6)
+
+        arena.clear()
+        arena.extend(2)[:] = 5
+        self.assertEqual(arena.capacity, 16)
+        np.testing.assert_array_equal(arena.view, [5, 5])
+
+
+class TestDrawQueue(unittest.TestCase):
+    def test_add_mesh(self):
+        queue = DrawQueue()
+        stype, (vertices, idx, color) = queue.add_mesh(
+            "triangles", SQUARE, np.array([0, 1, 2, 0, 2, 3]), COLOR
+        )
+        self.assertEqual(stype, "triangles")
+        np.testing.assert_array_equal(vertices, SQUARE)
+        self.assertEqual(vertices.dtype, np.float32)
+        np.testing.assert_array_equal(queue.vertices.view["color"], [COLOR] * 4)
+
+        # Indices point into the whole vertex arena
+        colors = np.arange(16).reshape(4, 4) / 16
+        stype, (_, idx, _) = queue.add_mesh(
+            "triangle_strip", SQUARE, np.arange(4), colors
+        )
+        self.assertEqual(stype, "triangles")
+        np.testing.assert_array_equal(idx, [4, 5, 6, 5, 6, 7])
+        np.testing.assert_array_equal(queue.vertices.view["color"][4:], colors)
+        self.assertEqual(queue.indices.size, 12)
+
+    def test_entries_survive_growth(self):
+        queue = DrawQueue()
+        entries = [
+            queue.add_mesh("lines", SQUARE + i, np.array([[0, 1], [2, 3]]), COLOR)[1]
+            for i in range(1000)
+        ]
+        self.assertEqual(queue.vertices.size, 4000)
+        vertices, idx, _ = entries[0]
+        np.testing.assert_array_equal(vertices, SQUARE)
+        np.testing.assert_array_equal(idx, [0, 1, 2, 3])
+        np.testing.assert_array_equal(
+            queue.vertices.view["position"][entries[-1][1]], SQUARE + 999
+        )
+
+    def test_clear(self):
+        queue = DrawQueue()
+        queue.append(("instances", None, None))
+        queue.add_mesh("points", SQUARE, np.arange(4), COLOR)
+        queue.modified = False
+        queue.clear()
+        self.assertEqual(queue, [])
+        self.assertEqual(queue.vertices.size, 0)
+        self.assertEqual(queue.indices.size, 0)
+        self.assertTrue(queue.modified)
+
+
+if __name__ == "__main__":
+    unittest.main()
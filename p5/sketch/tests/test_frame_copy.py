@@ -0,0 +1,78 @@
+import unittest
+
+from vispy.gloo import Texture2D
+from vispy.gloo.context import FakeCanvas, forget_canvas
+
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D
+from p5.sketch.Vispy3DRenderer.renderer3d import Renderer3D
+
+
+class TestFrameCopy(unittest.TestCase):
+    renderer_class = VispyRenderer2D
+
+    def setUp(self):
+        self.canvas = FakeCanvas()
+        self.renderer = self.renderer_class()
+        self.renderer.viewport = (0, 0, 4, 4)
+        self.renderer.texture_viewport = (0, 0, 4, 4)
+        self.front = self.renderer.fbuffer_tex_front = Texture2D((4, 4, 3))
+        self.back = self.renderer.fbuffer_tex_back = Texture2D((4, 4, 3))
+
+        # Textures drawn by the frame buffer program: the copy of the
+        # previous frame, then the new frame drawn on the screen
+        self.drawn = []
+
+        def draw(mode="triangles", indices=None, check_error=True):
+            self.drawn.append(self.renderer.fbuffer_prog["texture"])
+
+        self.renderer.fbuffer_prog.draw = draw
+
+    def tearDown(self):
+        forget_canvas(self.canvas)
+
+    def test_background(self):
+        with self.renderer.draw_loop():
+            self.renderer.clear()
+        self.assertEqual(self.drawn, [self.back])
+
+    def test_accumulate(self):
+        with self.renderer.draw_loop():
+            pass
+        self.assertEqual(self.drawn, [self.front, self.back])
+
+    def test_clear_after_drawing(self):
+        with self.renderer.draw_loop():
+            self.renderer.flush_geometry()
+            self.renderer.clear()
+        self.assertEqual(self.drawn, [self.front, self.back])
+
+    def test_depth_clear(self):
+        with self.renderer.draw_loop():
+            self.renderer.clear(color=False)
+        self.assertEqual(self.drawn, [self.front, self.back])
+
+    def test_always(self):
+        self.renderer.frame_copy = "always"
+        with self.renderer.draw_loop():
+            self.renderer.clear()
+        self.assertEqual(self.drawn, [self.front, self.back])
+
+    def test_never(self):
+        self.renderer.frame_copy = "never"
+        with self.renderer.draw_loop():
+            pass
+        self.assertEqual(self.drawn, [self.back])
+
+    def test_unknown_mode(self):
+        self.renderer.frame_copy = "sometimes"
+        with self.assertRaises(ValueError):
+            with self.renderer.draw_loop():
+                pass
+
+
+class TestFrameCopy3D(TestFrameCopy):
+    renderer_class = Renderer3D
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from p5.core import p5
+from p5.sketch.Vispy2DRenderer.glyphs import GLYPH_PADDING, GlyphAtlas, atlas_key
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D
+
+FONT_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "visualTests",
+    "sanityTests",
+    "TestAssets",
+    "TestFont.ttf",
+)
+
+
+def draw_glyphs(atlas, text, size, origin):
+    """Blend the glyphs of the atlas over each other, like PIL draws a string"""
+    canvas = np.zeros(size[::-1])
+    for glyph, x, y in atlas.layout(text):
+        (w, h), (ax, ay) = glyph.size, glyph.position
+        x, y = x + origin[0], y + origin[1]
+        coverage = atlas.data[ay : ay + h, ax : ax + w] / 255
+        area = canvas[y : y + h, x : x + w]
+        area[:] = coverage + area * (1 - coverage)
+    return np.round(canvas * 255)
+
+
+def glyph_bitmap(atlas, char):
+    (w, h), (x, y) = atlas.glyphs[char].size, atlas.glyphs[char].position
+    return atlas.data[y : y + h, x : x + w].copy()
+
+
+class TestGlyphAtlas(unittest.TestCase):
+    def setUp(self):
+        self.font = ImageFont.truetype(FONT_PATH, 24)
+
+    def test_layout(self):
+        atlas = GlyphAtlas(self.font)
+        for text in ["Hello, World!", "fps: 59.94", "frame 1024"]:
+            with self.subTest(text=text):
+                size = np.add(self.font.getbbox(text)[2:], 20)
+                expected = Image.new("L", tuple(size))
+                draw = ImageDraw.Draw(expected)
+                draw.text((10, 10), text, font=self.font, fill=255)
+                np.testing.assert_array_equal(
+                    draw_glyphs(atlas, text, size, (10, 10)), np.array(expected)
+                )
+
+    def test_cached(self):
+        atlas = GlyphAtlas(self.font)
+        atlas.layout("abcabc")
+        glyph = atlas.glyphs["a"]
+        atlas.layout("cab")
+        self.assertEqual(sorted(atlas.glyphs), ["a", "b", "c"])
+        self.assertIs(atlas.glyph("a"), glyph)
+
+    def test_padding(self):
+        atlas = GlyphAtlas(self.font)
+        for glyph, _, _ in atlas.layout("MW"):
+            (w, h), (x, y) = glyph.size, glyph.position
+            area = atlas.data[
+                y - GLYPH_PADDING : y + h + GLYPH_PADDING,
+                x - GLYPH_PADDING : x + w + GLYPH_PADDING,
+            ]
+            self.assertEqual(area.sum(), atlas.data[y : y + h, x : x + w].sum())
+
+    def test_grow(self):
+        atlas = GlyphAtlas(self.font, width=64, height=32)
+        atlas.layout("ABC")
+        bitmaps = {char: glyph_bitmap(atlas, char) for char in "ABC"}
+        positions = {char: atlas.glyphs[char].position for char in "ABC"}
+        atlas.layout("DEFGHIJKLMNOP")
+        self.assertGreater(atlas.size[1], 32)
+        self.assertEqual(atlas.size[0], 64)
+        for char in "ABC":
+            self.assertEqual(atlas.glyphs[char].position, positions[char])
+            np.testing.assert_array_equal(glyph_bitmap(atlas, char), bitmaps[char])
+
+    def test_full(self):
+        atlas = GlyphAtlas(self.font, width=16, height=16)
+        self.assertIsNone(atlas.layout("W" * 2 + "M"))
+
+    def test_atlas_key(self):
+        self.assertEqual(
+            atlas_key(self.font), atlas_key(ImageFont.truetype(FONT_PATH, 24))
+        )
+        self.assertNotEqual(
+            atlas_key(self.font), atlas_key(ImageFont.truetype(FONT_PATH, 12))
+        )
+        self.assertIsNone(atlas_key(ImageFont.ImageFont()))
+
+
+class TestText(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        self.renderer = VispyRenderer2D()
+        self.renderer.style.font_family = ImageFont.truetype(FONT_PATH, 24)
+        p5.renderer = self.renderer
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+
+    def test_queued(self):
+        self.assertTrue(self.renderer._queue_glyphs("one", (10, 20), None))
+        self.assertTrue(self.renderer._queue_glyphs("two", (10, 50), None))
+        self.assertEqual(len(self.renderer.glyph_atlases), 1)
+        atlas = next(iter(self.renderer.glyph_atlases.values()))
+        self.assertEqual([item[0] for item in self.renderer.draw_queue], [atlas] * 2)
+
+        vertices, texcoords, color = self.renderer.draw_queue[0][1]
+        self.assertEqual(vertices.shape, (18, 3))
+        self.assertEqual(texcoords.shape, (18, 2))
+        self.assertEqual(color, self.renderer.style.fill_color)
+
+    def test_fallback(self):
+        self.assertFalse(self.renderer._queue_glyphs("one\ntwo", (0, 0), None))
+        self.assertFalse(self.renderer._queue_glyphs("one two", (0, 0), 3))
+        self.renderer.style.stroke_weight = 3
+        self.assertFalse(self.renderer._queue_glyphs("one", (0, 0), None))
+        self.renderer.style.font_family = ImageFont.ImageFont()
+        self.renderer.style.stroke_weight = 1
+        self.assertFalse(self.renderer._queue_glyphs("one", (0, 0), None))
+        self.assertEqual(self.renderer.draw_queue, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import builtins
+import unittest
+from unittest import mock
+
+import numpy as np
+from vispy.gloo.context import FakeCanvas, forget_canvas
+
+from p5.core import p5
+from p5.core.constants import P2D, P3D
+from p5.sketch.Vispy2DRenderer import renderer2d
+from p5.sketch.Vispy2DRenderer.batching import batch_draw_queue
+from p5.sketch.Vispy2DRenderer.renderer2d import (
+    FRAMEBUFFER_TEXCOORDS,
+    FrameBufferTexture,
+    VispyRenderer2D,
+)
+
+
+class TestVispyGraphics(unittest.TestCase):
+    def setUp(self):
+        self.previous = (p5.renderer, builtins.current_renderer)
+        builtins.current_renderer = "vispy"
+        self.renderer = VispyRenderer2D()
+        p5.renderer = self.renderer
+
+    def tearDown(self):
+        p5.renderer, builtins.current_renderer = self.previous
+
+    def test_create(self):
+        graphics = self.renderer.create_graphics(40, 30, P2D)
+        self.assertEqual(graphics.size, (40, 30))
+        self.assertIsInstance(graphics._img_texture, FrameBufferTexture)
+        self.assertEqual(graphics._img_texture.shape, (30, 40, 4))
+        self.assertFalse(hasattr(graphics, "save_canvas"))
+        with self.assertRaises(NotImplementedError):
+            self.renderer.create_graphics(40, 30, P3D)
+
+    def test_draw_into_graphics(self):
+        graphics = self.renderer.create_graphics(40, 30, P2D)
+        graphics.no_stroke()  # pylint: disable=no-member
+        graphics.rect(0, 0, 10, 10)  # pylint: disable=no-member
+        self.assertIs(p5.renderer, self.renderer)
+        self.assertEqual(len(self.renderer.draw_queue), 0)
+        self.assertEqual(len(graphics.renderer.draw_queue), 1)
+        self.assertTrue(graphics._texture_outdated)
+
+    def test_image(self):
+        graphics = self.renderer.create_graphics(40, 30, P2D)
+        with mock.patch.object(graphics.renderer, "flush_geometry") as flush:
+            self.renderer.image(graphics, 5, 5, 80, 60)
+            flush.assert_called_once()
+        # Scaled when drawn, the texture keeps its size
+        self.assertEqual(graphics.size, (40, 30))
+
+        (batch,) = batch_draw_queue(self.renderer.draw_queue)
+        self.assertIs(batch.key, graphics._img_texture)
+        vertices, texcoords, _ = batch.entries[0]
+        np.testing.assert_array_equal(vertices[:, :2].max(axis=0), (85, 65))
+        # The top of the image is the last row of the texture
+        np.testing.assert_array_equal(texcoords, FRAMEBUFFER_TEXCOORDS)
+        np.testing.assert_array_equal(texcoords[0], (0, 1))
+
+    def test_flush_sprites_before_drawing(self):
+        graphics = self.renderer.create_graphics(40, 30, P2D)
+        self.renderer.image(graphics, 0, 0, None, None)
+        graphics.rect(0, 0, 10, 10)  # pylint: disable=no-member
+        self.renderer.texture_viewport = (0, 0, 40, 30)
+        canvas = FakeCanvas()
+        try:
+            with mock.patch.object(self.renderer, "flush_geometry") as flush:
+                graphics.renderer.clear()
+                # The queued sprite must be drawn with the old content
+                flush.assert_called_once()
+        finally:
+            forget_canvas(canvas)
+        self.assertEqual(len(graphics.renderer.draw_queue), 0)
+
+    def test_background(self):
+        graphics = self.renderer.create_graphics(40, 30, P2D)
+        self.renderer.texture_viewport = (0, 0, 40, 30)
+        canvas = FakeCanvas()
+        try:
+            with mock.patch.object(renderer2d.gloo, "set_state") as set_state:
+                graphics.background(255, 0, 0, 51)  # pylint: disable=no-member
+        finally:
+            forget_canvas(canvas)
+        # The texture holds premultiplied colors
+        (clear_color,) = [
+            call.kwargs["clear_color"]
+            for call in set_state.call_args_list
+            if "clear_color" in call.kwargs
+        ]
+        np.testing.assert_allclose(clear_color, (0.2, 0, 0, 0.2))
+
+
+if __name__ == "__main__":
+    unittest.main()
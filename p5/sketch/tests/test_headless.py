@@ -0,0 +1,143 @@
+import builtins
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import skia
+
+import p5 as p5_lib
+from p5.core import p5
+from p5.core.constants import P2D
+from p5.core.attribs import background, fill, no_stroke
+from p5.core.primitives import rect
+from p5.pmath.time import millis
+from p5.sketch.userspace import (
+    exit,
+    no_loop,
+    record,
+    run,
+    set_frame_rate,
+    size,
+)
+
+
+def read_rgba(surface):
+    return surface.makeImageSnapshot().toarray(
+        colorType=skia.kRGBA_8888_ColorType, alphaType=skia.kUnpremul_AlphaType
+    )
+
+
+def draw_scene(api):
+    """Antialiased, translucent and stroked shapes"""
+    api.background(255, 255, 255)
+    api.stroke(0, 0, 200, 128)
+    api.stroke_weight(3)
+    api.fill(200, 30, 30)
+    api.ellipse(20.3, 15.2, 25, 17)
+    api.fill(30, 200, 30, 100)
+    api.triangle(2.5, 28, 20, 1.25, 37.75, 26)
+    api.line(3, 7, 37, 27)
+
+
+class TestHeadless(unittest.TestCase):
+    def setUp(self):
+        self.previous = (p5.sketch, p5.renderer, p5.mode, builtins.current_renderer)
+        self.frames = []
+
+    def tearDown(self):
+        p5.sketch, p5.renderer, p5.mode, builtins.current_renderer = self.previous
+        builtins.virtual_time = None
+
+    def run_sketch(self, draw, frames=None, **kwargs):
+        def setup():
+            size(40, 30)
+            background(255, 0, 0)
+
+        def record_frame():
+            self.frames.append(builtins.frame_count)
+            draw()
+
+        run(
+            sketch_setup=setup,
+            sketch_draw=record_frame,
+            renderer="skia",
+            headless=True,
+            frames=frames,
+            **kwargs,
+        )
+        return p5.sketch.surface.makeImageSnapshot().toarray()
+
+    def test_frames(self):
+        def draw():
+            no_stroke()
+            fill(0, 0, 255)
+            rect(builtins.frame_count * 10, 10, 5, 5)
+
+        pixels = self.run_sketch(draw, frames=3)
+        self.assertEqual(self.frames, [1, 2, 3])
+        self.assertEqual(pixels.shape, (30, 40, 4))
+        self.assertEqual(tuple(pixels[0, 0]), (255, 0, 0, 255))
+        for x in (10, 20, 30):
+            self.assertEqual(tuple(pixels[12, x + 2]), (0, 0, 255, 255))
+
+    def test_same_pixels_as_graphics(self):
+        self.run_sketch(lambda: draw_scene(p5_lib), frames=1)
+        headless = read_rgba(p5.sketch.surface)
+
+        # Offscreen graphics are drawn on a raster surface by the same
+        # renderer, in the native color type of the platform
+        graphics = p5.renderer.create_graphics(40, 30, P2D)
+        draw_scene(graphics)
+        np.testing.assert_array_equal(headless, read_rgba(graphics.surface))
+
+    def test_no_loop(self):
+        self.run_sketch(no_loop)
+        self.assertEqual(self.frames, [1])
+
+    def test_exit(self):
+        def draw():
+            if builtins.frame_count == 2:
+                exit()
+
+        self.run_sketch(draw, frames=5)
+        self.assertEqual(self.frames, [1, 2])
+
+    def test_batch(self):
+        times = []
+
+        def draw():
+            times.append((millis(), builtins.frame_rate))
+
+        self.run_sketch(draw, frames=4, frame_rate=25, batch=True)
+        self.assertEqual(times, [(40, 25), (80, 25), (120, 25), (160, 25)])
+
+    def test_batch_frame_rate(self):
+        times = []
+
+        def draw():
+            times.append(millis())
+            if builtins.frame_count == 2:
+                set_frame_rate(10)
+
+        self.run_sketch(draw, frames=5, frame_rate=25, batch=True)
+        # The clock keeps running from where it was at the old rate
+        self.assertEqual(times, [40, 80, 180, 280, 380])
+        self.assertEqual(builtins.frame_rate, 10)
+
+    def test_record(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "frames.raw")
+
+            def draw():
+                if builtins.frame_count == 1:
+                    record(filename)
+                background(builtins.frame_count * 50)
+
+            self.run_sketch(draw, frames=3)
+            recorded = np.fromfile(filename, np.uint8).reshape((-1, 30, 40, 4))
+        np.testing.assert_array_equal(recorded[:, 0, 0, 0], [50, 100, 150])
+
+
+if __name__ == "__main__":
+    unittest.main()
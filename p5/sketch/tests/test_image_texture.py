@@ -0,0 +1,102 @@
+import builtins
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from p5.core import p5
+from p5.pmath import matrix
+from p5.sketch.Vispy2DRenderer.batching import batch_draw_queue
+from p5.sketch.Vispy2DRenderer.image import VispyPImage, texture_memory
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D
+
+
+def uploads(texture):
+    """Data uploaded to the texture since the last call"""
+    return [command[3] for command in texture._glir.clear() if command[0] == "DATA"]
+
+
+class TestImageTexture(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = builtins.current_renderer
+        builtins.current_renderer = "vispy"
+
+    def tearDown(self):
+        builtins.current_renderer = self.previous_renderer
+
+    def test_uint8(self):
+        img = VispyPImage(4, 3)
+        img._img = Image.new("RGBA", (4, 3), (10, 20, 30, 40))
+        texture = img._texture
+        (data,) = uploads(texture)
+        self.assertEqual(data.dtype, np.uint8)
+        np.testing.assert_array_equal(data[0, 0], (10, 20, 30, 40))
+        self.assertEqual(texture.shape, (3, 4, 4))
+
+    def test_reuse(self):
+        img = VispyPImage(4, 3)
+        texture = img._texture
+        uploads(texture)
+        self.assertIs(img._texture, texture)
+        self.assertEqual(uploads(texture), [])
+
+        img.filter("opaque")
+        self.assertIs(img._texture, texture)
+        (data,) = uploads(texture)
+        np.testing.assert_array_equal(data[1, 1], (0, 0, 0, 255))
+
+        img.size = (8, 6)
+        self.assertIs(img._texture, texture)
+        self.assertEqual(texture.shape, (6, 8, 4))
+
+    def test_texture_memory(self):
+        used = texture_memory()
+        rgba = VispyPImage(4, 3)
+        gray = VispyPImage(5, 2, "alpha")
+        self.assertEqual(texture_memory(), used)
+        rgba._texture
+        gray._texture
+        self.assertEqual(texture_memory(), used + 4 * 3 * 4 + 5 * 2)
+
+
+class TestSprites(unittest.TestCase):
+    def setUp(self):
+        self.previous = (p5.renderer, builtins.current_renderer)
+        builtins.current_renderer = "vispy"
+        self.renderer = VispyRenderer2D()
+        p5.renderer = self.renderer
+
+    def tearDown(self):
+        p5.renderer, builtins.current_renderer = self.previous
+
+    def test_batched(self):
+        tiles = [VispyPImage(4, 4), VispyPImage(4, 4)]
+        for i in range(6):
+            self.renderer.image(tiles[i % 2], 10 * i, 0, None, None)
+        self.renderer.style.tint_enabled = True
+        self.renderer.style.tint_color = (1.0, 0.0, 0.0, 1.0)
+        self.renderer.transform_matrix = matrix.translation_matrix(0, 10, 0)
+        self.renderer.image(tiles[0], 0, 0, None, None)
+
+        batches = batch_draw_queue(self.renderer.draw_queue)
+        self.assertEqual([batch.key for batch in batches], [t._texture for t in tiles])
+        vertices, texcoords, tint = batches[0].entries[-1]
+        np.testing.assert_array_equal(vertices[:, :2].min(axis=0), (0, 10))
+        np.testing.assert_array_equal(vertices[:, :2].max(axis=0), (4, 14))
+        self.assertEqual(tint, (1.0, 0.0, 0.0, 1.0))
+
+    def test_flush_before_update(self):
+        img = VispyPImage(4, 4)
+        with mock.patch.object(self.renderer, "flush_geometry") as flush:
+            self.renderer.image(img, 0, 0, None, None)
+            self.renderer.image(img, 10, 0, None, None)
+            flush.assert_not_called()
+            # The queued sprites must be drawn with the old pixels
+            img.filter("opaque")
+            self.renderer.image(img, 20, 0, None, None)
+            flush.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import math
+import unittest
+
+import numpy as np
+
+from p5.core import p5
+from p5.pmath import matrix
+from p5.pmath.vector import Point
+from p5.sketch.Vispy2DRenderer.renderer2d import (
+    INSTANCE_ELLIPSE,
+    INSTANCE_RECT,
+    VispyRenderer2D,
+    _axis_aligned_rect,
+)
+
+
+def rect_path(x, y, w, h):
+    return [Point(x, y), Point(x + w, y), Point(x + w, y + h), Point(x, y + h)]
+
+
+class TestInstances(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        self.renderer = VispyRenderer2D()
+        p5.renderer = self.renderer
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+
+    def queued_types(self):
+        return [item[0] for item in self.renderer.draw_queue]
+
+    def test_axis_aligned_rect(self):
+        self.assertEqual(
+            _axis_aligned_rect(rect_path(10, 20, 30, 40)), ((25, 40), (15, 20))
+        )
+        skewed = rect_path(10, 20, 30, 40)
+        skewed[2] = Point(41, 60)
+        self.assertIsNone(_axis_aligned_rect(skewed))
+        lifted = rect_path(10, 20, 30, 40)
+        lifted[0] = Point(10, 20, 1)
+        self.assertIsNone(_axis_aligned_rect(lifted))
+
+    def test_rect(self):
+        self.renderer.quad(rect_path(10, 20, 30, 40))
+        self.assertEqual(self.queued_types(), ["instances"])
+        bounds, instance = self.renderer.draw_queue[0][1]
+        basis, origin, fill, stroke, half_width, kind, cap = instance
+        self.assertEqual(basis, (15, 0, 0, 20))
+        self.assertEqual(origin, (25, 40))
+        self.assertEqual(kind, INSTANCE_RECT)
+        self.assertEqual(half_width, 0.5)
+        np.testing.assert_allclose(bounds, [[9.49, 19.49], [40.51, 60.51]])
+
+    def test_ellipse(self):
+        self.renderer.arc((50, 50), (10, 5), 0, math.pi * 2, "CHORD")
+        self.assertEqual(self.queued_types(), ["instances"])
+        self.assertEqual(self.renderer.draw_queue[0][1][1][5], INSTANCE_ELLIPSE)
+
+    def test_partial_arc(self):
+        self.renderer.arc((50, 50), (10, 5), 0, math.pi, "CHORD")
+        self.assertNotIn("instances", self.queued_types())
+
+    def test_transform(self):
+        self.renderer.transform_matrix = matrix.rotation_matrix(
+            np.array([0, 0, 1]), math.pi / 2
+        )
+        self.renderer.quad(rect_path(0, 0, 4, 2))
+        _, instance = self.renderer.draw_queue[0][1]
+        np.testing.assert_allclose(instance[0], (0, 2, -1, 0), atol=1e-12)
+        np.testing.assert_allclose(instance[1], (-1, 2), atol=1e-12)
+
+    def test_out_of_plane(self):
+        self.renderer.transform_matrix = matrix.rotation_matrix(
+            np.array([0, 1, 0]), 0.5
+        )
+        self.renderer.quad(rect_path(0, 0, 4, 2))
+        self.assertNotIn("instances", self.queued_types())
+
+    def test_degenerate(self):
+        self.renderer.quad(rect_path(0, 0, 4, 0))
+        self.assertNotIn("instances", self.queued_types())
+
+    def test_no_style(self):
+        self.renderer.style.fill_enabled = False
+        self.renderer.style.stroke_enabled = False
+        self.renderer.quad(rect_path(0, 0, 4, 2))
+        self.assertEqual(self.queued_types(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
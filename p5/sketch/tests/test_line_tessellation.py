@@ -0,0 +1,168 @@
+import unittest
+
+import numpy as np
+
+from p5.core import p5
+from p5.core.constants import SType
+from p5.pmath import PI
+from p5.sketch.Vispy2DRenderer.openglrenderer import get_render_primitives
+from p5.sketch.Vispy2DRenderer.renderer2d import VispyRenderer2D, tessellate_lines
+from p5.sketch.Vispy2DRenderer.shape import PShape, Arc
+
+
+def reference_tessellation(queue):
+    """The per-vertex loop previously used by VispyRenderer2D.render_line"""
+    pos = []
+    posPrev = []
+    posCurr = []
+    posNext = []
+    markers = []
+    side = []
+
+    linewidth = []
+    join_type = []
+    cap_type = []
+    color = []
+
+    stroke_cap_codes = {"PROJECT": 0, "SQUARE": 1, "ROUND": 2}
+
+    stroke_join_codes = {"MITER": 0, "BEVEL": 1, "ROUND": 2}
+
+    for line in queue:
+        if len(line[1]) == 0:
+            continue
+
+        for segment in line[1]:
+            for i in range(len(segment) - 1):
+                for j in [0, 0, 1, 0, 1, 1]:
+                    if i + j - 1 >= 0:
+                        posPrev.append(line[0][segment[i + j - 1]])
+                    else:
+                        posPrev.append(line[0][segment[i + j]])
+
+                    if i + j + 1 < len(segment):
+                        posNext.append(line[0][segment[i + j + 1]])
+                    else:
+                        posNext.append(line[0][segment[i + j]])
+
+                    posCurr.append(line[0][segment[i + j]])
+
+                markers.extend([1.0, -1.0, -1.0, -1.0, 1.0, -1.0])
+                side.extend([1.0, 1.0, -1.0, 1.0, -1.0, -1.0])
+                pos.extend([line[0][segment[i]]] * 6)
+                linewidth.extend([line[3]] * 6)
+                join_type.extend([stroke_join_codes[line[5]]] * 6)
+                cap_type.extend([stroke_cap_codes[line[4]]] * 6)
+                color.extend([line[2]] * 6)
+
+    if len(pos) == 0:
+        return None
+
+    return {
+        "pos": np.array(pos, np.float32),
+        "posPrev": np.array(posPrev, np.float32),
+        "posCurr": np.array(posCurr, np.float32),
+        "posNext": np.array(posNext, np.float32),
+        "marker": np.array(markers, np.float32),
+        "side": np.array(side, np.float32),
+        "linewidth": np.array(linewidth, np.float32),
+        "join_type": np.array(join_type, np.float32),
+        "cap_type": np.array(cap_type, np.float32),
+        "color": np.array(color, np.float32),
+    }
+
+
+def to_3d(vertices):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if vertices.shape[1] == 3:
+        return vertices
+    return np.hstack([vertices, np.zeros((len(vertices), 1))])
+
+
+square = [(0, 0, 0), (10, 0, 0), (10, 10, 0), (0, 10, 0)]
+hexagon = [(np.cos(t) * 5, np.sin(t) * 5, 0) for t in np.linspace(0, 2 * PI, 7)[:-1]]
+
+shapes = [
+    PShape(vertices=square, shape_type=SType.LINES),
+    PShape(vertices=hexagon, shape_type=SType.LINE_STRIP),
+    PShape(vertices=hexagon, shape_type=SType.TRIANGLES),
+    PShape(vertices=hexagon, shape_type=SType.TRIANGLE_STRIP),
+    PShape(vertices=hexagon, shape_type=SType.TRIANGLE_FAN),
+    PShape(vertices=square + square, shape_type=SType.QUADS),
+    PShape(vertices=hexagon, shape_type=SType.QUAD_STRIP),
+    PShape(vertices=square, shape_type=SType.TESS),
+    PShape(
+        vertices=[(0, 0, 0), (100, 0, 0), (100, 100, 0), (0, 100, 0)],
+        contours=[[(25, 25, 0), (25, 75, 0), (75, 75, 0), (75, 25, 0)]],
+        shape_type=SType.TESS,
+    ),
+    Arc((0, 0), (10, 5), 0, 2 * PI, "CHORD"),
+    Arc((0, 0), (10, 5), 0.5, PI, "OPEN"),
+    Arc((0, 0), (10, 5), 0.5, PI, "PIE"),
+    Arc((0, 0), (10, 5), 0.5, PI, None),
+]
+
+styles = [
+    ((0.0, 0.0, 0.0, 1.0), 1, "ROUND", "MITER"),
+    ((1.0, 0.5, 0.25, 0.5), 4, "SQUARE", "BEVEL"),
+    ((0.2, 0.4, 0.6, 0.8), 0.5, "PROJECT", "ROUND"),
+]
+
+
+class TestLineTessellation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.previous_renderer = p5.renderer
+        p5.renderer = VispyRenderer2D()
+
+    @classmethod
+    def tearDownClass(cls):
+        p5.renderer = cls.previous_renderer
+
+    def assert_same_attributes(self, queue):
+        expected = reference_tessellation(queue)
+        result = tessellate_lines(queue)
+        if expected is None:
+            self.assertIsNone(result)
+            return
+        self.assertEqual(set(expected), set(result.dtype.names))
+        for name, values in expected.items():
+            self.assertEqual(result[name].dtype.base, np.float32, name)
+            np.testing.assert_array_equal(result[name], values, err_msg=name)
+
+    def line_queue(self, shape, style):
+        queue = []
+        for stype, vertices, idx in get_render_primitives(shape):
+            if stype == "lines":
+                queue.append((to_3d(vertices), idx) + style)
+        return queue
+
+    def test_shape_types(self):
+        for shape in shapes:
+            for style in styles:
+                with self.subTest(shape_type=shape.shape_type, style=style):
+                    self.assert_same_attributes(self.line_queue(shape, style))
+
+    def test_whole_queue(self):
+        queue = []
+        for i, shape in enumerate(shapes):
+            queue.extend(self.line_queue(shape, styles[i % len(styles)]))
+        self.assert_same_attributes(queue)
+
+    def test_polylines(self):
+        vertices = to_3d(hexagon)
+        idx = np.array([[0, 1, 2, 3], [3, 4, 5, 0]], dtype=np.uint32)
+        self.assert_same_attributes([(vertices, idx) + styles[1]])
+
+    def test_empty(self):
+        vertices = to_3d(square)
+        empty = np.zeros((0, 2), dtype=np.uint32)
+        self.assertIsNone(tessellate_lines([]))
+        self.assertIsNone(tessellate_lines([(vertices, empty) + styles[0]]))
+        self.assert_same_attributes(
+            [(vertices, empty) + styles[0], (vertices, [[0, 1]]) + styles[2]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
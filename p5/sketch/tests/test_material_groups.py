@@ -0,0 +1,146 @@
+import unittest
+
+import numpy as np
+
+from p5.core import p5
+from p5.core.geometry import Geometry
+from p5.core.material import BasicMaterial, BlinnPhongMaterial, NormalMaterial
+from p5.pmath import matrix
+from p5.sketch.Vispy3DRenderer.batching import group_draw_queue, material_key
+from p5.sketch.Vispy3DRenderer.renderer3d import Renderer3D
+
+OPAQUE = (1.0, 0.0, 0.0, 1.0)
+TRANSLUCENT = (1.0, 0.0, 0.0, 0.5)
+TRIANGLE = np.zeros((3, 3))
+
+
+def phong(shininess=1.0):
+    return BlinnPhongMaterial(
+        np.array([0.1, 0.1, 0.1]), np.array([1.0, 1.0, 1.0]), np.zeros(3), shininess
+    )
+
+
+def entry(draw_type, material=None, color=OPAQUE, transform=None):
+    return draw_type, (TRIANGLE, np.arange(3), color, TRIANGLE, material), transform
+
+
+class TestMaterialKey(unittest.TestCase):
+    def test_keys(self):
+        self.assertIsNone(material_key(None))
+        self.assertIsNone(material_key(BasicMaterial(OPAQUE)))
+        self.assertEqual(material_key(NormalMaterial()), material_key(NormalMaterial()))
+        self.assertEqual(material_key(phong()), material_key(phong()))
+        self.assertNotEqual(material_key(phong(1.0)), material_key(phong(2.0)))
+
+
+class TestGroupDrawQueue(unittest.TestCase):
+    def test_opaque(self):
+        queue = [
+            entry("triangles", phong()),
+            entry("triangles", NormalMaterial()),
+            entry("lines", phong()),
+            entry("triangles", phong()),
+            entry("triangles", BasicMaterial(OPAQUE)),
+            entry("triangles", NormalMaterial()),
+            entry("lines", NormalMaterial()),
+            entry("triangles"),
+        ]
+        groups = group_draw_queue(queue)
+        self.assertEqual(
+            [(group.draw_type, len(group.entries)) for group in groups],
+            [("triangles", 2), ("triangles", 2), ("lines", 2), ("triangles", 2)],
+        )
+        self.assertIsInstance(groups[0].material, BlinnPhongMaterial)
+        # Lines are always drawn by the default program
+        self.assertIsNone(groups[2].material)
+
+    def test_translucent(self):
+        queue = [
+            entry("triangles"),
+            entry("triangles", phong()),
+            entry("triangles", color=TRANSLUCENT),
+            entry("triangles", color=TRANSLUCENT),
+            entry("triangles", phong()),
+            entry("triangles"),
+        ]
+        groups = group_draw_queue(queue)
+        # Nothing is moved back over the translucent entries
+        self.assertEqual([len(group.entries) for group in groups], [1, 1, 3, 1])
+        self.assertEqual(groups[2].entries[0][2], TRANSLUCENT)
+
+        # The lit programs draw opaque shapes whatever the color
+        queue = [
+            entry("triangles", phong()),
+            entry("triangles"),
+            entry("triangles", phong(), TRANSLUCENT),
+        ]
+        self.assertEqual(len(group_draw_queue(queue)), 2)
+
+    def test_transforms(self):
+        shifted = np.identity(4)
+        shifted[0, 3] = 10
+        queue = [
+            entry("triangles", phong(), transform=np.identity(4)),
+            entry("triangles", phong(), transform=shifted),
+            entry("triangles", phong()),
+            entry("triangles", phong(), transform=shifted.copy()),
+            entry("triangles", phong(), transform=np.identity(4)),
+        ]
+        groups = group_draw_queue(queue)
+        self.assertEqual([len(group.entries) for group in groups], [2, 2, 1])
+        np.testing.assert_array_equal(groups[1].transform, shifted)
+        self.assertIsNone(groups[2].transform)
+
+
+class TestGpuTransforms(unittest.TestCase):
+    def setUp(self):
+        self.previous_renderer = p5.renderer
+        self.renderer = p5.renderer = Renderer3D()
+        self.renderer.style.material = NormalMaterial()
+        self.renderer.style.stroke_enabled = False
+
+    def tearDown(self):
+        p5.renderer = self.previous_renderer
+
+    def triangle(self):
+        geometry = Geometry()
+        geometry.vertices = TRIANGLE + np.eye(3)
+        geometry.vertex_normals = np.tile([0.0, 0.0, 1.0], (3, 1))
+        geometry.faces = [[0, 1, 2]]
+        geometry.edges = [[0, 1], [1, 2], [2, 0]]
+        return geometry
+
+    def test_queue_untransformed(self):
+        self.renderer.gpu_transforms = True
+        self.renderer.transform_matrix = matrix.scale_transform(2, 2, 2)
+        geometry = self.triangle()
+        geometry.matrix = matrix.translation_matrix(10, 0, 0)
+        self.renderer.render(geometry)
+
+        ((draw_type, entry, transform),) = self.renderer.draw_queue
+        vertices, _, _, normals, _ = entry
+        np.testing.assert_array_equal(vertices, geometry.vertices)
+        np.testing.assert_array_equal(normals, geometry.vertex_normals)
+        np.testing.assert_array_equal(
+            transform, matrix.scale_transform(2, 2, 2) @ geometry.matrix
+        )
+
+    def test_cpu_transforms(self):
+        self.renderer.transform_matrix = matrix.scale_transform(1, 1, 2)
+        self.renderer.render(self.triangle())
+        ((draw_type, entry, transform),) = self.renderer.draw_queue
+        self.assertIsNone(transform)
+        np.testing.assert_allclose(entry[0][2], (0, 0, 2))
+        # Normals are scaled by the inverse transpose
+        np.testing.assert_allclose(entry[3][0], (0, 0, 0.5))
+
+    def test_normal_matrix(self):
+        transform = matrix.scale_transform(1, 2, 4)
+        normal_matrix = self.renderer._normal_matrix(transform)
+        np.testing.assert_allclose(np.diag(normal_matrix), (1, 0.5, 0.25))
+        # Computed once per distinct transform
+        self.assertIs(self.renderer._normal_matrix(transform.copy()), normal_matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,6 +27,7 @@ import sys
 import time
 from functools import wraps
 
+from .capture import create_recorder
 from .events import handler_names
 
 from ..core import p5
@@ -47,6 +48,8 @@ __all__ = [
     "run",
     "save_frame",
     "save",
+    "record",
+    "stop_recording",
     "is_looping",
     "set_frame_rate",
     "pixel_density",
@@ -78,6 +81,8 @@ builtins.key_is_pressed = False
 
 builtins.pixels = None
 builtins.start_time = 0
+# Seconds since the sketch started, for sketches run in batch mode
+builtins.virtual_time = None
 builtins.current_renderer = None
 
 
@@ -133,6 +138,9 @@ def run(
     frame_rate: int = 60,
     mode: str = "P2D",
     renderer: str = "vispy",
+    headless: bool = False,
+    frames: Optional[int] = None,
+    batch: bool = False,
 ):
     """Run a sketch.
 
@@ -148,6 +156,20 @@ def run(
     :param frame_rate: The target frame rate for the sketch.
     :math:`\geq 1`
 
+    :param headless: Draw the sketch without opening a window (only
+        available with the skia renderer). The frames are drawn on a
+        CPU surface as fast as possible, and no events are handled.
+
+    :param frames: Stop the sketch after drawing this many frames
+        (None by default.)
+
+    :param batch: Draw the frames back to back as fast as possible,
+        instead of waiting for the next frame. The sketch runs on a
+        virtual clock that advances by exactly 1 / `frame_rate` every
+        frame: :meth:`p5.millis` and `frame_rate` report the time and
+        rate the sketch would have run at, so the output does not
+        depend on how long the frames took to draw.
+
     """
     # get the user-defined setup(), draw(), preload() and handler functions.
     if sketch_preload is not None:
@@ -177,6 +199,13 @@ def run(
         if hasattr(__main__, handler)
     }
 
+    builtins.virtual_time = None
+    if batch:
+        from p5.sketch.util import reset_clock
+
+        reset_clock()
+        builtins.frame_rate = frame_rate
+
     if renderer == "skia":
         from p5.sketch.Skia2DRenderer.base import SkiaSketch
         from p5.sketch.Skia2DRenderer.renderer2d import SkiaRenderer
@@ -187,10 +216,17 @@ def run(
             p5.renderer = SkiaRenderer()
         elif mode == "P3D":
             raise NotImplementedError("3D mode is not available in skia")
-        p5.sketch = SkiaSketch(setup_method, draw_method, handlers, frame_rate)
+        p5.sketch = SkiaSketch(
+            setup_method, draw_method, handlers, frame_rate, headless, frames, batch
+        )
         preload_method()
         p5.sketch.start()
     elif renderer == "vispy":
+        if headless:
+            raise NotImplementedError(
+                "Headless mode is only available with the skia renderer"
+            )
+
         import vispy
 
         vispy.use("glfw")
@@ -212,7 +248,9 @@ def run(
         else:
             ValueError(f"Invalid Mode {mode}")
 
-        p5.sketch = VispySketch(setup_method, draw_method, handlers, frame_rate)
+        p5.sketch = VispySketch(
+            setup_method, draw_method, handlers, frame_rate, frames, batch
+        )
         physical_width, physical_height = p5.sketch.physical_size
         width, height = p5.sketch.size
 
@@ -391,6 +429,69 @@ def save_frame(filename: str = "screen.png"):
     p5.sketch.queue_screenshot(filename)
 
 
+def record(
+    filename: str = "screen-####.png",
+    max_frames: Optional[int] = None,
+    frame_rate: Optional[float] = None,
+):
+    """Record every frame of the sketch, until :meth:`p5.stop_recording`
+    is called or the sketch is closed.
+
+    The format of the recording is chosen from the extension of
+    `filename`:
+
+    - Image files (``.png``, ``.tif``, ...) record a numbered image
+      sequence, like :meth:`p5.save_frame`. The ``#`` characters of the
+      file name are replaced by `frame_count`. The images are encoded
+      and written in the background.
+    - ``.raw``, ``.rgb`` and ``.rgba`` files store the uncompressed
+      pixels of all the frames in a single file. ``.rgb`` and
+      ``.rgba`` frames have three and four channels, ``.raw`` frames
+      the channels the renderer reads. The file is memory mapped when
+      `max_frames` is given.
+    - Videos (``.mp4``, ``.mov``, ``.mkv``, ``.webm``, ``.avi``,
+      ``.gif``) are encoded by ffmpeg, which has to be installed.
+
+    One frame is recorded each time `frame_count` changes. Videos have
+    one frame per recorded frame, so they play back at `frame_rate`
+    however long the frames took to draw.
+
+    :param filename: file name of the recording (defaults to
+        ``screen-####.png``)
+
+    :param max_frames: stop recording after this many frames.
+
+    :param frame_rate: frame rate of recorded videos (defaults to the
+        frame rate the sketch runs at)
+
+    :raises ValueError: when the extension of `filename` is not
+        supported.
+
+    :raises RuntimeError: when recording a video and ffmpeg is not
+        installed.
+
+    """
+    stop_recording()
+    if frame_rate is None:
+        frame_rate = getattr(p5.sketch, "frame_rate", 60)
+    p5.recorder = create_recorder(filename, max_frames, frame_rate)
+
+
+def stop_recording():
+    """Stop the recording started by :meth:`p5.record` and finish
+    writing it.
+
+    :returns: the number of recorded frames
+    :rtype: int
+
+    """
+    recorder, p5.recorder = p5.recorder, None
+    if recorder is None:
+        return 0
+    recorder.close()
+    return recorder.frames
+
+
 # TODO: Add support to calculate the current frame_rate
 # TODO: Deprecate set_frame_rate and use frame_rate(), current frame_rate should return as per p5.js API
 def set_frame_rate(fps: int):
@@ -15,6 +15,35 @@ def ensure_p3d(name: str):
     assert p5.mode == "P3D", f"{name}is only available in P3D renderer"
 
 
+# Frame and time at which the virtual clock last started running at
+# its current frame rate
+_clock_start = {"frame": 0, "time": 0.0}
+
+
+def reset_clock():
+    """Start the virtual clock of a batch mode sketch at zero."""
+    builtins.virtual_time = 0.0
+    _clock_start.update(frame=0, time=0.0)
+
+
+def advance_clock(frame_rate: float):
+    """Move the virtual clock of a batch mode sketch to the current frame.
+
+    In batch mode, frames are drawn as fast as possible and the clock
+    advances by 1 / frame_rate every frame, so millis() and frame_rate
+    do not depend on how long the frames took to draw. When the frame
+    rate changes, the clock keeps the time it reached and advances at
+    the new rate from there on.
+    """
+    if frame_rate != builtins.frame_rate:
+        _clock_start.update(frame=builtins.frame_count - 1, time=builtins.virtual_time)
+    builtins.frame_rate = frame_rate
+    # Counting frames from the last change of rate, rather than adding
+    # up 1 / frame_rate, keeps rounding errors from adding up
+    frames = builtins.frame_count - _clock_start["frame"]
+    builtins.virtual_time = _clock_start["time"] + frames / frame_rate
+
+
 def scale_tuple(t: Tuple[float, ...], scale: float = 255):
     """Divides each element of tuple by scale"""
     return tuple(x / scale for x in t)
@@ -0,0 +1,71 @@
+"""Compare the NumPy triangulator with the GLU tessellator.
+
+Run `python tessellation.py` from this directory. Every polygon is
+filled with both and the average time per polygon is printed.
+"""
+
+import timeit
+
+import numpy as np
+
+from p5.core import p5
+from p5.core.triangulate import triangulate
+from p5.sketch.Vispy2DRenderer.openglrenderer import _tess_new_contour
+from OpenGL.GLU import gluTessBeginPolygon, gluTessEndPolygon
+
+
+def circle(n, radius=100, center=(0, 0)):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack(
+        (
+            center[0] + radius * np.cos(angles),
+            center[1] + radius * np.sin(angles),
+            np.zeros(n),
+        )
+    )
+
+
+def star(n):
+    vertices = circle(n)
+    vertices[1::2, :2] *= 0.5
+    return vertices
+
+
+def glu(vertices, contours):
+    gluTessBeginPolygon(p5.tess.tess, None)
+    _tess_new_contour(vertices)
+    for contour in contours:
+        _tess_new_contour(contour)
+    gluTessEndPolygon(p5.tess.tess)
+    return p5.tess.get_result()
+
+
+grid = [
+    circle(12, radius=4, center=(x, y))[::-1]
+    for x in range(-60, 61, 20)
+    for y in range(-60, 61, 20)
+]
+polygons = {
+    "circle (100 vertices)": (circle(100), []),
+    "circle (10000 vertices)": (circle(10000), []),
+    "star (100 vertices)": (star(100), []),
+    "star (1000 vertices)": (star(1000), []),
+    "star (10000 vertices)": (star(10000), []),
+    "circle with hole (2000 vertices)": (circle(1000), [circle(1000, radius=50)]),
+    "circle with 49 holes": (circle(1000), grid),
+}
+
+if __name__ == "__main__":
+    for name, (vertices, contours) in polygons.items():
+        print(name)
+        for method in [glu, triangulate]:
+            number = 5
+            elapsed = timeit.timeit(lambda: method(vertices, contours), number=number)
+            note = ""
+            if method is triangulate and triangulate(vertices, contours) is None:
+                note = " (left to GLU)"
+            print(
+                "    {0:>11}: {1:8.3f} ms{2}".format(
+                    method.__name__, 1000 * elapsed / number, note
+                )
+            )